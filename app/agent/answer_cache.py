@@ -0,0 +1,124 @@
+# Semantic Answer Cache
+
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import re
+import threading
+import time
+
+import numpy as np
+
+# 숫자가 다른 질문(금리 3% vs 4%, 30년 vs 20년)은 의미가 비슷해도 다른 답이므로 키에 포함
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+CacheKey = Tuple[Tuple[str, ...], str, Tuple[str, ...]]
+
+
+class _Entry:
+    __slots__ = ("embedding", "answer", "created_at")
+
+    def __init__(self, embedding: np.ndarray, answer: Dict[str, Any], created_at: float):
+        self.embedding = embedding
+        self.answer = answer
+        self.created_at = created_at
+
+
+class SemanticAnswerCache:
+    """
+    에이전트 그래프 최종 응답 캐시 (LLM 2회 + 도구 호출 생략).
+    - 키: (사용자 스코프 집합, 레지스트리 버전, 질문 내 숫자) → 같은 키 안에서 질문 임베딩 코사인 유사도 비교
+    - 유사도 threshold 이상 + TTL 이내인 가장 가까운 항목을 반환
+    - 문서 적재 세대(generation)가 바뀌면 전체 무효화 (검색 결과가 달라질 수 있음)
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], List[float]],
+        generation: Callable[[], str],
+        threshold: float = 0.95,
+        ttl_sec: int = 600,
+        max_size: int = 1000
+    ):
+        self._embed = embed
+        self._generation = generation
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._parts: Dict[CacheKey, List[_Entry]] = {}
+        self._order: Deque[Tuple[CacheKey, _Entry]] = deque()
+        self._current_generation: Optional[str] = None
+
+    def lookup(self, question: str, scopes: List[str], registry_version: str) -> Tuple[Optional[Dict[str, Any]], List[float]]:
+        """
+        (캐시된 응답 또는 None, 질문 임베딩) 반환.
+        임베딩은 miss 후 store()에 그대로 넘겨 재계산하지 않음
+        """
+        embedding = self._normalize(self._embed(question))
+        key = self._key(question, scopes, registry_version)
+        now = time.time()
+
+        with self._lock:
+            self._check_generation()
+            entries = [e for e in self._parts.get(key, []) if now - e.created_at < self.ttl_sec]
+            if entries:
+                sims = np.stack([e.embedding for e in entries]) @ embedding
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    self.hits += 1
+                    return entries[best].answer, embedding.tolist()
+            self.misses += 1
+        return None, embedding.tolist()
+
+    def store(self, question: str, scopes: List[str], registry_version: str, embedding: List[float], answer: Dict[str, Any]) -> None:
+        key = self._key(question, scopes, registry_version)
+        entry = _Entry(self._normalize(embedding), answer, time.time())
+        with self._lock:
+            self._check_generation()
+            part = self._parts.setdefault(key, [])
+            # 만료된 항목 정리 후 추가
+            part[:] = [e for e in part if entry.created_at - e.created_at < self.ttl_sec]
+            part.append(entry)
+            self._order.append((key, entry))
+            while len(self._order) > self.max_size:
+                old_key, old = self._order.popleft()
+                old_part = self._parts.get(old_key, [])
+                if old in old_part:
+                    old_part.remove(old)
+                if not old_part:
+                    self._parts.pop(old_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._parts.clear()
+            self._order.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._order),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def _check_generation(self) -> None:
+        generation = self._generation()
+        if generation != self._current_generation:
+            self._parts.clear()
+            self._order.clear()
+            self._current_generation = generation
+
+    @staticmethod
+    def _key(question: str, scopes: List[str], registry_version: str) -> CacheKey:
+        return tuple(sorted(set(scopes))), registry_version, tuple(_NUMBER.findall(question))
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
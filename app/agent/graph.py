@@ -1,22 +1,125 @@
 # Graph-related functionality
 
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import threading
 import uuid
 
+from langgraph.config import get_config, get_stream_writer
 from langgraph.graph import StateGraph, END
 
+from app.agent.answer_cache import SemanticAnswerCache
 from app.common.types import GraphState, ToolCall
 from app.service.registry import ActionRegistry
-from app.platform.policy import enforce, Deny, _mask_pii
-from app.service.tools import get_tool_map
-from app.platform.audit import build_audit_event
+from app.service.executor import ToolTimeout, get_executor
+from app.service.router import TieredRouter
+from app.service.schema import SchemaError, validate_output
+from app.platform.policy import enforce, Deny, _check_rate_limit, _mask_pii
+from app.service.tools import get_async_tool_map, get_tool_map
+from app.platform.audit import build_audit_event, get_audit_pipeline
+from app.infra.config import Config
 from app.infra.llm import LLMClient
 
 
-REGISTRY = ActionRegistry("app/service/actions/registry.yaml")
-LLM = LLMClient() # LLM Interface
-TOOLS = get_tool_map()
+REGISTRY_PATH = "app/service/actions/registry.yaml"
+
+DECIDE_SYSTEM_PROMPT = "You are a helpful assistant. Select a tool if needed. Use exact parameter names from the tool description. For loan calculation, convert years to months (e.g., 30 years = 360 months) and use percentage for rates."
+
+# 싱글톤들은 import 시점이 아닌 첫 사용 시 생성 (모델 로딩/외부 연결 없이 import 가능)
+_registry: Optional[ActionRegistry] = None
+_llm: Optional[LLMClient] = None
+_tools: Optional[Dict[str, Any]] = None
+_async_tools: Optional[Dict[str, Any]] = None
+_graph: Any = None
+_async_graph: Any = None
+_answer_cache: Optional[SemanticAnswerCache] = None
+_router: Optional[TieredRouter] = None
+_init_lock = threading.RLock()
+
+
+def get_registry() -> ActionRegistry:
+    global _registry
+    if _registry is None:
+        with _init_lock:
+            if _registry is None:
+                # REGISTRY_RELOAD_SEC마다 파일 변경 확인 → 재시작 없이 action 추가/수정 반영
+                _registry = ActionRegistry(REGISTRY_PATH, reload_interval_sec=Config.REGISTRY_RELOAD_SEC)
+    return _registry
+
+
+def get_llm() -> LLMClient:
+    global _llm
+    if _llm is None:
+        with _init_lock:
+            if _llm is None:
+                _llm = LLMClient() # LLM Interface
+    return _llm
+
+
+def get_tools() -> Dict[str, Any]:
+    global _tools
+    if _tools is None:
+        with _init_lock:
+            if _tools is None:
+                _tools = get_tool_map()
+    return _tools
+
+
+def get_async_tools() -> Dict[str, Any]:
+    global _async_tools
+    if _async_tools is None:
+        with _init_lock:
+            if _async_tools is None:
+                _async_tools = get_async_tool_map()
+    return _async_tools
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    global _answer_cache
+    if _answer_cache is None:
+        with _init_lock:
+            if _answer_cache is None:
+                from app.data.rag import get_rag_service, ingest_generation
+                _answer_cache = SemanticAnswerCache(
+                    embed=lambda q: get_rag_service().embed_query(q),
+                    generation=ingest_generation,
+                    threshold=Config.ANSWER_CACHE_THRESHOLD,
+                    ttl_sec=Config.ANSWER_CACHE_TTL_SEC,
+                    max_size=Config.ANSWER_CACHE_SIZE
+                )
+    return _answer_cache
+
+
+def get_router() -> TieredRouter:
+    global _router
+    if _router is None:
+        with _init_lock:
+            if _router is None:
+                from app.data.rag import get_rag_service, is_rag_ready
+                # 의미 단계는 RAG 서비스(임베딩 모델)가 이미 로드된 경우만 사용 (요청 경로에서 초기화하지 않음)
+                _router = TieredRouter(
+                    get_registry(),
+                    embed=lambda texts: get_rag_service().embed_queries(texts),
+                    threshold=Config.ROUTER_SEMANTIC_THRESHOLD,
+                    margin=Config.ROUTER_SEMANTIC_MARGIN,
+                    ready=is_rag_ready
+                )
+    return _router
+
+
+def runtime_stats() -> Dict[str, Any]:
+    """라우터 단계별 적중률, 응답 캐시 통계 (초기화된 것만), registry 버전, 도구별 지연/재시도/hedge 통계, 감사 로그 큐"""
+    stats: Dict[str, Any] = {}
+    if _registry is not None:
+        stats["registry"] = {"version": _registry.version, "revision": _registry.revision}
+    if _router is not None:
+        stats["router"] = _router.stats()
+    if _answer_cache is not None:
+        stats["answer_cache"] = _answer_cache.stats()
+    stats["tools"] = get_executor().stats()
+    stats["audit"] = get_audit_pipeline().stats()
+    return stats
 
 
 def _agent_decide(state: GraphState) -> Dict[str, Any]:
@@ -26,24 +129,98 @@ def _agent_decide(state: GraphState) -> Dict[str, Any]:
     """
     # 디버깅: 시작 시 쿼리 출력
     print(f"[DECIDE] Thinking... Query: {state.question}")
+
+    # 0. Fast path: 규칙/임베딩으로 확신할 수 있으면 LLM 호출 생략
+    update = _fast_route(state.question)
+    if update is not None:
+        return update
     
-    # 1. Action 목록(Spec) 로드
-    actions_desc = []
-    for aid in REGISTRY.list_ids():
-        spec = REGISTRY.get(aid)
-        required_fields = spec.input_schema.get("required", [])
-        params_desc = f" (필수 매개변수: {', '.join(required_fields)})" if required_fields else ""
-        actions_desc.append(f"- {spec.id}: {spec.description}{params_desc}")
-    desc_text = "\n".join(actions_desc)
-    
+    # 1. Action 목록(Spec) 로드 (버전별로 미리 만든 spec 목록/도구 설명 사용)
+    registry = get_registry().snapshot()
+
+    if Config.LLM_TOOL_MODE == "native":
+        # function calling: 도구 선택과 (도구가 필요 없을 때) 답변을 LLM 1회로 처리
+        tool_proposal, direct_answer = get_llm().select_tool(
+            state.question,
+            registry.specs,
+            system_prompt=DECIDE_SYSTEM_PROMPT,
+            version=registry.version
+        )
+        return _native_decision(tool_proposal, direct_answer)
+
     # 2. LLM Call (Predict Tool)
-    tool_proposal = LLM.predict_tool_call(
-        system_prompt="You are a helpful assistant. Select a tool if needed. Use exact parameter names from the tool description. For loan calculation, convert years to months (e.g., 30 years = 360 months) and use percentage for rates.",
+    tool_proposal = get_llm().predict_tool_call(
+        system_prompt=DECIDE_SYSTEM_PROMPT,
         user_query=state.question,
-        tools_desc=desc_text
+        tools_desc=registry.tools_desc
     )
 
     # 3. Decision
+    update = _tool_decision(tool_proposal)
+    if update is not None:
+        return update
+    
+    # No tool -> 바로 답변 생성
+    return {"answer": _generate_answer(state.question, [])}
+
+
+async def _aagent_decide(state: GraphState) -> Dict[str, Any]:
+    """_agent_decide의 비동기 버전 (LLM 호출을 await → 대기 중 스레드 점유 없음)"""
+    print(f"[DECIDE] Thinking... Query: {state.question}")
+
+    # 라우터 임베딩은 CPU 작업이므로 스레드에서 실행
+    update = await asyncio.to_thread(_fast_route, state.question)
+    if update is not None:
+        return update
+
+    registry = get_registry().snapshot()
+
+    if Config.LLM_TOOL_MODE == "native":
+        tool_proposal, direct_answer = await get_llm().aselect_tool(
+            state.question,
+            registry.specs,
+            system_prompt=DECIDE_SYSTEM_PROMPT,
+            version=registry.version
+        )
+        return _native_decision(tool_proposal, direct_answer)
+
+    tool_proposal = await get_llm().apredict_tool_call(
+        system_prompt=DECIDE_SYSTEM_PROMPT,
+        user_query=state.question,
+        tools_desc=registry.tools_desc
+    )
+    update = _tool_decision(tool_proposal)
+    if update is not None:
+        return update
+    return {"answer": await get_llm().agenerate_response(state.question, [])}
+
+
+def _fast_route(question: str) -> Optional[Dict[str, Any]]:
+    """규칙/임베딩 라우터로 확신할 수 있으면 도구 결정 반환 (아니면 None → LLM)"""
+    if Config.ROUTER_MODE != "tiered":
+        return None
+    try:
+        tc, tier = get_router().route(question)
+    except Exception as e:
+        print(f"[DECIDE] Fast path skipped: {e!r}")
+        tc = None
+    if tc is not None:
+        print(f"[DECIDE] Tool Selected ({tier}): {tc.action_id} Params: {tc.params}")
+        _emit({"event": "route", "tier": tier, "action_id": tc.action_id, "params": tc.params})
+        return {"tool_call": tc}
+    get_router().record_llm()
+    return None
+
+
+def _native_decision(tool_proposal: Optional[Dict[str, Any]], direct_answer: Optional[str]) -> Dict[str, Any]:
+    update = _tool_decision(tool_proposal)
+    if update is not None:
+        return update
+    _emit({"event": "token", "text": direct_answer})
+    return {"answer": direct_answer}
+
+
+def _tool_decision(tool_proposal: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     if tool_proposal:
         # LLM이 제안한 도구 호출 객체 생성
         tc = ToolCall(
@@ -52,12 +229,13 @@ def _agent_decide(state: GraphState) -> Dict[str, Any]:
         )
         # 디버깅: 도구 선택 시 출력
         print(f"[DECIDE] Tool Selected: {tc.action_id} Params: {tc.params}")
+        _emit({"event": "route", "tier": "llm", "action_id": tc.action_id, "params": tc.params})
         return {"tool_call": tc}
-    
-    # No tool -> 바로 답변 생성
+
     # 디버깅: 도구 미선택 시 출력
     print("[DECIDE] No tool needed.")
-    return {"answer": LLM.generate_response(state.question, [])}
+    _emit({"event": "route", "tier": "llm", "action_id": None})
+    return None
 
 
 def _execute_tool(state: GraphState) -> Dict[str, Any]:
@@ -67,59 +245,210 @@ def _execute_tool(state: GraphState) -> Dict[str, Any]:
 
     # 디버깅: 도구 실행 시작 출력
     print(f"[EXECUTE] Running tool: {tc.action_id}")
-    
-    spec = REGISTRY.get(tc.action_id)
+    tools = get_tools()
+    denied, spec, safe_params = _authorize(state, tools)
+    if denied is not None:
+        return denied
+
+    # 보호된 매개변수로 실행 (timeout_ms 상한 + 재시도/hedge) → output_schema 검증
+    try:
+        result = validate_output(spec, get_executor().run(spec, tools[tc.action_id], safe_params))
+    except ToolTimeout as e:
+        return _tool_failed(state, spec, safe_params, e.reason)
+    except SchemaError as e:
+        return _tool_failed(state, spec, safe_params, f"output_invalid: {e.reason}")
+    except Exception as e:
+        # 재시도까지 실패한 도구 오류
+        return _tool_failed(state, spec, safe_params, getattr(e, "reason", f"tool_error: {type(e).__name__}"))
+    final_ans = _complete_tool(state, spec, safe_params, result)
+    if final_ans is None:
+        final_ans = _generate_answer(state.question, [result])
+    return {
+        "tool_result": result,
+        "answer": final_ans
+    }
+
+
+async def _aexecute_tool(state: GraphState) -> Dict[str, Any]:
+    """_execute_tool의 비동기 버전"""
+    tc = state.tool_call
+    if tc is None:
+        return {"answer": state.answer or "(no tool)"}
+
+    print(f"[EXECUTE] Running tool: {tc.action_id}")
+    tools = get_async_tools()
+    # 정책 적용(Redis 속도 제한, 스키마 검증, PII 마스킹)과 거부 감사 기록은 블로킹 → 스레드에서 실행
+    denied, spec, safe_params = await asyncio.to_thread(_authorize, state, tools)
+    if denied is not None:
+        return denied
+
+    try:
+        result = validate_output(spec, await get_executor().arun(spec, tools[tc.action_id], safe_params))
+    except ToolTimeout as e:
+        return _tool_failed(state, spec, safe_params, e.reason)
+    except SchemaError as e:
+        return _tool_failed(state, spec, safe_params, f"output_invalid: {e.reason}")
+    except Exception as e:
+        return _tool_failed(state, spec, safe_params, getattr(e, "reason", f"tool_error: {type(e).__name__}"))
+
+    final_ans = _complete_tool(state, spec, safe_params, result)
+    if final_ans is None:
+        final_ans = await get_llm().agenerate_response(state.question, [result])
+    return {
+        "tool_result": result,
+        "answer": final_ans
+    }
+
+
+def _authorize(state: GraphState, tools: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Any, Dict[str, Any]]:
+    """
+    registry 조회 + 정책 적용 + 구현 확인.
+    (거부 시 상태 갱신 또는 None, ActionSpec, 정리된 매개변수)
+    """
+    tc = state.tool_call
+    audit_write = get_tools()["audit.write"]
+
+    spec = get_registry().get(tc.action_id)
     if spec is None:
         # registry miss → deny
-        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "DENY", params=tc.params, reason="action_not_registered")
-        TOOLS["audit.write"]({"event": event})
+        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "DENY", params=tc.params, reason="action_not_registered", audit_level="BASIC")
+        audit_write({"event": event})
         # 디버깅: 에러 발생 시 출력
         print(f"[EXECUTE] Error: action_not_registered ({tc.action_id})")
-        return {"answer": f"DENY: action_not_registered ({tc.action_id})"}
+        return {"answer": f"DENY: action_not_registered ({tc.action_id})"}, None, tc.params
 
     # 정책 적용 (범위/스키마/허용 목록/PII/속도 제한)
     try:
         # enforce는 정리된 매개변수를 반환!
         safe_params = enforce(state.user, spec, tc.params)
-        decision = "PERMIT"
-        reason = None
     except Deny as e:
-        decision = "DENY"
         reason = e.reason
-        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, decision, params=tc.params, reason=reason)
-        TOOLS["audit.write"]({"event": event})
+        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "DENY", params=tc.params, reason=reason, audit_level=spec.audit_level)
+        audit_write({"event": event})
         # 디버깅: 에러 발생 시 출력
         print(f"[EXECUTE] Error: {reason}")
-        return {"answer": f"DENY: {reason}"}
+        return {"answer": f"DENY: {reason}"}, spec, tc.params
 
-    # 보호된 매개변수로 실행
-    tool_fn = TOOLS.get(tc.action_id)
-    if tool_fn is None:
-        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "DENY", params=safe_params, reason="tool_not_implemented")
-        TOOLS["audit.write"]({"event": event})
+    if tools.get(tc.action_id) is None:
+        event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "DENY", params=safe_params, reason="tool_not_implemented", audit_level=spec.audit_level)
+        audit_write({"event": event})
         # 디버깅: 에러 발생 시 출력
         print(f"[EXECUTE] Error: tool_not_implemented ({tc.action_id})")
-        return {"answer": f"DENY: tool_not_implemented ({tc.action_id})"}
+        return {"answer": f"DENY: tool_not_implemented ({tc.action_id})"}, spec, safe_params
+
+    return None, spec, safe_params
 
-    result = tool_fn(safe_params)
-    event = build_audit_event(state.trace_id, state.user.id, tc.action_id, decision, params=safe_params, result=result, reason=reason)
-    TOOLS["audit.write"]({"event": event})
 
-    # 최종 답변 생성 (LLM)
-    final_ans = LLM.generate_response(state.question, [result])
+def _tool_failed(state: GraphState, spec: Any, safe_params: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    tc = state.tool_call
+    event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "ERROR", params=safe_params, reason=reason, audit_level=spec.audit_level)
+    get_tools()["audit.write"]({"event": event})
+    print(f"[EXECUTE] Error: {reason} ({tc.action_id})")
+    return {"answer": f"ERROR: {reason} ({tc.action_id})"}
+
+
+def _complete_tool(state: GraphState, spec: Any, safe_params: Dict[str, Any], result: Dict[str, Any]) -> Optional[str]:
+    """실행 결과 감사 기록 + tool 이벤트. 결정적 도구는 템플릿 답변 반환 (None이면 LLM으로 생성)"""
+    tc = state.tool_call
+    event = build_audit_event(state.trace_id, state.user.id, tc.action_id, "PERMIT", params=safe_params, result=result, audit_level=spec.audit_level)
+    get_tools()["audit.write"]({"event": event})
+    _emit({"event": "tool", "action_id": tc.action_id, "result": result})
+
     # 디버깅: 실행 결과 출력
     print(f"[EXECUTE] Result: {result}")
-    return {
-        "tool_result": result,
-        "answer": final_ans
-    }
+    final_ans = _render_answer(spec, safe_params, result)
+    if final_ans is not None:
+        _emit({"event": "token", "text": final_ans})
+    return final_ans
+
+
+def _streaming() -> bool:
+    """run_graph_stream으로 실행 중인지 (그래프 밖이거나 invoke면 False)"""
+    try:
+        return bool(get_config().get("configurable", {}).get("stream_tokens"))
+    except RuntimeError:
+        return False
+
+
+def _emit(event: Dict[str, Any]) -> None:
+    """스트리밍 실행 중이면 진행 이벤트 전송"""
+    if _streaming():
+        get_stream_writer()(event)
+
 
+def _generate_answer(question: str, results: List[Dict[str, Any]]) -> str:
+    """LLM 답변 생성. 스트리밍 실행 중이면 토큰을 token 이벤트로 흘려보내며 누적"""
+    if not _streaming():
+        return get_llm().generate_response(question, results)
+    writer = get_stream_writer()
+    parts: List[str] = []
+    for text in get_llm().stream_response(question, results):
+        parts.append(text)
+        writer({"event": "token", "text": text})
+    return "".join(parts)
 
-def build_graph():
+
+def _render_answer(spec: Any, params: Dict[str, Any], result: Dict[str, Any]) -> Optional[str]:
+    """registry의 answer_template로 답변 생성 (템플릿이 없거나 값이 맞지 않으면 None → LLM 사용)"""
+    template = getattr(spec, "answer_template", "")
+    if not template:
+        return None
+    try:
+        return template.format(**params, **result)
+    except (KeyError, ValueError, TypeError, IndexError) as e:
+        print(f"[EXECUTE] Template fallback: {e!r}")
+        return None
+
+
+def get_graph():
+    global _graph
+    if _graph is None:
+        with _init_lock:
+            if _graph is None:
+                _graph = build_graph()
+    return _graph
+
+
+def get_async_graph():
+    global _async_graph
+    if _async_graph is None:
+        with _init_lock:
+            if _async_graph is None:
+                _async_graph = build_graph(async_nodes=True)
+    return _async_graph
+
+
+def warm_up() -> None:
+    """
+    Readiness용 명시적 초기화 훅.
+    레지스트리/도구/그래프/LLM 클라이언트와 RAG 서비스(ChromaDB 연결 + 임베딩 모델)를 미리 로드,
+    tiered 라우터의 예시 임베딩도 여기서 계산
+    """
+    from app.data.rag import get_rag_service
+
+    get_registry()
+    get_tools()
+    get_llm()
+    get_graph()
+    get_rag_service()
+    if Config.ROUTER_MODE == "tiered":
+        get_router().warm_up()
+
+
+def __getattr__(name: str) -> Any:
+    # 기존 전역 변수(REGISTRY/LLM/TOOLS/GRAPH) 호환: 첫 접근 시 지연 초기화
+    lazy = {"REGISTRY": get_registry, "LLM": get_llm, "TOOLS": get_tools, "GRAPH": get_graph}
+    if name in lazy:
+        return lazy[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def build_graph(async_nodes: bool = False):
     g = StateGraph(GraphState)
 
-    g.add_node("agent", _agent_decide)
-    g.add_node("tool", _execute_tool)
+    # async_nodes: ainvoke 전용 (LLM/검색 I/O를 await로 대기)
+    g.add_node("agent", _aagent_decide if async_nodes else _agent_decide)
+    g.add_node("tool", _aexecute_tool if async_nodes else _execute_tool)
 
     g.set_entry_point("agent")
     g.add_edge("agent", "tool")
@@ -128,17 +457,129 @@ def build_graph():
     return g.compile()
 
 
-GRAPH = build_graph()
+def _new_state(user: Dict[str, Any], question: str) -> GraphState:
+    # LLM 호출 전에 PII 마스킹 적용
+    masked_question = _mask_pii(question)
+    return GraphState(trace_id=str(uuid.uuid4()), user=user, question=masked_question)
+
+
+def _cache_lookup(state: GraphState) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+    """
+    의미상 같은 질문을 최근에 답했으면 LLM/도구 호출 없이 재사용 (같은 스코프 + 레지스트리 버전).
+    (캐시 hit 응답 또는 None, store용 질문 임베딩)
+    임베딩 모델이 아직 로드되지 않았으면 건너뜀 (캐시 때문에 모델 로딩/재시도를 유발하지 않음)
+    """
+    from app.data.rag import is_rag_ready
+
+    if not Config.ANSWER_CACHE_ENABLED or not is_rag_ready():
+        return None, None
+    try:
+        cached, embedding = get_answer_cache().lookup(state.question, state.user.scopes, get_registry().version)
+    except Exception as e:
+        # 캐시는 최적화일 뿐이므로 실패해도 그래프 실행
+        print(f"[CACHE] Lookup skipped: {e!r}")
+        return None, None
+    if cached is None:
+        return None, embedding
+
+    print(f"[CACHE] Hit: {state.question}")
+    tool_call = cached["tool_call"]
+    spec = get_registry().get(tool_call.action_id)
+    if spec is None:
+        # 캐시 이후 registry에서 빠진 action → 그래프로 다시 판단
+        return None, embedding
+    # 캐시 hit도 도구 호출과 같은 속도 제한 적용
+    if not _check_rate_limit(state.user.id, spec):
+        event = build_audit_event(
+            state.trace_id, state.user.id, tool_call.action_id, "DENY",
+            reason="rate_limit_exceeded", audit_level=spec.audit_level
+        )
+        get_tools()["audit.write"]({"event": event})
+        print("[CACHE] Error: rate_limit_exceeded")
+        return {"trace_id": state.trace_id, "user": state.user, "question": state.question, "answer": "DENY: rate_limit_exceeded"}, None
+
+    event = build_audit_event(
+        state.trace_id, state.user.id, tool_call.action_id, "PERMIT",
+        reason="answer_cache_hit", audit_level="BASIC"
+    )
+    get_tools()["audit.write"]({"event": event})
+    return {"trace_id": state.trace_id, "user": state.user, "question": state.question, **cached, "cache_hit": True}, embedding
+
+
+def _cacheable(out: Dict[str, Any]) -> bool:
+    """
+    성공한 도구 결과만 캐시.
+    거부(DENY)/오류(ERROR) 응답, 도구 없이 생성된 답변, 빈 결과(검색 0건 등)는 TTL 동안 재사용하면 안 됨
+    """
+    answer = out.get("answer")
+    result = out.get("tool_result")
+    if not answer or answer.startswith(("DENY", "ERROR")) or out.get("tool_call") is None or not result:
+        return False
+    return all(v for v in result.values() if isinstance(v, (list, dict)))
+
+
+def _cache_store(state: GraphState, embedding: Optional[List[float]], out: Dict[str, Any]) -> None:
+    if embedding is not None and _cacheable(out):
+        get_answer_cache().store(
+            state.question, state.user.scopes, get_registry().version, embedding,
+            {k: out.get(k) for k in ("tool_call", "tool_result", "answer")}
+        )
 
 
 def run_graph(user: Dict[str, Any], question: str) -> Dict[str, Any]:
-    trace_id = str(uuid.uuid4())
-    
-    # LLM 호출 전에 PII 마스킹 적용
-    masked_question = _mask_pii(question)
-    
-    state = GraphState(trace_id=trace_id, user=user, question=masked_question)
-    out = GRAPH.invoke(state)
+    state = _new_state(user, question)
+
+    cached, embedding = _cache_lookup(state)
+    if cached is not None:
+        return cached
+
+    out = get_graph().invoke(state)
     # out은 dict 형태로 업데이트된 state 조각이 들어올 수 있어, GraphState로 재구성
     # LangGraph 특성상 최종 반환을 그대로 사용
-    return {"trace_id": trace_id, **out}
+    _cache_store(state, embedding, out)
+    return {"trace_id": state.trace_id, **out}
+
+
+async def run_graph_async(user: Dict[str, Any], question: str) -> Dict[str, Any]:
+    """run_graph의 비동기 버전 (이벤트 루프에서 대기 → 동시 대화 수가 스레드풀 크기에 묶이지 않음)"""
+    state = _new_state(user, question)
+
+    # 캐시 조회는 질문 임베딩(CPU) 계산이 있어 스레드에서 실행
+    cached, embedding = await asyncio.to_thread(_cache_lookup, state)
+    if cached is not None:
+        return cached
+
+    out = await get_async_graph().ainvoke(state)
+    _cache_store(state, embedding, out)
+    return {"trace_id": state.trace_id, **out}
+
+
+def run_graph_stream(user: Dict[str, Any], question: str) -> Iterator[Dict[str, Any]]:
+    """
+    run_graph의 스트리밍 버전. 진행 이벤트를 순서대로 yield:
+    start → route(도구 결정) → tool(도구 실행 결과) → token*(답변 조각) → done(최종 상태)
+    """
+    state = _new_state(user, question)
+    yield {"event": "start", "trace_id": state.trace_id}
+
+    cached, embedding = _cache_lookup(state)
+    if cached is not None:
+        yield {"event": "token", "text": cached.get("answer") or ""}
+        yield {"event": "done", **cached}
+        return
+
+    out: Dict[str, Any] = state.model_dump()
+    for mode, chunk in get_graph().stream(
+        state,
+        config={"configurable": {"stream_tokens": True}},
+        stream_mode=["updates", "custom"]
+    ):
+        if mode == "custom":
+            yield chunk
+        else:
+            # 노드별 상태 갱신을 누적해 최종 상태 구성
+            for update in chunk.values():
+                out.update(update or {})
+
+    _cache_store(state, embedding, out)
+    yield {"event": "done", **out}
@@ -0,0 +1,61 @@
+# Document Chunking
+from __future__ import annotations
+from typing import List
+import re
+
+# 문장 경계: 종결 부호(. ! ? 。 ！ ？ …) 뒤 공백, 또는 줄바꿈
+# - "연 2.5%" 처럼 부호 뒤에 공백이 없으면 경계로 보지 않음
+# - 한국어 종결어미("~다.", "~요.")도 마침표 기준으로 분리됨
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？…])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장 단위로 분리 (빈 문장 제거)"""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """
+    문장 경계를 유지하며 chunk_size(문자 수) 이하의 청크로 분할.
+    - 다음 청크는 이전 청크의 마지막 문장들(overlap 문자 이내)로 시작해 문맥을 이어줌
+    - chunk_size보다 긴 단일 문장은 문자 단위로 잘라 분할
+    - chunk_size <= 0 이면 분할하지 않음
+    """
+    text = text.strip()
+    if chunk_size <= 0 or len(text) <= chunk_size:
+        return [text] if text else []
+
+    overlap = max(0, min(overlap, chunk_size // 2))
+    sentences: List[str] = []
+    for sentence in split_sentences(text):
+        if len(sentence) <= chunk_size:
+            sentences.append(sentence)
+        else:
+            step = chunk_size - overlap
+            sentences.extend(sentence[i:i + chunk_size] for i in range(0, len(sentence) - overlap, step))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    length = 0
+    for sentence in sentences:
+        if current and length + 1 + len(sentence) > chunk_size:
+            chunks.append(" ".join(current))
+
+            # overlap 문자 이내의 꼬리 문장들을 다음 청크로 이월
+            carry: List[str] = []
+            carry_len = 0
+            for prev in reversed(current):
+                if carry_len + len(prev) + 1 > overlap:
+                    break
+                carry.insert(0, prev)
+                carry_len += len(prev) + 1
+            if carry_len + len(sentence) > chunk_size:
+                carry, carry_len = [], 0
+            current, length = carry, max(carry_len - 1, 0)
+
+        length += len(sentence) + (1 if current else 0)
+        current.append(sentence)
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
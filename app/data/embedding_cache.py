@@ -0,0 +1,206 @@
+# Query Embedding Cache
+from __future__ import annotations
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import atexit
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 디스크 캐시 정리 주기 (put 횟수)
+_PRUNE_EVERY = 256
+# 미기록 항목이 이만큼 쌓이면 flush 주기를 기다리지 않고 바로 기록
+_FLUSH_BATCH = 256
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (NFKC + 공백 정리)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+class QueryEmbeddingCache:
+    """
+    쿼리 임베딩 캐시.
+    - 키: (모델명, 정규화된 쿼리)
+    - 1차: 프로세스 내 LRU (size/TTL 제한)
+    - 2차(선택): 로컬 SQLite 파일 → 재시작된 Pod도 warm 상태로 시작
+      (열 때와 put _PRUNE_EVERY회마다 TTL 만료 행 삭제 + max_rows 초과분은 오래된 순으로 삭제)
+      put은 메모리에만 쌓고 백그라운드 스레드가 flush_interval_sec마다 한 트랜잭션으로 기록
+      (WAL + synchronous=NORMAL → 요청 경로에서 커밋/fsync 없음, 종료 시 남은 항목 기록)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2048,
+        ttl_sec: int = 86400,
+        path: str = "",
+        max_rows: int = 100_000,
+        flush_interval_sec: float = 1.0
+    ):
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self.path = path
+        self.max_rows = max_rows
+        self.flush_interval_sec = flush_interval_sec
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()  # SQLite 연결 전용 (LRU 잠금과 분리 → 기록 중에도 조회/put 진행)
+        self._lru: "OrderedDict[Tuple[str, str], Tuple[float, List[float]]]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], Tuple[float, bytes]] = {}
+        self._wake = threading.Event()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                    " model TEXT NOT NULL, query TEXT NOT NULL,"
+                    " created_at REAL NOT NULL, embedding BLOB NOT NULL,"
+                    " PRIMARY KEY (model, query))"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_query_embeddings_created ON query_embeddings(created_at)"
+                )
+                self._db.commit()
+                self._prune(time.time())
+            except sqlite3.Error as e:
+                # 디스크 캐시는 최적화일 뿐이므로 실패해도 메모리 캐시로 동작
+                logger.warning(f"⚠️ 쿼리 캐시 파일 열기 실패, 메모리 캐시만 사용: {e}")
+                self._db = None
+
+        if self._db is not None:
+            threading.Thread(target=self._flush_loop, name="query-cache-flush", daemon=True).start()
+            atexit.register(self.flush)
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        key = (model, normalize_query(query))
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and now - entry[0] < self.ttl_sec:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._lru[key]
+
+        # 디스크 조회는 LRU 잠금 밖에서 (다른 요청의 get/put을 막지 않도록)
+        loaded = self._load(key, now)
+        with self._lock:
+            if loaded is None:
+                self.misses += 1
+                return None
+            self._remember(key, loaded[0], loaded[1])
+            self.hits += 1
+            return loaded[1]
+
+    def put(self, model: str, query: str, embedding: List[float]) -> None:
+        key = (model, normalize_query(query))
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, embedding)
+            if self._db is not None:
+                self._pending[key] = (now, array("f", embedding).tobytes())
+                if len(self._pending) >= _FLUSH_BATCH:
+                    self._wake.set()
+
+    def flush(self) -> None:
+        """미기록 항목을 한 트랜잭션으로 디스크에 기록 (백그라운드 스레드/종료 시 호출)"""
+        if self._db is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        with self._db_lock:
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?, ?, ?)",
+                    [(model, query, created_at, blob) for (model, query), (created_at, blob) in pending.items()],
+                )
+                self._db.commit()
+                before = self._puts
+                self._puts += len(pending)
+                if self._puts // _PRUNE_EVERY != before // _PRUNE_EVERY:
+                    self._prune(time.time())
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 쿼리 캐시 저장 실패: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "size": len(self._lru),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self.hits = 0
+            self.misses = 0
+            self._pending.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM query_embeddings")
+                self._db.commit()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval_sec)
+            self._wake.clear()
+            self.flush()
+
+    def _prune(self, now: float) -> None:
+        """만료 행 삭제 후 max_rows를 넘는 만큼 오래된 행부터 삭제 (디스크 캐시 크기 제한)"""
+        self._db.execute("DELETE FROM query_embeddings WHERE created_at <= ?", (now - self.ttl_sec,))
+        excess = self._db.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] - self.max_rows
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM query_embeddings WHERE rowid IN"
+                " (SELECT rowid FROM query_embeddings ORDER BY created_at LIMIT ?)",
+                (excess,),
+            )
+        self._db.commit()
+
+    def _remember(self, key: Tuple[str, str], created_at: float, embedding: List[float]) -> None:
+        self._lru[key] = (created_at, embedding)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def _load(self, key: Tuple[str, str], now: float) -> Optional[Tuple[float, List[float]]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._pending.get(key)  # LRU에서 밀려났지만 아직 기록 전인 항목
+        if row is None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute(
+                        "SELECT created_at, embedding FROM query_embeddings WHERE model = ? AND query = ?",
+                        key,
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ 쿼리 캐시 조회 실패: {e}")
+                return None
+        if row is None or now - row[0] >= self.ttl_sec:
+            return None
+        embedding = array("f")
+        embedding.frombytes(row[1])
+        return row[0], embedding.tolist()
@@ -0,0 +1,81 @@
+# Streaming JSON Reader
+from __future__ import annotations
+from typing import Any, Iterator, TextIO
+import json
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_records(path: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    JSON 배열 파일 또는 JSONL 파일에서 레코드를 하나씩 읽어옴.
+    파일 전체를 메모리에 올리지 않고 chunk_size 단위로 읽으며 파싱.
+    - 첫 글자가 '[' 이면 JSON 배열, 그 외에는 JSONL(한 줄에 한 레코드)로 취급
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(chunk_size)
+        stripped = head.lstrip(_WHITESPACE + "﻿")
+        if stripped.startswith("["):
+            yield from _iter_array(f, stripped[1:], chunk_size)
+        else:
+            yield from _iter_lines(f, head)
+
+
+def _iter_lines(f: TextIO, head: str) -> Iterator[Any]:
+    """JSONL: 빈 줄은 건너뛰고 줄 단위로 파싱"""
+    pending = head
+    for line in f:
+        pending += line
+        if not pending.endswith("\n"):
+            continue
+        for raw in pending.splitlines():
+            if raw.strip():
+                yield json.loads(raw)
+        pending = ""
+    for raw in pending.splitlines():
+        if raw.strip():
+            yield json.loads(raw)
+
+
+def _iter_array(f: TextIO, buf: str, chunk_size: int) -> Iterator[Any]:
+    """JSON 배열: 원소 단위로 raw_decode, 버퍼가 모자라면 이어서 읽음"""
+    pos = 0
+    eof = False
+    while True:
+        # 공백/구분자(,) 건너뛰기
+        while pos < len(buf) and buf[pos] in _WHITESPACE + ",":
+            pos += 1
+
+        if pos >= len(buf):
+            more = "" if eof else f.read(chunk_size)
+            if not more:
+                raise json.JSONDecodeError("배열이 닫히지 않음", buf, pos)
+            buf, pos = more, 0
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = _DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        # 버퍼 끝에서 끝난 값(숫자 등)은 잘렸을 수 있으므로 더 읽고 재시도
+        if end == len(buf) and not eof:
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield item
+        pos = end
+        # 처리한 앞부분은 버려 버퍼가 커지지 않게 유지
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
@@ -0,0 +1,337 @@
+# Lexical (BM25) Index
+from __future__ import annotations
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from app.data.retrieval_policy import match_where
+from app.data.vector_store import _FileLock
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_SCRIPT_RUN = re.compile(r"[0-9a-z_]+|[^0-9a-z_]+")
+
+# 저널이 이 건수와 색인 크기를 모두 넘으면 스냅샷으로 압축
+_COMPACT_MIN_OPS = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 대응 토크나이저.
+    - 영문/숫자 연속 구간은 단어 그대로 (상품 코드, 금리명 등 정확 일치용)
+    - 그 외(한글 등)는 문자 2-gram (형태소 분석기 없이 조사/어미 변화에 강건)
+    """
+    tokens: List[str] = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", text).lower()):
+        for run in _SCRIPT_RUN.findall(word):
+            if run.isascii() or len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class LexicalIndex:
+    """
+    청크 텍스트에 대한 인메모리 BM25 역색인.
+    - 적재 시 청크 단위로 증분 갱신 (같은 id는 교체, 변경된 문서는 parent_id 기준 제거)
+    - path 지정 시 스냅샷(JSON) + 변경 저널({path}.journal, JSONL)로 영속화
+      save()는 마지막 저장 이후 변경분만 저널에 append, 저널이 색인 크기를 넘으면 스냅샷으로 압축
+    - 다른 프로세스(worker)의 갱신은 검색 시 백그라운드 스레드에서 반영 (refresh_interval_sec 간격,
+      저널 추가분만 읽고 스냅샷이 바뀌었으면 전체 재로딩) → 검색은 파일 I/O를 기다리지 않음
+    - 쓰기(save/compact)는 {path}.lock 파일 잠금으로 프로세스 간 직렬화하고, 쓰기 전에 다른 writer의
+      변경을 먼저 반영한 뒤 미저장 변경을 다시 적용 (worker 레플리카/pool 모드에서도 서로 덮어쓰지 않음)
+    API와 worker가 같은 파일을 보려면 path가 공유 볼륨에 있어야 함
+    """
+
+    def __init__(self, path: str = "", k1: float = 1.5, b: float = 0.75, load: bool = True, refresh_interval_sec: float = 5.0):
+        self.path = path
+        self.journal_path = f"{path}.journal" if path else ""
+        self.k1 = k1
+        self.b = b
+        self.refresh_interval_sec = refresh_interval_sec
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._pending: List[Dict[str, Any]] = []  # 아직 저널에 쓰지 않은 변경
+        self._mtime: Optional[float] = None  # 읽은 스냅샷 mtime
+        self._journal_offset = 0  # 읽은(쓴) 저널 바이트 위치
+        self._journal_ops = 0  # 저널의 청크 변경 건수 (압축 판단용)
+        self._refresh_lock = threading.Lock()
+        self._last_refresh = time.monotonic()
+        if load:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """청크 추가 (이미 있는 id는 교체)"""
+        ids, documents, metadatas = list(ids), list(documents), list(metadatas)
+        with self._lock:
+            self._apply_add(ids, documents, metadatas)
+            if self.path:
+                self._pending.append({"op": "add", "ids": ids, "documents": documents, "metadatas": metadatas})
+
+    def remove_parents(self, parent_ids: Iterable[str]) -> None:
+        """원본 문서 id 기준으로 기존 청크 제거 (재적재 시 잔여 청크 방지)"""
+        parents = list(dict.fromkeys(parent_ids))
+        if not parents:
+            return
+        with self._lock:
+            self._apply_remove_parents(parents)
+            if self.path:
+                self._pending.append({"op": "remove_parents", "parents": parents})
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 검색. 문서(parent_id)별 최고 점수 청크만 반환 (형식은 RAGService.search 결과와 동일)"""
+        self._maybe_refresh()
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self._docs:
+                return []
+            n_docs = len(self._docs)
+            avg_len = self._total_length / n_docs
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / avg_len)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            results: List[Dict[str, Any]] = []
+            seen_parents = set()
+            for chunk_id, score in sorted(scores.items(), key=lambda kv: kv[1], reverse=True):
+                doc = self._docs[chunk_id]
+                metadata = doc["metadata"]
+                parent_id = metadata.get("parent_id", chunk_id)
+                if parent_id in seen_parents or not match_where(metadata, where):
+                    continue
+                seen_parents.add(parent_id)
+                results.append({"content": doc["content"], "metadata": metadata, "score": round(score, 3)})
+                if len(results) >= n_results:
+                    break
+            return results
+
+    def save(self) -> None:
+        """
+        마지막 저장 이후 변경분만 저널에 append (적재 배치 크기에 비례, 전체 색인을 다시 쓰지 않음).
+        스냅샷이 없거나 저널이 색인 크기(최소 _COMPACT_MIN_OPS건)를 넘으면 compact()
+        """
+        if not self.path:
+            return
+        with self._lock, self._file_lock():
+            # 다른 writer의 변경을 먼저 반영 (미저장 변경은 그 뒤에 다시 적용됨 → 저널 순서와 같은 결과)
+            self.refresh()
+            if not os.path.exists(self.path):
+                self._write_snapshot()
+                return
+            if self._pending:
+                data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self._pending)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(data)
+                    self._journal_offset = f.tell()
+                self._journal_ops += sum(_op_size(op) for op in self._pending)
+                self._pending = []
+            if self._journal_ops > max(_COMPACT_MIN_OPS, len(self._docs)):
+                self._write_snapshot()
+
+    def compact(self, replace: bool = False) -> None:
+        """
+        현재 색인을 스냅샷으로 저장하고 저널 비움.
+        replace=True면 다른 writer의 변경을 반영하지 않고 이 색인으로 교체 (전체 재구성용)
+        """
+        if not self.path:
+            return
+        with self._lock, self._file_lock():
+            if not replace:
+                self.refresh()
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        # 임시 파일 작성 후 교체 → 읽는 쪽이 반쯤 쓰인 파일을 보지 않음 (호출 측에서 잠금 보유)
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "docs": self._docs}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            open(self.journal_path, "w", encoding="utf-8").close()
+            self._mtime = os.path.getmtime(self.path)
+            self._journal_offset = 0
+            self._journal_ops = 0
+            self._pending = []
+
+    def refresh(self) -> None:
+        """
+        다른 프로세스의 갱신 반영 (저널 추가분만 적용, 스냅샷이 바뀌었거나 저널이 비워졌으면 전체 재로딩).
+        아직 저장하지 않은 이 프로세스의 변경은 반영 후 다시 적용
+        """
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        try:
+            journal_size = os.path.getsize(self.journal_path)
+        except OSError:
+            journal_size = 0
+        if mtime != self._mtime or journal_size < self._journal_offset:
+            self._load()
+        elif journal_size > self._journal_offset:
+            with self._lock:
+                if self._read_journal():
+                    self._reapply_pending()
+
+    def _file_lock(self) -> _FileLock:
+        return _FileLock(f"{self.path}.lock")
+
+    def _maybe_refresh(self) -> None:
+        # 간격이 지났으면 백그라운드에서 refresh (이미 진행 중이면 건너뜀)
+        if not self.path or self.refresh_interval_sec <= 0:
+            return
+        if time.monotonic() - self._last_refresh < self.refresh_interval_sec:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        self._last_refresh = time.monotonic()
+        threading.Thread(target=self._background_refresh, name="lexical-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"⚠️ 어휘 색인 갱신 실패, 기존 색인 유지: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        mtime = None
+        docs: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.path):
+            try:
+                mtime = os.path.getmtime(self.path)
+                with open(self.path, encoding="utf-8") as f:
+                    docs = json.load(f).get("docs", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ 어휘 색인 로딩 실패, 기존 색인 유지: {e}")
+                return
+
+        # 새 색인은 락 밖에서 구성 후 교체 (재로딩 중에도 검색은 기존 색인 사용)
+        fresh = LexicalIndex(k1=self.k1, b=self.b, load=False)
+        for chunk_id, doc in docs.items():
+            fresh._docs[chunk_id] = doc
+            fresh._index(chunk_id, doc["content"])
+        fresh.journal_path = self.journal_path
+        fresh._read_journal()
+
+        with self._lock:
+            self._docs, self._postings = fresh._docs, fresh._postings
+            self._lengths, self._total_length = fresh._lengths, fresh._total_length
+            self._mtime = mtime
+            self._journal_offset, self._journal_ops = fresh._journal_offset, fresh._journal_ops
+            self._reapply_pending()
+        logger.info(f"✅ 어휘 색인 로딩 완료 ({len(self._docs)}개 청크)")
+
+    def _read_journal(self) -> bool:
+        """저널의 읽지 않은 부분 적용 (마지막 줄이 쓰는 중이면 다음에 읽음). 적용한 변경이 있으면 True"""
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except OSError:
+            return False
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            op = json.loads(line)
+            self._apply(op)
+            self._journal_ops += _op_size(op)
+        self._journal_offset += end
+        return end > 0
+
+    def _reapply_pending(self) -> None:
+        for op in self._pending:
+            self._apply(op)
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        if op["op"] == "add":
+            self._apply_add(op["ids"], op["documents"], op["metadatas"])
+        elif op["op"] == "remove_parents":
+            self._apply_remove_parents(op["parents"])
+
+    def _apply_add(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        for chunk_id, text, metadata in zip(ids, documents, metadatas):
+            self._remove(chunk_id)
+            self._docs[chunk_id] = {"content": text, "metadata": metadata}
+            self._index(chunk_id, text)
+
+    def _apply_remove_parents(self, parent_ids: Iterable[str]) -> None:
+        parents = set(parent_ids)
+        stale = [
+            chunk_id for chunk_id, doc in self._docs.items()
+            if doc["metadata"].get("parent_id", chunk_id) in parents
+        ]
+        for chunk_id in stale:
+            self._remove(chunk_id)
+
+    def _index(self, chunk_id: str, text: str) -> None:
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            self._postings.setdefault(term, {})[chunk_id] = tf
+        self._lengths[chunk_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def _remove(self, chunk_id: str) -> None:
+        doc = self._docs.pop(chunk_id, None)
+        if doc is None:
+            return
+        for term in set(tokenize(doc["content"])):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id, 0)
+
+
+def _op_size(op: Dict[str, Any]) -> int:
+    return len(op.get("ids") or op.get("parents") or ())
+
+
+def reciprocal_rank_fusion(rankings: List[List[Dict[str, Any]]], k: int = 60, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    여러 검색 결과 목록을 순위 기반으로 병합 (RRF: score = Σ 1 / (k + rank)).
+    점수 척도가 다른 벡터/BM25 결과를 정규화 없이 합칠 수 있음. score는 융합 점수로 교체
+    """
+    fused: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    for results in rankings:
+        for rank, item in enumerate(results, start=1):
+            metadata = item.get("metadata", {})
+            key = metadata.get("parent_id") or metadata.get("title") or item.get("content", "")
+            score, first = fused.get(key, (0.0, item))
+            fused[key] = (score + 1.0 / (k + rank), first)
+
+    ranked = sorted(fused.values(), key=lambda x: x[0], reverse=True)[:limit]
+    return [{**item, "score": round(score, 4)} for score, item in ranked]
@@ -1,11 +1,21 @@
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Union
+import asyncio
+import hashlib
 import logging
 import json
 import os
+import threading
+import time
 from app.infra.config import Config
+from app.data.json_stream import iter_json_records
+from app.data.chunking import chunk_text
+from app.data.embedding_cache import QueryEmbeddingCache, normalize_query
+from app.data.lexical_index import LexicalIndex
+from app.data.vector_store import open_collection
+from app.data.retrieval_policy import to_epoch
+from app.platform.pii import get_pii_masker
 
 logger = logging.getLogger(__name__)
 
@@ -13,20 +23,34 @@ logger = logging.getLogger(__name__)
 class RAGService:
     def __init__(self):
         try:
-            # ChromaDB 클라이언트 초기화 (에러 처리 추가)
-            self.client = chromadb.HttpClient(
-                host=Config.CHROMA_HOST,
-                port=Config.CHROMA_PORT,
-                settings=Settings(anonymized_telemetry=False)
+            # 무거운 의존성(torch 등)은 실제 초기화 시점에 로드 → import만으로는 비용 없음
+            from sentence_transformers import SentenceTransformer
+
+            self.model_name = Config.EMBEDDING_MODEL_NAME
+            self.embedding_model = SentenceTransformer(self.model_name)
+
+            # 쿼리 임베딩 캐시 (반복 쿼리는 encode 생략)
+            self.query_cache = QueryEmbeddingCache(
+                max_size=Config.QUERY_CACHE_SIZE,
+                ttl_sec=Config.QUERY_CACHE_TTL_SEC,
+                path=Config.QUERY_CACHE_PATH,
+                max_rows=Config.QUERY_CACHE_MAX_ROWS,
+                flush_interval_sec=Config.QUERY_CACHE_FLUSH_SEC
             )
 
-            self.embedding_model = SentenceTransformer('paraphrase-MiniLM-L3-v2')
+            # BM25 어휘 색인 (상품 코드/금리명 등 정확한 용어 검색 보완)
+            self.lexical_index = LexicalIndex(
+                Config.LEXICAL_INDEX_PATH,
+                refresh_interval_sec=Config.LEXICAL_INDEX_REFRESH_SEC
+            ) if Config.HYBRID_SEARCH_ENABLED else None
 
-            # 컬렉션 생성
-            self.collection = self.client.get_or_create_collection(
-                name="documents",
-                metadata={"description": "문서 검색용 벡터 컬렉션"}
-            )
+            # 컬렉션 생성 (Config.VECTOR_STORE에 따라 ChromaDB 서버 또는 로컬 저장소)
+            self.collection = open_collection("documents")
+            self._async_collection: Any = None  # asearch() 첫 호출 시 생성 (이벤트 루프 필요)
+            # 적재 세대 기록용 컬렉션 (worker/API 파드가 같은 ChromaDB를 보므로 프로세스 간 공유됨)
+            self.state_collection = open_collection(INGEST_STATE_COLLECTION)
+            self._generation_cache: Optional[str] = None
+            self._generation_checked_at = 0.0
 
             logger.info("✅ RAG 서비스 초기화 완료")
 
@@ -34,7 +58,11 @@ class RAGService:
             logger.error(f"❌ RAG 서비스 초기화 실패: {e}")
             raise
 
-    def load_json_data(self, json_source: Union[str, Dict[str, Any], List[Dict[str, Any]]]) -> bool:
+    def load_json_data(
+        self,
+        json_source: Union[str, Dict[str, Any], List[Dict[str, Any]]],
+        incremental: Optional[bool] = None
+    ) -> bool:
         """JSON 파일 경로나 인메모리 JSON(dict/list)에서 문서를 로드해 추가."""
         try:
             if isinstance(json_source, str):
@@ -63,32 +91,16 @@ class RAGService:
             # JSON 데이터를 documents 형식으로 변환
             documents = []
             for idx, item in enumerate(data):
-                if not isinstance(item, dict):
-                    logger.warning(f"⚠️ 문서 항목 스킵: dict가 아님 (index={idx})")
-                    continue
-
-                metadata = item.get("metadata", {})
-                if not isinstance(metadata, dict):
-                    metadata = {}
-
-                doc = {
-                    "id": item.get("id", f"doc_{idx}"),
-                    "content": item.get("content", ""),
-                    "metadata": {
-                        "title": item.get("title", ""),
-                        "grade": metadata.get("grade", ""),
-                        "effective_date": metadata.get("effective_date", ""),
-                        "category": metadata.get("category", "")
-                    }
-                }
-                documents.append(doc)
+                doc = self._to_document(item, idx)
+                if doc is not None:
+                    documents.append(doc)
 
             if not documents:
                 logger.error("❌ 유효한 문서 항목이 없음")
                 return False
 
             # 벡터화 및 저장
-            success = self.add_documents(documents)
+            success = self.add_documents(documents, incremental=incremental)
             if success:
                 logger.info(f"✅ {len(documents)}개 문서 로드 및 추가 완료")
             return success  # ✅ 항상 bool 반환
@@ -100,88 +112,524 @@ class RAGService:
             logger.error(f"❌ 문서 로드 실패: {e}")
             return False
 
-    def add_documents(self, documents: List[Dict[str, Any]]) -> bool:
+    def load_json_stream(
+        self,
+        path: str,
+        batch_size: Optional[int] = None,
+        incremental: Optional[bool] = None
+    ) -> bool:
+        """
+        대용량 JSON 배열/JSONL 파일을 스트리밍으로 적재.
+        파일 전체를 메모리에 올리지 않고 batch_size 단위로 임베딩 및 저장.
+        """
+        try:
+            if not os.path.isfile(path):
+                logger.error(f"❌ 파일이 존재하지 않음: {path}")
+                return False
+
+            documents = (
+                doc for idx, item in enumerate(iter_json_records(path))
+                if (doc := self._to_document(item, idx)) is not None
+            )
+            stats = self._ingest_batches(
+                documents,
+                batch_size or Config.INGEST_BATCH_SIZE,
+                self._is_incremental(incremental)
+            )
+            if not sum(stats.values()):
+                logger.warning("⚠️ 로드할 문서가 없음")
+                return False
+
+            logger.info(f"✅ 문서 스트리밍 적재 완료 {stats}")
+            return True
+
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ JSON 파싱 오류: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ 문서 스트리밍 적재 실패: {e}")
+            return False
+
+    def _to_document(self, item: Any, idx: int) -> Optional[Dict[str, Any]]:
+        """JSON 항목을 documents 형식으로 변환 (dict가 아니면 None)"""
+        if not isinstance(item, dict):
+            logger.warning(f"⚠️ 문서 항목 스킵: dict가 아님 (index={idx})")
+            return None
+
+        metadata = item.get("metadata", {})
+        if not isinstance(metadata, dict):
+            metadata = {}
+
+        doc_metadata = {
+            "title": item.get("title", ""),
+            "grade": metadata.get("grade", ""),
+            "effective_date": metadata.get("effective_date", ""),
+            "category": metadata.get("category", ""),
+            "status": metadata.get("status", "active")
+        }
+        # where 절 범위 필터용 숫자 시행일 (ChromaDB는 문자열 범위 비교 불가)
+        effective_ts = to_epoch(doc_metadata["effective_date"])
+        if effective_ts is not None:
+            doc_metadata["effective_ts"] = effective_ts
+
+        return {
+            "id": item.get("id", f"doc_{idx}"),
+            "content": item.get("content", ""),
+            "metadata": doc_metadata
+        }
+
+    def add_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        incremental: Optional[bool] = None
+    ) -> bool:
         """문서 추가 및 벡터화 (배치 처리로 메모리 효율적)"""
         try:
-            batch_size = 10
+            stats = self._ingest_batches(
+                documents,
+                batch_size or Config.INGEST_BATCH_SIZE,
+                self._is_incremental(incremental)
+            )
+            logger.info(f"✅ {len(documents)}개 문서 처리 완료 {stats}")
+            return True
 
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
+        except Exception as e:
+            logger.error(f"❌ 문서 추가 실패: {e}")
+            return False
 
-                texts = [doc["content"] for doc in batch]
-                metadatas = [doc.get("metadata", {}) for doc in batch]
-                ids = [doc.get("id", f"doc_{i+j}") for j, doc in enumerate(batch)]
+    def sync_documents(self, documents: List[Dict[str, Any]], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        증분 동기화: 내용이 바뀐 문서만 upsert하고 added/updated/skipped 건수 반환.
+        (야간 재동기화처럼 대부분 변경이 없는 입력에 사용)
+        """
+        try:
+            return self._ingest_batches(documents, batch_size or Config.INGEST_BATCH_SIZE, incremental=True)
+        except Exception as e:
+            logger.error(f"❌ 문서 동기화 실패: {e}")
+            return {"added": 0, "updated": 0, "skipped": 0, "error": str(e)}
+
+    def _is_incremental(self, incremental: Optional[bool]) -> bool:
+        return Config.INGEST_INCREMENTAL if incremental is None else incremental
+
+    def _existing_hashes(self, ids: List[str]) -> Dict[str, str]:
+        """이미 저장된 문서의 content_hash 조회 (부모 문서 id → hash)"""
+        existing = self.collection.get(where={"parent_id": {"$in": ids}}, include=["metadatas"])
+        return {
+            meta["parent_id"]: meta.get("content_hash", "")
+            for meta in existing["metadatas"] if meta
+        }
+
+    def _to_chunks(self, doc: Dict[str, Any], doc_id: str, content_hash: str) -> List[Dict[str, Any]]:
+        """
+        문서를 청크로 분할. 각 청크는 parent_id(원본 문서 id)와 chunk_index를 메타데이터로 가짐.
+        청크가 1개면 원본 id를 그대로 사용
+        """
+        pieces = chunk_text(doc["content"], Config.CHUNK_SIZE, Config.CHUNK_OVERLAP) or [doc["content"]]
+        chunks = []
+        for i, piece in enumerate(pieces):
+            chunks.append({
+                "id": doc_id if len(pieces) == 1 else f"{doc_id}#{i}",
+                "content": piece,
+                "metadata": {
+                    **doc.get("metadata", {}),
+                    "content_hash": content_hash,
+                    "parent_id": doc_id,
+                    "chunk_index": i
+                }
+            })
+        return chunks
+
+    def _write_chunks(self, write: Callable[..., None], stale_parents: List[str], **kwargs: Any) -> None:
+        """변경된 문서의 기존 청크를 지운 뒤 새 청크 저장 (청크 수가 바뀌어도 잔여 청크 없음)"""
+        if stale_parents:
+            self.collection.delete(where={"parent_id": {"$in": stale_parents}})
+            self.collection.delete(ids=stale_parents)
+        write(**kwargs)
+
+        # 어휘 색인도 같은 청크로 갱신 (저장은 적재 완료 시 1회)
+        if self.lexical_index is not None:
+            self.lexical_index.remove_parents(stale_parents)
+            self.lexical_index.add(kwargs["ids"], kwargs["documents"], kwargs["metadatas"])
+
+    def _ingest_batches(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        batch_size: int,
+        incremental: bool = False
+    ) -> Dict[str, int]:
+        """
+        배치 단위 임베딩 + 저장 파이프라인.
+        배치 N의 ChromaDB 쓰기를 백그라운드 스레드에서 수행하는 동안 배치 N+1을 임베딩.
+        (쓰기는 최대 1개만 진행 중 → 메모리 사용량 제한)
+        - incremental=True: content_hash가 같은 문서는 건너뛰고 나머지는 upsert
+        - 각 문서는 청크 단위로 분할되어 저장 (건수 통계는 원본 문서 기준)
+        """
+        stats = {"added": 0, "updated": 0, "skipped": 0}
+        seen = 0
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-writer") as writer:
+            pending: Optional[Future] = None
+            for batch in _batched(documents, batch_size):
+                ids = [doc.get("id", f"doc_{seen + j}") for j, doc in enumerate(batch)]
+                hashes = [_content_hash(doc) for doc in batch]
+                seen += len(batch)
+                write = self.collection.add
+                stale_parents: List[str] = []
+
+                if incremental:
+                    # 같은 배치 내 중복 id는 마지막 항목만 유지
+                    latest = {doc_id: j for j, doc_id in enumerate(ids)}
+                    existing = self._existing_hashes(list(latest))
+                    changed = [j for doc_id, j in latest.items() if existing.get(doc_id) != hashes[j]]
+
+                    stats["skipped"] += len(batch) - len(changed)
+                    stats["updated"] += sum(1 for j in changed if ids[j] in existing)
+                    stats["added"] += sum(1 for j in changed if ids[j] not in existing)
+                    if not changed:
+                        continue
+
+                    batch = [batch[j] for j in changed]
+                    ids = [ids[j] for j in changed]
+                    hashes = [hashes[j] for j in changed]
+                    stale_parents = ids
+                    write = self.collection.upsert
+                else:
+                    stats["added"] += len(batch)
+
+                # 문서 → 청크 분할 (문장 경계 + overlap)
+                chunks = [
+                    chunk
+                    for doc, doc_id, h in zip(batch, ids, hashes)
+                    for chunk in self._to_chunks(doc, doc_id, h)
+                ]
+                texts = [chunk["content"] for chunk in chunks]
+                if Config.PII_MASK_ON_INGEST:
+                    texts = get_pii_masker().mask_many(texts)
+                metadatas = [chunk["metadata"] for chunk in chunks]
+                chunk_ids = [chunk["id"] for chunk in chunks]
 
                 # 임베딩 생성 (배치 처리)
                 embeddings = self.embedding_model.encode(texts, batch_size=batch_size).tolist()
 
-                # ChromaDB에 저장
-                self.collection.add(
+                # 이전 배치 쓰기 완료 대기 후 현재 배치 쓰기 시작 (실패 시 예외 전파)
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(
+                    self._write_chunks,
+                    write,
+                    stale_parents,
                     embeddings=embeddings,
                     documents=texts,
                     metadatas=metadatas,
-                    ids=ids
+                    ids=chunk_ids
                 )
 
-            logger.info(f"✅ {len(documents)}개 문서 추가 완료")
-            return True
+            if pending is not None:
+                pending.result()
 
-        except Exception as e:
-            logger.error(f"❌ 문서 추가 실패: {e}")
-            return False
+        if stats["added"] or stats["updated"]:
+            if self.lexical_index is not None:
+                self.lexical_index.save()
+            self.mark_ingested()
+        return stats
 
-    def search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
+    def mark_ingested(self) -> None:
+        """문서 적재 세대 갱신 (세대 컬렉션에 기록 → 다른 파드의 응답 캐시도 무효화)"""
+        global _ingest_generation
+        _ingest_generation += 1
+        generation = str(time.time_ns())
+        try:
+            self.state_collection.upsert(
+                ids=[INGEST_GENERATION_ID],
+                embeddings=[[0.0]],
+                documents=[""],
+                metadatas=[{"generation": generation}]
+            )
+            self._generation_cache = generation
+            self._generation_checked_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"⚠️ 적재 세대 기록 실패: {e}")
+
+    def ingest_generation(self) -> str:
+        """
+        공유 저장소 기준 현재 적재 세대.
+        매 조회마다 원격 호출하지 않도록 INGEST_GENERATION_POLL_SEC 동안 마지막 값을 재사용
+        """
+        now = time.monotonic()
+        if self._generation_cache is not None and now - self._generation_checked_at < Config.INGEST_GENERATION_POLL_SEC:
+            return self._generation_cache
+        try:
+            result = self.state_collection.get(ids=[INGEST_GENERATION_ID], include=["metadatas"])
+            metadatas = result.get("metadatas") or []
+            generation = str(metadatas[0].get("generation", "0")) if metadatas and metadatas[0] else "0"
+        except Exception as e:
+            logger.warning(f"⚠️ 적재 세대 조회 실패: {e}")
+            # 조회 실패 시 마지막 값 유지 (일시 장애로 캐시 전체가 비워지지 않도록)
+            generation = self._generation_cache if self._generation_cache is not None else str(_ingest_generation)
+        self._generation_cache = generation
+        self._generation_checked_at = now
+        return generation
+
+    def rebuild_lexical_index(self, page_size: int = 1000) -> int:
+        """컬렉션 전체로 어휘 색인 재구성 (색인 도입 이전 데이터, 파일 유실 시 사용). 청크 수 반환"""
+        if self.lexical_index is None:
+            return 0
+        # 기존 파일은 읽지 않고 빈 색인에서 시작, 완료 후 스냅샷으로 교체
+        index = LexicalIndex(
+            self.lexical_index.path,
+            load=False,
+            refresh_interval_sec=self.lexical_index.refresh_interval_sec
+        )
+        offset = 0
+        while True:
+            page = self.collection.get(limit=page_size, offset=offset, include=["documents", "metadatas"])
+            if not page["ids"]:
+                break
+            index.add(page["ids"], page["documents"], [m or {} for m in page["metadatas"]])
+            offset += len(page["ids"])
+        index.compact(replace=True)
+        self.lexical_index = index
+        logger.info(f"✅ 어휘 색인 재구성 완료 ({offset}개 청크)")
+        return offset
+
+    def search(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """유사도 검색 (에러 처리 강화)"""
+        return self.search_many([query], n_results=n_results, where=where)[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 쿼리를 한 번에 검색.
+        - 임베딩: 캐시 miss 쿼리만 모아 encode() 1회
+        - 검색: 다중 임베딩으로 collection.query 1회
+        - where: 메타데이터 필터 (ChromaDB 내부에서 top-k 선정 전에 적용)
+        결과는 입력 순서대로 search()와 같은 형식으로 반환
+        """
+        outputs: List[Dict[str, Any]] = [{"results": [], "error": "빈 쿼리"} for _ in queries]
+        valid = [i for i, q in enumerate(queries) if q.strip()]
+        if not valid:
+            return outputs
+
         try:
-            if not query.strip():
-                return {"results": [], "error": "빈 쿼리"}
+            # 쿼리 임베딩 (캐시 우선)
+            query_embeddings = self._embed_queries([queries[i] for i in valid])
 
-            # 쿼리 임베딩
-            query_embedding = self.embedding_model.encode([query]).tolist()[0]
+            # 검색 실행 (같은 문서의 청크가 겹칠 수 있으므로 여유 있게 조회 후 문서 단위로 중복 제거)
+            results = self.collection.query(**self._query_kwargs(query_embeddings, n_results, where))
+            self._fill_outputs(outputs, queries, valid, results, n_results)
 
-            # 검색 실행
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=min(n_results, 10),  # 최대 10개로 제한
-                include=['documents', 'metadatas', 'distances']
-            )
+        except Exception as e:
+            logger.error(f"❌ 검색 실패: {e}")
+            for i in valid:
+                outputs[i] = {"results": [], "error": str(e)}
 
-            # 결과 포맷팅
-            formatted_results = []
-            if results['documents']:
-                for doc, meta, dist in zip(
-                    results['documents'][0],
-                    results['metadatas'][0],
-                    results['distances'][0]
-                ):
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": meta,
-                        "score": round(1 - dist, 3)  # 코사인 유사도
-                    })
-
-            return {
-                "results": formatted_results,
-                "total_found": len(formatted_results),
-                "query": query
-            }
+        return outputs
+
+    async def asearch(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        search()의 비동기 버전.
+        - 임베딩: 캐시 hit면 즉시, miss면 encode(CPU)를 스레드에서 실행
+        - 검색: ChromaDB는 AsyncHttpClient, 로컬 저장소는 스레드에서 실행
+        """
+        outputs: List[Dict[str, Any]] = [{"results": [], "error": "빈 쿼리"}]
+        if not query.strip():
+            return outputs[0]
+
+        try:
+            # 캐시 조회는 1회만 (miss면 조회 결과를 넘겨 encode만 수행)
+            cached = self.query_cache.get(self.model_name, query)
+            query_embeddings = [cached] if cached is not None else await asyncio.to_thread(self._embed_queries, [query], [None])
+
+            kwargs = self._query_kwargs(query_embeddings, n_results, where)
+            collection = await self._get_async_collection()
+            if collection is not None:
+                results = await collection.query(**kwargs)
+            else:
+                results = await asyncio.to_thread(self.collection.query, **kwargs)
+            self._fill_outputs(outputs, [query], [0], results, n_results)
 
         except Exception as e:
-            logger.error(f"❌ 검색 실패: {e}")
-            return {"results": [], "error": str(e)}
+            logger.error(f"❌ 비동기 검색 실패: {e}")
+            outputs[0] = {"results": [], "error": str(e)}
 
+        return outputs[0]
+
+    async def _get_async_collection(self) -> Any:
+        """ChromaDB 비동기 컬렉션 (로컬 저장소 사용 시 None → 스레드 실행으로 대체)"""
+        if Config.VECTOR_STORE != "chroma":
+            return None
+        if self._async_collection is None:
+            import chromadb
+            from chromadb.config import Settings
+
+            client = await chromadb.AsyncHttpClient(
+                host=Config.CHROMA_HOST,
+                port=Config.CHROMA_PORT,
+                settings=Settings(anonymized_telemetry=False)
+            )
+            self._async_collection = await client.get_or_create_collection(name="documents")
+        return self._async_collection
+
+    def _query_kwargs(self, query_embeddings: List[Any], n_results: int, where: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        limit = min(n_results, 10)  # 최대 10개로 제한
+        return {
+            "query_embeddings": query_embeddings,
+            "n_results": limit * Config.CHUNK_OVERFETCH,
+            "where": where or None,
+            "include": ['documents', 'metadatas', 'distances'],
+        }
+
+    def _fill_outputs(
+        self,
+        outputs: List[Dict[str, Any]],
+        queries: List[str],
+        valid: List[int],
+        results: Dict[str, Any],
+        n_results: int
+    ) -> None:
+        limit = min(n_results, 10)
+        for pos, i in enumerate(valid):
+            formatted_results = self._format_results(results, pos)[:limit]
+            outputs[i] = {
+                "results": formatted_results,
+                "total_found": len(formatted_results),
+                "query": queries[i]
+            }
 
-# 전역 인스턴스 (싱글톤 패턴)
+    def lexical_search(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """BM25 어휘 검색 (ChromaDB 호출 없음, 결과 형식은 search()와 동일)"""
+        if self.lexical_index is None or not query.strip():
+            return {"results": [], "total_found": 0, "query": query}
+        results = self.lexical_index.search(query, n_results=min(n_results, 10), where=where)
+        return {"results": results, "total_found": len(results), "query": query}
+
+    def _format_results(self, results: Dict[str, Any], pos: int) -> List[Dict[str, Any]]:
+        """
+        collection.query 결과 중 pos번째 쿼리의 결과 포맷팅.
+        거리순 결과에서 문서(parent_id)별 가장 가까운 청크 하나만 남김
+        """
+        formatted_results = []
+        seen_parents = set()
+        if results['documents']:
+            for chunk_id, doc, meta, dist in zip(
+                results['ids'][pos],
+                results['documents'][pos],
+                results['metadatas'][pos],
+                results['distances'][pos]
+            ):
+                parent_id = (meta or {}).get("parent_id", chunk_id)
+                if parent_id in seen_parents:
+                    continue
+                seen_parents.add(parent_id)
+                formatted_results.append({
+                    "content": doc,
+                    "metadata": meta,
+                    "score": round(1 - dist, 3)  # 코사인 유사도
+                })
+        return formatted_results
+
+    def embed_query(self, query: str) -> List[float]:
+        """쿼리 임베딩 (검색과 같은 모델/캐시 사용, 응답 캐시 등 외부 모듈용)"""
+        return self._embed_query(query)
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """여러 텍스트 임베딩 (캐시 miss만 encode 1회)"""
+        return self._embed_queries(queries)
+
+    def _embed_query(self, query: str) -> List[float]:
+        """쿼리 임베딩 조회 - 캐시 hit 시 encode 생략"""
+        return self._embed_queries([query])[0]
+
+    def _embed_queries(self, queries: List[str], cached: Optional[List[Any]] = None) -> List[List[float]]:
+        """
+        쿼리 임베딩 일괄 조회 - 캐시 miss만 모아 encode 1회.
+        cached: 호출 측에서 이미 조회한 캐시 결과 (주어지면 캐시를 다시 조회하지 않음 → miss 중복 집계 방지)
+        """
+        embeddings: List[Any] = list(cached) if cached is not None else [self.query_cache.get(self.model_name, q) for q in queries]
+
+        missing: Dict[str, List[int]] = {}
+        for i, (q, emb) in enumerate(zip(queries, embeddings)):
+            if emb is None:
+                missing.setdefault(normalize_query(q), []).append(i)
+
+        if missing:
+            texts = list(missing.keys())
+            encoded = self.embedding_model.encode(texts).tolist()
+            for text, embedding in zip(texts, encoded):
+                self.query_cache.put(self.model_name, text, embedding)
+                for i in missing[text]:
+                    embeddings[i] = embedding
+
+        return embeddings
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """쿼리 임베딩 캐시 hit/miss 통계"""
+        return self.query_cache.stats()
+
+
+def _content_hash(doc: Dict[str, Any]) -> str:
+    """
+    문서 내용 + 메타데이터 기준 해시 (변경 감지용).
+    임베딩 모델/청킹 설정이 바뀌어도 재적재되도록 함께 포함
+    """
+    metadata = {k: v for k, v in doc.get("metadata", {}).items() if k != "content_hash"}
+    payload = json.dumps({
+        "content": doc.get("content", ""),
+        "metadata": metadata,
+        "model": Config.EMBEDDING_MODEL_NAME,
+        "chunking": [Config.CHUNK_SIZE, Config.CHUNK_OVERLAP]
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def ingest_generation() -> str:
+    """현재 문서 적재 세대 (적재가 일어날 때마다 바뀌는 값, RAG 초기화를 유발하지 않음)"""
+    if _rag_instance is not None:
+        return _rag_instance.ingest_generation()
+    return str(_ingest_generation)
+
+
+def _batched(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """이터러블을 size 크기의 리스트로 나눔 (마지막 배치는 더 작을 수 있음)"""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+# 적재 세대 기록 위치 (문서 검색과 섞이지 않도록 별도 컬렉션 사용)
+INGEST_STATE_COLLECTION = "ingest_state"
+INGEST_GENERATION_ID = "ingest_generation"
+
+# 전역 인스턴스 (싱글톤 패턴, 최초 사용 시 지연 초기화)
 _rag_instance = None
+_ingest_generation = 0
+_rag_lock = threading.Lock()
 
 
 def get_rag_service() -> RAGService:
-    """RAG 서비스 싱글톤 인스턴스 반환"""
+    """
+    RAG 서비스 싱글톤 인스턴스 반환.
+    초기화 실패(ChromaDB 일시 장애 등) 시 캐시하지 않으므로 다음 호출에서 재시도
+    """
     global _rag_instance
     if _rag_instance is None:
-        _rag_instance = RAGService()
+        with _rag_lock:
+            if _rag_instance is None:
+                _rag_instance = RAGService()
     return _rag_instance
 
 
-# 편의용 전역 변수
-rag_service = get_rag_service()
+def is_rag_ready() -> bool:
+    """RAG 서비스가 이미 초기화되었는지 여부 (초기화를 유발하지 않음)"""
+    return _rag_instance is not None
+
+
+def __getattr__(name: str) -> Any:
+    # 편의용 전역 변수 `rag_service`: import 시점이 아닌 첫 접근 시 초기화
+    if name == "rag_service":
+        return get_rag_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
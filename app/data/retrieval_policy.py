@@ -1,8 +1,10 @@
 # Data Reliability & Retrieval Policy
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import datetime as dt
 
+import numpy as np
+
 # (예시) 신규/중요 문서 등급
 # 점수: A=1.0, B=0.8, C=0.5 ...
 TRUST_SCORES = {
@@ -12,6 +14,54 @@ TRUST_SCORES = {
     "U": 0.1  # Unknown
 }
 
+def to_epoch(date_str: str | None) -> Optional[int]:
+    """ISO 날짜 문자열 → epoch 초(UTC 자정). 파싱 불가 시 None"""
+    if not date_str:
+        return None
+    try:
+        d = dt.date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    return int(dt.datetime.combine(d, dt.time.min, tzinfo=dt.timezone.utc).timestamp())
+
+
+_WHERE_OPS = {
+    "$eq": lambda v, x: v == x,
+    "$ne": lambda v, x: v != x,
+    "$gt": lambda v, x: v is not None and v > x,
+    "$gte": lambda v, x: v is not None and v >= x,
+    "$lt": lambda v, x: v is not None and v < x,
+    "$lte": lambda v, x: v is not None and v <= x,
+    "$in": lambda v, x: v in x,
+    "$nin": lambda v, x: v not in x,
+}
+
+
+def match_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """
+    ChromaDB where 절을 메타데이터 dict에 대해 평가 (벡터 DB 밖의 검색 결과 필터링용).
+    ChromaDB와 같이 키가 없는 문서는 $ne/$nin만 만족
+    """
+    if not where:
+        return True
+    for key, cond in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, c) for c in cond):
+                return False
+        elif key == "$or":
+            if not any(match_where(metadata, c) for c in cond):
+                return False
+        else:
+            ops = cond if isinstance(cond, dict) else {"$eq": cond}
+            if key not in metadata:
+                if not all(op in ("$ne", "$nin") for op in ops):
+                    return False
+                continue
+            if not all(_WHERE_OPS[op](metadata[key], x) for op, x in ops.items()):
+                return False
+    return True
+
+
 class RetrievalPolicy:
     """
     Data 신뢰성(Reliability)을 책임지는 정책 클래스.
@@ -24,7 +74,7 @@ class RetrievalPolicy:
     def apply_filters(self, docs: List[Dict[str, Any]], user_filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         1차 필터링 (Metadata 기반)
-        - 기본적으로 status='active'만 허용 (user_filters에 명시 없으면)
+        - 기본적으로 status='active'만 허용 (user_filters에 명시 없으면, status 없는 문서는 active)
         """
         target_status = user_filters.get("status", "active")
         
@@ -32,7 +82,7 @@ class RetrievalPolicy:
         for d in docs:
             meta = d.get("metadata", {})
             # 1) Status check
-            if meta.get("status") != target_status:
+            if meta.get("status", "active") != target_status:
                 continue
             
             # 2) 만료일(expire_date) 체크 (예시)
@@ -43,6 +93,27 @@ class RetrievalPolicy:
             filtered.append(d)
         return filtered
 
+    def build_where(self, user_filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        검색 전 필터(Pre-filter)를 ChromaDB where 절로 변환 → collection.query 내부에서 필터링.
+        (top-k를 뽑은 뒤 Python에서 거르면 관련 문서가 잘려나가므로 DB에 push down)
+        - status: 기본 'active' (apply_filters와 동일)
+          status 필드 없이 적재된 기존 컬렉션 문서는 active로 간주 → 'inactive'가 아닌 문서로 조건 작성
+          (ChromaDB $ne는 키가 없는 문서도 포함)
+        - effective_after: ISO 날짜 → 적재 시 저장한 effective_ts(epoch)에 대한 범위 조건
+        """
+        status = user_filters.get("status", "active")
+        clauses: List[Dict[str, Any]] = [
+            {"status": {"$ne": "inactive"}} if status == "active" else {"status": {"$eq": status}}
+        ]
+
+        if user_filters.get("effective_after"):
+            after = to_epoch(user_filters["effective_after"])
+            if after is not None:
+                clauses.append({"effective_ts": {"$gte": after}})
+
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
     def score_document(self, doc: Dict[str, Any], query: str) -> float:
         """
         신뢰성 점수(Trust Score) + 관련성(Relevance) + 최신성(Recency) 종합 산출
@@ -69,6 +140,49 @@ class RetrievalPolicy:
         
         return final_score
 
+    def score_documents(
+        self,
+        docs: List[Dict[str, Any]],
+        query: str,
+        today: Optional[dt.date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        후보 문서 전체를 한 번에 점수화 (score_document와 같은 가중치, NumPy 벡터 연산).
+        - 최신성: 적재 시 저장한 effective_ts(epoch) 사용, 없으면 effective_date를 1회 파싱
+        - 임계값 미만 제거 후 점수 내림차순으로 정렬해 반환 (각 문서에 _score 추가)
+        """
+        if not docs:
+            return []
+        metas = [d.get("metadata", {}) for d in docs]
+
+        # 1. Trust
+        trust = np.array([TRUST_SCORES.get(m.get("grade", "U"), 0.1) for m in metas])
+
+        # 2. Relevance (부분 문자열 일치 여부)
+        texts = np.array([(d.get("title", "") + " " + d.get("snippet", "")).lower() for d in docs])
+        relevance = np.where(np.char.find(texts, query.lower()) >= 0, 1.0, 0.2)
+
+        # 3. Recency (날짜 없음/미래 날짜 → 0.5, 1년 지나면 0)
+        ts = np.array([
+            m["effective_ts"] if "effective_ts" in m else (to_epoch(m.get("effective_date")) or np.nan)
+            for m in metas
+        ], dtype=float)
+        today_ts = to_epoch((today or dt.date.today()).isoformat())
+        delta = np.floor((today_ts - ts) / 86400.0)
+        recency = np.where(
+            np.isnan(delta) | (delta < 0), 0.5, np.maximum(0.0, 1.0 - delta / 365.0)
+        )
+
+        final = relevance * 0.5 + trust * 0.3 + recency * 0.2
+
+        results = []
+        for i in np.argsort(-final, kind="stable"):
+            if final[i] < self.min_score_threshold:
+                break
+            docs[i]["_score"] = round(float(final[i]), 3)
+            results.append(docs[i])
+        return results
+
     def _calc_recency(self, effective_date: str | None) -> float:
         if not effective_date:
             return 0.5 # 중간값
@@ -0,0 +1,125 @@
+# Search Micro-Batcher
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+
+from app.infra.config import Config
+
+logger = logging.getLogger(__name__)
+
+SearchManyFn = Callable[..., List[Dict[str, Any]]]
+_Request = Tuple[str, int, Optional[Dict[str, Any]], Future]
+
+
+class SearchBatcher:
+    """
+    동시에 들어온 검색 요청을 짧은 윈도우(window_ms) 동안 모아
+    search_many() 한 번(encode 1회 + collection.query 1회)으로 처리하는 마이크로 배처.
+    결과를 timeout_ms 안에 받지 못하면 SearchError (배처 스레드 정체 시 요청이 무한 대기하지 않도록)
+    """
+
+    def __init__(self, search_many: SearchManyFn, window_ms: int = 5, max_batch: int = 32, timeout_ms: int = 10000):
+        self._search_many = search_many
+        self.window_sec = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.timeout_sec = timeout_ms / 1000.0
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def search(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """검색 요청을 배치 큐에 넣고 결과를 기다림 (호출 측 인터페이스는 search()와 동일)"""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((query, n_results, where, future))
+        try:
+            return future.result(timeout=self.timeout_sec)
+        except TimeoutError:
+            future.cancel()  # 아직 처리 전이면 배치에서 제외
+            raise self._timeout_error()
+
+    async def asearch(self, query: str, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """search()의 비동기 버전 (같은 배치 큐 사용, 결과는 스레드 점유 없이 await)"""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((query, n_results, where, future))
+        try:
+            # 시간 초과 시 wait_for가 대기를 취소하고, 취소는 원래 Future까지 전파됨
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_sec)
+        except TimeoutError:
+            raise self._timeout_error()
+
+    def _timeout_error(self) -> Exception:
+        from app.service.actions.doc_search import SearchError  # doc_search가 이 모듈을 import하므로 지연 import
+        logger.error(f"❌ 배치 검색 시간 초과 ({self.timeout_sec:.1f}s)")
+        return SearchError("search_timeout")
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="search-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_sec
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        # n_results와 where 필터가 같은 요청끼리 묶어 한 번에 질의
+        groups: Dict[Tuple[int, str], List[Tuple[str, Future]]] = {}
+        wheres: Dict[Tuple[int, str], Optional[Dict[str, Any]]] = {}
+        for query, n_results, where, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue  # 호출 측이 시간 초과로 포기한 요청
+            key = (n_results, json.dumps(where, sort_keys=True))
+            wheres[key] = where
+            groups.setdefault(key, []).append((query, future))
+
+        for key, items in groups.items():
+            try:
+                results = self._search_many([q for q, _ in items], key[0], where=wheres[key])
+                for (_, future), result in zip(items, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"❌ 배치 검색 실패: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_batcher_instance = None
+_batcher_lock = threading.Lock()
+
+
+def get_search_batcher() -> SearchBatcher:
+    """검색 배처 싱글톤 인스턴스 반환 (동시 첫 호출에도 배처/스레드는 하나만 생성)"""
+    global _batcher_instance
+    if _batcher_instance is None:
+        with _batcher_lock:
+            if _batcher_instance is None:
+                from app.data.rag import get_rag_service
+                _batcher_instance = SearchBatcher(
+                    get_rag_service().search_many,
+                    window_ms=Config.SEARCH_BATCH_WINDOW_MS,
+                    max_batch=Config.SEARCH_BATCH_MAX_SIZE,
+                    timeout_ms=Config.SEARCH_BATCH_TIMEOUT_MS
+                )
+    return _batcher_instance
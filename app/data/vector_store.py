@@ -0,0 +1,499 @@
+# Vector Store Backends
+from __future__ import annotations
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from app.infra.config import Config
+
+try:
+    import fcntl  # 여러 프로세스 간 쓰기 잠금 (Linux/macOS)
+except ImportError:  # pragma: no cover - Windows 로컬 개발 환경
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 색인을 두는 메타데이터 키 (증분 적재 시 parent_id 조회가 전체 스캔이 되지 않도록)
+_INDEXED_KEYS = ("parent_id",)
+_SAFE_KEY = re.compile(r"[A-Za-z0-9_]+")
+
+
+class VectorStore(Protocol):
+    """
+    RAGService가 사용하는 벡터 저장소 인터페이스 (ChromaDB Collection API의 부분집합).
+    반환 형식도 ChromaDB와 동일 → 백엔드를 바꿔도 RAGService 코드는 그대로
+    """
+
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict[str, Any]]) -> None: ...
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict[str, Any]]) -> None: ...
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, offset: Optional[int] = None, include: Sequence[str] = ("documents", "metadatas")) -> Dict[str, Any]: ...
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> None: ...
+    def query(self, query_embeddings: List[List[float]], n_results: int = 10, where: Optional[Dict[str, Any]] = None, include: Sequence[str] = ("documents", "metadatas", "distances")) -> Dict[str, Any]: ...
+    def count(self) -> int: ...
+
+
+def open_collection(name: str = "documents") -> VectorStore:
+    """
+    Config.VECTOR_STORE에 따라 벡터 저장소 선택.
+    - chroma: 원격 ChromaDB 서버 (기본값)
+    - local: 프로세스 내 memory-mapped 저장소 (on-prem/edge, 쿼리당 네트워크 왕복 없음)
+    """
+    if Config.VECTOR_STORE == "local":
+        logger.info(f"📦 로컬 벡터 저장소 사용: {Config.LOCAL_VECTOR_PATH}/{name}")
+        return LocalVectorStore(
+            os.path.join(Config.LOCAL_VECTOR_PATH, name),
+            nprobe=Config.IVF_NPROBE,
+            ivf_min_rows=Config.IVF_MIN_ROWS
+        )
+
+    import chromadb
+    from chromadb.config import Settings
+
+    client = chromadb.HttpClient(
+        host=Config.CHROMA_HOST,
+        port=Config.CHROMA_PORT,
+        settings=Settings(anonymized_telemetry=False)
+    )
+    return client.get_or_create_collection(
+        name=name,
+        metadata={"description": "문서 검색용 벡터 컬렉션"}
+    )
+
+
+def _where_sql(where: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+    """ChromaDB where 절 → SQLite 조건식 (메타데이터는 JSON 컬럼, ChromaDB와 같이 키가 없으면 $ne/$nin 만족)"""
+    if not where:
+        return "1", []
+    clauses: List[str] = []
+    params: List[Any] = []
+    for key, cond in where.items():
+        if key in ("$and", "$or"):
+            parts = [_where_sql(c) for c in cond]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(sql for sql, _ in parts) + ")")
+            params.extend(p for _, ps in parts for p in ps)
+            continue
+
+        field, path = _json_field(key)
+        ops = cond if isinstance(cond, dict) else {"$eq": cond}
+        for op, value in ops.items():
+            if op in ("$in", "$nin"):
+                marks = ",".join("?" * len(value)) or "NULL"
+                if op == "$in":
+                    clauses.append(f"{field} IN ({marks})")
+                    params.extend([*path, *value])
+                else:
+                    clauses.append(f"({field} IS NULL OR {field} NOT IN ({marks}))")
+                    params.extend([*path, *path, *value])
+            elif op == "$ne":
+                clauses.append(f"({field} IS NULL OR {field} != ?)")
+                params.extend([*path, *path, value])
+            else:
+                sql_op = {"$eq": "=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}[op]
+                clauses.append(f"{field} {sql_op} ?")
+                params.extend([*path, value])
+    return "(" + " AND ".join(clauses) + ")", params
+
+
+def _json_field(key: str) -> Tuple[str, List[Any]]:
+    """
+    메타데이터 키 → json_extract 식과 바인딩 값.
+    단순 키는 경로를 리터럴로 넣어 식 색인(idx_chunks_<key>)과 일치시키고, 그 외 키는 바인딩
+    """
+    if _SAFE_KEY.fullmatch(key):
+        return f"json_extract(metadata, '$.\"{key}\"')", []
+    return "json_extract(metadata, ?)", [f'$."{key}"']
+
+
+class LocalVectorStore:
+    """
+    임베디드 벡터 저장소.
+    - vectors.f32: float32 임베딩을 행 단위로 append → np.memmap(읽기 전용)으로 매핑
+      (같은 노드의 여러 프로세스가 OS 페이지 캐시의 한 사본을 공유)
+    - meta.sqlite: 행 번호 ↔ id/문서/메타데이터, 삭제 표시 (where 절은 SQL로 평가)
+    - IVF 색인: 행 수가 ivf_min_rows 이상이면 k-means 중심점으로 분할, 쿼리는 nprobe개 리스트만 탐색
+      (where 절/삭제 표시는 탐색할 리스트의 행에만 SQL로 적용 → 전체 행 목록을 조회하지 않음)
+    거리는 ChromaDB 기본값과 같은 squared L2. 갱신/삭제된 행은 파일에 남고 삭제 표시만 됨.
+    쓰기는 worker 1곳에서 한다고 가정 (프로세스 간에는 파일 잠금으로 직렬화)
+    검색은 잠금 안에서 매핑 갱신/스냅샷만 하고, 점수 계산과 SQLite 조회는 스레드별 읽기 연결로 잠금 밖에서 수행
+    """
+
+    def __init__(self, path: str, nprobe: int = 8, ivf_min_rows: int = 4096):
+        self.path = path
+        self.nprobe = nprobe
+        self.ivf_min_rows = ivf_min_rows
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._assign_path = os.path.join(path, "assign.i32")
+        self._centroids_path = os.path.join(path, "centroids.npy")
+        self._lock = threading.RLock()
+        self._db_path = os.path.join(path, "meta.sqlite")
+        self._readers = threading.local()
+
+        self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            " row INTEGER PRIMARY KEY, id TEXT NOT NULL, document TEXT,"
+            " metadata TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_chunks_id ON chunks(id, deleted)")
+        for key in _INDEXED_KEYS:
+            # 식 색인: _where_sql이 같은 경로 리터럴로 json_extract를 만들어야 사용됨
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_chunks_{key} ON chunks({_json_field(key)[0]})"
+            )
+        self._db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+
+        # 읽기 측 매핑 상태 (행 수가 늘거나 IVF가 재학습되면 다시 매핑)
+        self._dim: Optional[int] = None
+        self._rows = 0
+        self._ivf_version = ""
+        self._vectors: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._assign: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._list_rows: Optional[np.ndarray] = None  # 리스트 번호 순으로 정렬한 행 번호
+        self._list_bounds: Optional[np.ndarray] = None  # 리스트 c의 행 = _list_rows[bounds[c]:bounds[c + 1]]
+
+    # ---------------- 쓰기 ----------------
+
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """새 id만 추가 (이미 있는 id는 ChromaDB처럼 무시)"""
+        self._write(ids, embeddings, documents, metadatas, replace=False)
+
+    def upsert(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        self._write(ids, embeddings, documents, metadatas, replace=True)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> None:
+        sql, params = _where_sql(where)
+        if ids is not None:
+            if not ids:
+                return
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params = [*params, *ids]
+        with self._lock, self._file_lock():
+            self._db.execute(f"UPDATE chunks SET deleted = 1 WHERE deleted = 0 AND {sql}", params)
+            self._db.commit()
+
+    def _write(self, ids, embeddings, documents, metadatas, replace: bool) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock, self._file_lock():
+            dim = self._stored_dim()
+            if dim is None:
+                dim = vectors.shape[1]
+                self._db.execute("INSERT INTO info VALUES ('dim', ?)", (str(dim),))
+            elif vectors.shape[1] != dim:
+                raise ValueError(f"임베딩 차원 불일치: {vectors.shape[1]} != {dim}")
+
+            # 같은 요청 내 중복 id는 마지막 항목만 유지
+            latest = {chunk_id: i for i, chunk_id in enumerate(ids)}
+            existing = self._live_ids(list(latest))
+            if replace:
+                self._mark_deleted(existing)
+                keep = sorted(latest.values())
+            else:
+                keep = sorted(i for chunk_id, i in latest.items() if chunk_id not in existing)
+            if not keep:
+                self._db.commit()
+                return
+
+            start = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]
+            new_vectors = vectors[keep]
+
+            # 벡터 파일 먼저 기록 → 메타데이터 커밋 (읽는 쪽은 커밋된 행만 보므로 반쯤 쓰인 행을 읽지 않음)
+            self._append(self._vectors_path, new_vectors, start * dim * 4)
+            centroids = self._load_centroids()
+            if centroids is not None:
+                self._append(self._assign_path, _nearest(new_vectors, centroids).astype(np.int32), start * 4)
+
+            self._db.executemany(
+                "INSERT INTO chunks (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (start + n, ids[i], documents[i], json.dumps(metadatas[i] or {}, ensure_ascii=False))
+                    for n, i in enumerate(keep)
+                ]
+            )
+            self._db.commit()
+
+            total = start + len(keep)
+            trained = int(self._info("ivf_trained_rows") or 0)
+            if total >= self.ivf_min_rows and total >= 2 * trained:
+                self._train_ivf(total, dim)
+
+    def _train_ivf(self, total: int, dim: int, iterations: int = 10, sample_size: int = 50000) -> None:
+        """k-means로 IVF 중심점 학습 후 전체 행의 리스트 배정 (행 수가 2배가 될 때마다 재학습)"""
+        vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(total, dim))
+        nlist = int(min(1024, max(16, np.sqrt(total))))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(vectors[np.sort(rng.choice(total, size=min(total, sample_size), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = _nearest(sample, centroids)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+
+        assign = np.concatenate([_nearest(np.asarray(vectors[i:i + 65536]), centroids) for i in range(0, total, 65536)])
+        np.save(self._centroids_path + ".tmp.npy", centroids)
+        assign.astype(np.int32).tofile(self._assign_path + ".tmp")
+        os.replace(self._centroids_path + ".tmp.npy", self._centroids_path)
+        os.replace(self._assign_path + ".tmp", self._assign_path)
+
+        self._db.execute("INSERT OR REPLACE INTO info VALUES ('ivf_trained_rows', ?)", (str(total),))
+        self._db.execute("INSERT OR REPLACE INTO info VALUES ('ivf_version', ?)", (str(os.getpid()) + ":" + str(total),))
+        self._db.commit()
+        logger.info(f"✅ IVF 색인 학습 완료 (rows={total}, nlist={nlist})")
+
+    # ---------------- 읽기 ----------------
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks WHERE deleted = 0").fetchone()[0]
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Sequence[str] = ("documents", "metadatas")
+    ) -> Dict[str, Any]:
+        sql, params = _where_sql(where)
+        if ids is not None:
+            sql += f" AND id IN ({','.join('?' * len(ids))})" if ids else " AND 0"
+            params = [*params, *ids]
+        query = f"SELECT row, id, document, metadata FROM chunks WHERE deleted = 0 AND {sql} ORDER BY row"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params = [*params, -1 if limit is None else limit, offset or 0]
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+            return self._format([rows], include, nested=False)
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("documents", "metadatas", "distances")
+    ) -> Dict[str, Any]:
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        # 잠금은 매핑 갱신과 스냅샷에만 사용 (memmap/배열은 교체만 되고 수정되지 않으므로 잠금 밖에서 읽어도 안전)
+        with self._lock:
+            self._refresh()
+            snap = _Snapshot(
+                self._rows, self._vectors, self._norms, self._centroids, self._list_rows, self._list_bounds
+            )
+        if snap.vectors is None or snap.rows == 0:
+            return self._format([[] for _ in queries], include, nested=True, distances=[[] for _ in queries])
+
+        db = self._reader()
+        # IVF: 가까운 nprobe개 리스트의 행만 후보 → 그 행들에만 where/삭제 조건 적용
+        probed: List[np.ndarray] = []
+        if snap.centroids is not None:
+            probed = [self._probe_rows(snap, q) for q in queries]
+            allowed = self._filter_rows(db, snap, np.unique(np.concatenate(probed)), where)
+            probed = [rows[np.isin(rows, allowed, assume_unique=True)] for rows in probed]
+
+        hits: List[List[Tuple[int, float]]] = []
+        every: Optional[np.ndarray] = None
+        for qi, q in enumerate(queries):
+            if probed and len(probed[qi]) >= n_results:
+                candidates = probed[qi]
+            else:
+                # IVF 미사용이거나 조건이 까다로워 후보가 부족하면 조건을 만족하는 전체 행으로 정확 검색
+                if every is None:
+                    every = self._filter_rows(db, snap, None, where)
+                candidates = every
+
+            dists = snap.norms[candidates] - 2.0 * (snap.vectors[candidates] @ q) + float(q @ q)
+            k = min(n_results, len(candidates))
+            top = np.argpartition(dists, k - 1)[:k] if k else np.array([], dtype=np.int64)
+            top = top[np.argsort(dists[top])]
+            hits.append([(int(candidates[i]), float(max(dists[i], 0.0))) for i in top])
+
+        needed = sorted({row for qh in hits for row, _ in qh})
+        by_row = {}
+        for i in range(0, len(needed), 900):  # SQLite 바인딩 변수 수 제한
+            part = needed[i:i + 900]
+            for rec in db.execute(
+                f"SELECT row, id, document, metadata FROM chunks WHERE row IN ({','.join('?' * len(part))})", part
+            ):
+                by_row[rec[0]] = rec
+
+        return self._format(
+            [[by_row[row] for row, _ in qh] for qh in hits],
+            include,
+            nested=True,
+            distances=[[d for _, d in qh] for qh in hits],
+            vectors=snap.vectors
+        )
+
+    def _probe_rows(self, snap: "_Snapshot", q: np.ndarray) -> np.ndarray:
+        probe = np.argsort(_sq_dist(q[None, :], snap.centroids)[0])[:self.nprobe]
+        return np.concatenate([snap.list_rows[snap.list_bounds[c]:snap.list_bounds[c + 1]] for c in probe])
+
+    @staticmethod
+    def _filter_rows(
+        db: sqlite3.Connection,
+        snap: "_Snapshot",
+        rows: Optional[np.ndarray],
+        where: Optional[Dict[str, Any]]
+    ) -> np.ndarray:
+        """살아있고 where 조건을 만족하는 행 번호 (rows가 None이면 스냅샷 시점의 전체 행 대상)"""
+        sql, params = _where_sql(where)
+        if rows is None:
+            return np.fromiter(
+                (r for (r,) in db.execute(
+                    f"SELECT row FROM chunks WHERE deleted = 0 AND row < ? AND {sql}", [snap.rows, *params]
+                )),
+                dtype=np.int64
+            )
+        found: List[int] = []
+        for i in range(0, len(rows), 900):  # SQLite 바인딩 변수 수 제한
+            part = rows[i:i + 900].tolist()
+            found.extend(r for (r,) in db.execute(
+                f"SELECT row FROM chunks WHERE deleted = 0 AND row IN ({','.join('?' * len(part))}) AND {sql}",
+                [*part, *params]
+            ))
+        return np.sort(np.asarray(found, dtype=np.int64))
+
+    def _format(self, groups, include, nested: bool, distances=None, vectors=None) -> Dict[str, Any]:
+        """SQLite 결과 → ChromaDB 응답 형식 (query는 쿼리별 중첩 리스트)"""
+        result: Dict[str, Any] = {"ids": [[rec[1] for rec in g] for g in groups]}
+        if "documents" in include:
+            result["documents"] = [[rec[2] for rec in g] for g in groups]
+        if "metadatas" in include:
+            result["metadatas"] = [[json.loads(rec[3]) for rec in g] for g in groups]
+        if "embeddings" in include:
+            if vectors is None:
+                with self._lock:
+                    self._refresh()
+                    vectors = self._vectors
+            result["embeddings"] = [[vectors[rec[0]].tolist() for rec in g] for g in groups]
+        if "distances" in include and distances is not None:
+            result["distances"] = distances
+        if not nested:
+            result = {key: value[0] for key, value in result.items()}
+        return result
+
+    def _refresh(self) -> None:
+        """다른 프로세스(writer)가 행을 추가했거나 IVF를 재학습했으면 다시 매핑"""
+        rows = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]
+        ivf_version = self._info("ivf_version") or ""
+        if rows == self._rows and ivf_version == self._ivf_version:
+            return
+
+        dim = self._stored_dim()
+        if dim is None or rows == 0:
+            return
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+        # 행별 제곱 노름은 새로 추가된 행만 계산
+        old = 0 if self._norms is None else min(len(self._norms), rows)
+        fresh = np.einsum("ij,ij->i", self._vectors[old:rows], self._vectors[old:rows])
+        self._norms = fresh if old == 0 else np.concatenate([self._norms[:old], fresh])
+
+        self._centroids = self._load_centroids()
+        if self._centroids is not None:
+            self._assign = np.memmap(self._assign_path, dtype=np.int32, mode="r", shape=(rows,))
+            # 리스트별 행 목록 (역색인)
+            self._list_rows = np.argsort(self._assign, kind="stable")
+            self._list_bounds = np.searchsorted(self._assign[self._list_rows], np.arange(len(self._centroids) + 1))
+        self._rows, self._dim, self._ivf_version = rows, dim, ivf_version
+
+    # ---------------- 내부 유틸 ----------------
+
+    def _reader(self) -> sqlite3.Connection:
+        """스레드별 읽기 전용 연결 (WAL이므로 쓰기 연결/다른 읽기와 동시에 조회 가능)"""
+        db = getattr(self._readers, "db", None)
+        if db is None:
+            db = sqlite3.connect(self._db_path)
+            db.execute("PRAGMA query_only = 1")
+            self._readers.db = db
+        return db
+
+    def _live_ids(self, ids: List[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for i in range(0, len(ids), 900):
+            part = ids[i:i + 900]
+            for chunk_id, row in self._db.execute(
+                f"SELECT id, row FROM chunks WHERE deleted = 0 AND id IN ({','.join('?' * len(part))})", part
+            ):
+                found[chunk_id] = row
+        return found
+
+    def _mark_deleted(self, existing: Dict[str, int]) -> None:
+        self._db.executemany("UPDATE chunks SET deleted = 1 WHERE row = ?", [(row,) for row in existing.values()])
+
+    def _stored_dim(self) -> Optional[int]:
+        value = self._info("dim")
+        return int(value) if value else None
+
+    def _info(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _load_centroids(self) -> Optional[np.ndarray]:
+        if not os.path.exists(self._centroids_path):
+            return None
+        return np.load(self._centroids_path)
+
+    @staticmethod
+    def _append(path: str, array: np.ndarray, offset: int) -> None:
+        """offset 위치부터 기록 (이전 쓰기가 중간에 실패해 남은 꼬리 데이터는 덮어씀)"""
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(offset)
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate()
+
+    def _file_lock(self):
+        return _FileLock(os.path.join(self.path, "write.lock"))
+
+
+class _Snapshot(NamedTuple):
+    """검색 1회에 사용할 매핑 상태 (잠금 밖에서 일관되게 읽기 위한 사본)"""
+    rows: int
+    vectors: Optional[np.ndarray]
+    norms: Optional[np.ndarray]
+    centroids: Optional[np.ndarray]
+    list_rows: Optional[np.ndarray]
+    list_bounds: Optional[np.ndarray]
+
+
+class _FileLock:
+    """프로세스 간 쓰기 직렬화 (fcntl 미지원 환경에서는 프로세스 내 잠금만)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = None
+
+    def __enter__(self) -> "_FileLock":
+        if fcntl is not None:
+            self._f = open(self.path, "a")
+            fcntl.flock(self._f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._f is not None:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+            self._f.close()
+            self._f = None
+
+
+def _sq_dist(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """행렬 간 squared L2 거리 (a: n×d, b: m×d → n×m)"""
+    return (a * a).sum(axis=1)[:, None] - 2.0 * (a @ b.T) + (b * b).sum(axis=1)[None, :]
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.argmin(_sq_dist(vectors, centroids), axis=1)
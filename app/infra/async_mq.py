@@ -0,0 +1,174 @@
+# app/infra/async_mq.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import time
+
+from app.infra.mq import RABBITMQ_HOST, RABBITMQ_PASS, RABBITMQ_QUEUE, RABBITMQ_USER, PublishError
+
+logger = logging.getLogger(__name__)
+
+# 비동기 인제스트 버퍼 설정
+INGEST_BUFFER_SIZE = int(os.getenv("INGEST_BUFFER_SIZE", "10000"))
+INGEST_FLUSH_BATCH = int(os.getenv("INGEST_FLUSH_BATCH", "100"))
+INGEST_FLUSH_INTERVAL_MS = int(os.getenv("INGEST_FLUSH_INTERVAL_MS", "20"))
+INGEST_RETRY_AFTER_SEC = int(os.getenv("INGEST_RETRY_AFTER_SEC", "1"))
+
+
+class BufferFull(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AsyncBufferedPublisher:
+    """
+    asyncio 기반 퍼블리셔 (aio-pika).
+    - 요청 핸들러는 제한된 인메모리 버퍼에 넣고 바로 반환 (스레드풀 점유 없음)
+    - 백그라운드 flusher가 버퍼를 배치 단위로 발행하고 publisher confirm을 기다림
+    - 발행 실패 시 배치를 버리지 않고 재시도 → 그동안 버퍼가 차면 BufferFull(429/503)
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        queue_name: str = RABBITMQ_QUEUE,
+        max_size: int = INGEST_BUFFER_SIZE,
+        flush_batch: int = INGEST_FLUSH_BATCH,
+        flush_interval_ms: int = INGEST_FLUSH_INTERVAL_MS
+    ):
+        self.url = url or f"amqp://{RABBITMQ_USER}:{RABBITMQ_PASS}@{RABBITMQ_HOST}/"
+        self.queue_name = queue_name
+        self.flush_batch = flush_batch
+        self.flush_interval_sec = flush_interval_ms / 1000.0
+        self._buffer: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_size)
+        self._connection: Any = None
+        self._channel: Any = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._inflight: List[bytes] = []  # flusher가 버퍼에서 꺼내 발행 중인 배치
+        self.published = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed
+
+    async def start(self) -> None:
+        """flusher 시작 + 브로커 연결 (연결 실패 시에도 기동하고 발행 시점에 재연결)"""
+        self._flusher = asyncio.create_task(self._flush_loop())
+        await self._connect()
+
+    async def _connect(self) -> None:
+        import aio_pika  # 선택 의존성: async 모드에서만 필요
+
+        try:
+            # connect_robust: 연결 이후 끊기면 aio-pika가 자동 재연결
+            self._connection = await aio_pika.connect_robust(self.url)
+            self._channel = await self._connection.channel(publisher_confirms=True)
+            await self._channel.declare_queue(self.queue_name, durable=True)
+            logger.info("✅ 비동기 MQ 퍼블리셔 연결 완료")
+        except Exception as e:
+            self._connection = None
+            logger.error(f"❌ 비동기 MQ 연결 실패: {e!r}")
+
+    async def stop(self, drain_timeout: float = 5.0) -> int:
+        """
+        버퍼에 남은 메시지와 발행 중인 배치를 최대 drain_timeout초 동안 발행한 뒤 종료.
+        미발행 건수 반환 (취소된 발행 중 배치 포함, 일부는 이미 브로커에 도달했을 수 있음)
+        """
+        deadline = time.monotonic() + drain_timeout
+        while (not self._buffer.empty() or self._inflight) and time.monotonic() < deadline:
+            await asyncio.sleep(self.flush_interval_sec)
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None:
+            await self._connection.close()
+        unpublished = self._buffer.qsize() + len(self._inflight)
+        if unpublished:
+            logger.error(f"❌ 종료 시 미발행 메시지 {unpublished}건 (발행 중 배치 {len(self._inflight)}건 포함)")
+        return unpublished
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        self.offer_many([message])
+
+    def offer_many(self, messages: List[Dict[str, Any]]) -> None:
+        """버퍼에 메시지 추가. 공간이 부족하면 하나도 넣지 않고 BufferFull"""
+        if self._buffer.maxsize - self._buffer.qsize() < len(messages):
+            # 브로커 연결이 없어서 밀린 경우(503)와 단순 과부하(429)를 구분
+            reason = "ingest_buffer_full" if self.connected else "mq_unavailable"
+            raise BufferFull(reason, INGEST_RETRY_AFTER_SEC)
+        for m in messages:
+            self._buffer.put_nowait(json.dumps(m).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": self._buffer.qsize(),
+            "capacity": self._buffer.maxsize,
+            "published": self.published,
+            "connected": self.connected,
+        }
+
+    async def _flush_loop(self) -> None:
+        while True:
+            batch = [await self._buffer.get()]
+            self._inflight = batch
+            deadline = time.monotonic() + self.flush_interval_sec
+            while len(batch) < self.flush_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            backoff = 0.1
+            while True:
+                try:
+                    await self._publish_batch(batch)
+                    self.published += len(batch)
+                    self._inflight = []
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # 발행 실패: 배치를 유지한 채 재시도 (데이터 유실 방지)
+                    logger.warning(f"⚠️ MQ 배치 발행 실패, {backoff:.1f}s 후 재시도: {e!r}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 5.0)
+
+    async def _publish_batch(self, bodies: List[bytes]) -> None:
+        import aio_pika
+
+        if self._connection is None:
+            await self._connect()
+        if not self.connected:
+            raise PublishError("mq_unavailable")
+        exchange = self._channel.default_exchange
+        # confirm을 병렬로 기다림 (메시지마다 왕복 대기하지 않음)
+        await asyncio.gather(*(
+            exchange.publish(
+                aio_pika.Message(body=body, delivery_mode=aio_pika.DeliveryMode.PERSISTENT),
+                routing_key=self.queue_name
+            )
+            for body in bodies
+        ))
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_async_publisher_instance: Optional[AsyncBufferedPublisher] = None
+
+
+def get_async_publisher() -> AsyncBufferedPublisher:
+    """비동기 퍼블리셔 싱글톤 인스턴스 반환 (이벤트 루프 안에서 호출)"""
+    global _async_publisher_instance
+    if _async_publisher_instance is None:
+        _async_publisher_instance = AsyncBufferedPublisher()
+    return _async_publisher_instance
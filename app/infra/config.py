@@ -11,16 +11,103 @@ class Config:
     # Vector DB
     CHROMA_HOST = os.getenv("CHROMA_HOST", "chromadb")
     CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
-    
+    # 벡터 저장소 백엔드: chroma(원격 서버) | local(memory-mapped 파일 + IVF, on-prem/edge용)
+    VECTOR_STORE = os.getenv("VECTOR_STORE", "chroma").lower()
+    LOCAL_VECTOR_PATH = os.getenv("LOCAL_VECTOR_PATH", "vector_store")
+    IVF_NPROBE = int(os.getenv("IVF_NPROBE", "8"))
+    IVF_MIN_ROWS = int(os.getenv("IVF_MIN_ROWS", "4096"))
+
+    # Embedding
+    EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "paraphrase-MiniLM-L3-v2")
+
+    # Query Embedding Cache (LRU + TTL, 경로 지정 시 디스크 영속화)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+    QUERY_CACHE_TTL_SEC = int(os.getenv("QUERY_CACHE_TTL_SEC", "86400"))
+    QUERY_CACHE_PATH = os.getenv("QUERY_CACHE_PATH", "")
+    QUERY_CACHE_MAX_ROWS = int(os.getenv("QUERY_CACHE_MAX_ROWS", "100000"))  # 디스크 캐시 최대 행 수
+    QUERY_CACHE_FLUSH_SEC = float(os.getenv("QUERY_CACHE_FLUSH_SEC", "1.0"))  # 디스크 캐시 일괄 기록 주기
+
+    # Search Micro-Batching (동시 doc.search 요청을 모아 encode/query 1회로 처리)
+    SEARCH_BATCH_ENABLED = os.getenv("SEARCH_BATCH_ENABLED", "false").lower() == "true"
+    SEARCH_BATCH_WINDOW_MS = int(os.getenv("SEARCH_BATCH_WINDOW_MS", "5"))
+    SEARCH_BATCH_MAX_SIZE = int(os.getenv("SEARCH_BATCH_MAX_SIZE", "32"))
+    SEARCH_BATCH_TIMEOUT_MS = int(os.getenv("SEARCH_BATCH_TIMEOUT_MS", "10000"))  # 배치 결과 대기 상한
+
+    # Ingestion (임베딩/저장 배치 크기)
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+    # 증분 적재: content_hash가 같은 문서는 건너뛰고 변경분만 upsert
+    INGEST_INCREMENTAL = os.getenv("INGEST_INCREMENTAL", "false").lower() == "true"
+
+    # Chunking (문장 경계 기준 분할, 검색 시 문서별 최고 청크만 반환)
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
+    CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+    CHUNK_OVERFETCH = int(os.getenv("CHUNK_OVERFETCH", "3"))
+
+    # Hybrid Search (BM25 어휘 색인 + 벡터 검색, RRF로 순위 병합)
+    # 색인 파일은 worker(쓰기)와 API(읽기)가 공유하는 경로(공유 볼륨)여야 하므로 기본 비활성화
+    # (Pod 로컬 경로면 API는 빈 색인을 읽고 worker만 전체 색인을 메모리/디스크에 유지)
+    HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "false").lower() == "true"
+    LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", "lexical_index.json")
+    LEXICAL_INDEX_REFRESH_SEC = float(os.getenv("LEXICAL_INDEX_REFRESH_SEC", "5"))  # worker 갱신 반영 주기 (백그라운드)
+    RRF_K = int(os.getenv("RRF_K", "60"))
+
+    # 적재 세대 재조회 주기(초): worker가 ChromaDB에 기록한 세대를 API가 이 주기로 확인해 응답 캐시 무효화
+    INGEST_GENERATION_POLL_SEC = float(os.getenv("INGEST_GENERATION_POLL_SEC", "5"))
+    # 적재 시 청크 본문 PII 마스킹 (원본을 그대로 보관해야 하는 환경이면 false)
+    PII_MASK_ON_INGEST = os.getenv("PII_MASK_ON_INGEST", "false").lower() == "true"
+
+    # Semantic Answer Cache (유사 질문이면 LLM/도구 호출 없이 이전 응답 재사용, 질문마다 임베딩 필요 → 기본 비활성)
+    ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true"
+    ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    ANSWER_CACHE_TTL_SEC = int(os.getenv("ANSWER_CACHE_TTL_SEC", "600"))
+    ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
+
+    # Tool Routing: tiered(규칙 → 임베딩 최근접 → LLM) | llm(항상 LLM)
+    ROUTER_MODE = os.getenv("ROUTER_MODE", "tiered").lower()
+    ROUTER_SEMANTIC_THRESHOLD = float(os.getenv("ROUTER_SEMANTIC_THRESHOLD", "0.6"))
+    ROUTER_SEMANTIC_MARGIN = float(os.getenv("ROUTER_SEMANTIC_MARGIN", "0.05"))
+
+    # Rate Limit (sliding window counter, 레플리카가 여럿이면 redis 백엔드로 한도 공유)
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    RATE_LIMIT_DEFAULT = int(os.getenv("RATE_LIMIT_DEFAULT", "10"))
+    RATE_LIMIT_WINDOW_SEC = int(os.getenv("RATE_LIMIT_WINDOW_SEC", "60"))
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    REDIS_HOST = os.getenv("REDIS_HOST", "redis-service")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+
+    # Audit (제한된 큐 + 백그라운드 배치 기록, sink: stdout | file | 'package.module:ClassName')
+    AUDIT_SINK = os.getenv("AUDIT_SINK", "stdout")
+    AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "logs/audit.jsonl")
+    AUDIT_LOG_MAX_BYTES = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+    AUDIT_LOG_BACKUPS = int(os.getenv("AUDIT_LOG_BACKUPS", "5"))
+    AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+    AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+
+    # Action Registry hot reload (registry.yaml mtime 확인 주기, 0이면 비활성)
+    REGISTRY_RELOAD_SEC = float(os.getenv("REGISTRY_RELOAD_SEC", "5"))
+
+    # Tool Execution (timeout_ms 상한, idempotent 도구 재시도 백오프, p95 지연 후 hedged 요청)
+    TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", "32"))
+    TOOL_RETRY_BACKOFF_MS = int(os.getenv("TOOL_RETRY_BACKOFF_MS", "50"))
+    TOOL_HEDGE_ENABLED = os.getenv("TOOL_HEDGE_ENABLED", "true").lower() == "true"
+    TOOL_HEDGE_QUANTILE = float(os.getenv("TOOL_HEDGE_QUANTILE", "0.95"))
+    TOOL_HEDGE_MIN_SAMPLES = int(os.getenv("TOOL_HEDGE_MIN_SAMPLES", "20"))
+
     # LLM
     # gemini-2.5-flash-lite
     LLM_MODEL_NAME = os.getenv("LLM_MODEL", "gemini-2.0-flash")
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+    # 도구 선택 방식: native(function calling, 도구 불필요 시 같은 호출로 답변) | prompt(JSON 프롬프트)
+    LLM_TOOL_MODE = os.getenv("LLM_TOOL_MODE", "native").lower()
+    # /ask 요청 전체 시간 상한 (도구별 상한은 registry의 timeout_ms)
+    ASK_TIMEOUT_SEC = float(os.getenv("ASK_TIMEOUT_SEC", "30"))
 
     @classmethod
     def get_infra_context(cls):
         return {
             "mode": cls.DEPLOYMENT_MODE,
-            "vector_db": f"{cls.CHROMA_HOST}:{cls.CHROMA_PORT}",
+            "vector_db": cls.LOCAL_VECTOR_PATH if cls.VECTOR_STORE == "local" else f"{cls.CHROMA_HOST}:{cls.CHROMA_PORT}",
             "llm_model_name": cls.LLM_MODEL_NAME
         }
@@ -1,8 +1,9 @@
 # app/infra/llm.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import copy
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
 from langchain_core.messages import SystemMessage, HumanMessage
 from app.infra.config import Config
 
@@ -16,6 +17,9 @@ Analyze the user's request and determine if any available tools should be used."
 
 class LLMClient:
     def __init__(self):
+        # Gemini SDK는 무거우므로 클라이언트 생성 시점에 로드
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         # Gemini 모델 초기화
         self.llm = ChatGoogleGenerativeAI(
             model=Config.LLM_MODEL_NAME,
@@ -23,11 +27,64 @@ class LLMClient:
             google_api_key=Config.GOOGLE_API_KEY, 
             convert_system_message_to_human=True
         )
+        # native function calling용 바인딩 캐시 (레지스트리 버전별)
+        self._bound: Optional[Tuple[str, Any, Dict[str, str]]] = None
+        self._bound_lock = threading.Lock()
+
+    def select_tool(
+        self,
+        user_query: str,
+        specs: Sequence[Any],
+        system_prompt: Optional[str] = None,
+        version: str = ""
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Gemini native function calling으로 도구 선택 (JSON 문자열 파싱 없음).
+        - 도구 호출 시: ({"action_id", "params"}, None)
+        - 도구가 필요 없으면 모델의 답변을 그대로: (None, answer) → 답변 생성 호출 생략
+        """
+        bound, names = self._bind_actions(specs, version)
+        response = bound.invoke(_selection_messages(system_prompt, user_query))
+        return _tool_selection(response, names)
+
+    async def aselect_tool(
+        self,
+        user_query: str,
+        specs: Sequence[Any],
+        system_prompt: Optional[str] = None,
+        version: str = ""
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """select_tool의 비동기 버전 (이벤트 루프 스레드를 점유하지 않음)"""
+        bound, names = self._bind_actions(specs, version)
+        response = await bound.ainvoke(_selection_messages(system_prompt, user_query))
+        return _tool_selection(response, names)
+
+    def _bind_actions(self, specs: Sequence[Any], version: str) -> Tuple[Any, Dict[str, str]]:
+        """ActionSpec 목록 → 함수 선언으로 바인딩 (버전이 같으면 재사용)"""
+        cached = self._bound
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        with self._bound_lock:
+            tools = [to_function_tool(spec) for spec in specs]
+            # 함수 이름에는 '.'을 쓸 수 없으므로 doc.search → doc_search로 바꾸고 역매핑 보관
+            names = {tool["function"]["name"]: spec.id for tool, spec in zip(tools, specs)}
+            bound = self.llm.bind_tools(tools)
+            self._bound = (version, bound, names)
+        return bound, names
 
     def predict_tool_call(self, system_prompt: str, user_query: str, tools_desc: str) -> Optional[Dict[str, Any]]:
         """
         LLM에게 상황을 설명하고, 사용할 도구가 있다면 JSON 포맷으로 응답받음
         """
+        response = self.llm.invoke([HumanMessage(content=self._tool_prompt(system_prompt, user_query, tools_desc))])
+        return self._parse_tool_call(response.content.strip())
+
+    async def apredict_tool_call(self, system_prompt: str, user_query: str, tools_desc: str) -> Optional[Dict[str, Any]]:
+        """predict_tool_call의 비동기 버전"""
+        response = await self.llm.ainvoke([HumanMessage(content=self._tool_prompt(system_prompt, user_query, tools_desc))])
+        return self._parse_tool_call(response.content.strip())
+
+    def _tool_prompt(self, system_prompt: str, user_query: str, tools_desc: str) -> str:
         # 만약 호출부에서 system_prompt를 안 넘겨주면 기본값 사용
         if not system_prompt:
             system_prompt = DEFAULT_SYSTEM_PROMPT
@@ -47,11 +104,9 @@ class LLMClient:
         
         User Query: {user_query}
         """
+        return prompt
 
-        messages = [HumanMessage(content=prompt)]
-        response = self.llm.invoke(messages)
-        content = response.content.strip()
-
+    def _parse_tool_call(self, content: str) -> Optional[Dict[str, Any]]:
         # 디버깅용 출력
         # print(f"DEBUG: LLM RAW OUTPUT: {content}")
 
@@ -75,6 +130,22 @@ class LLMClient:
         """
         도구 실행 결과를 바탕으로 최종 응답 생성
         """
+        response = self.llm.invoke([HumanMessage(content=self._response_prompt(query, tool_result))])
+        return response.content
+
+    async def agenerate_response(self, query: str, tool_result: List[Dict[str, Any]]) -> str:
+        """generate_response의 비동기 버전"""
+        response = await self.llm.ainvoke([HumanMessage(content=self._response_prompt(query, tool_result))])
+        return response.content
+
+    def stream_response(self, query: str, tool_result: List[Dict[str, Any]]) -> Iterator[str]:
+        """generate_response와 같은 프롬프트로 토큰(청크) 단위 스트리밍"""
+        for chunk in self.llm.stream([HumanMessage(content=self._response_prompt(query, tool_result))]):
+            text = _message_text(chunk.content)
+            if text:
+                yield text
+
+    def _response_prompt(self, query: str, tool_result: List[Dict[str, Any]]) -> str:
         context = ""
         if tool_result:
             context = f"[Context from Tools]\n{json.dumps(tool_result, ensure_ascii=False, indent=2)}"
@@ -87,9 +158,51 @@ class LLMClient:
         Please provide a helpful response based on the context above.
         If the context is empty, answer based on your general knowledge.
         """
+        return prompt
+
+def to_function_tool(spec: Any) -> Dict[str, Any]:
+    """ActionSpec → function calling 도구 선언 (OpenAI 형식, langchain이 Gemini 형식으로 변환)"""
+    required = spec.input_schema.get("required", [])
+    description = spec.description
+    if required:
+        description += f" (필수 매개변수: {', '.join(required)})"
+    return {
+        "type": "function",
+        "function": {
+            "name": spec.id.replace(".", "_"),
+            "description": description,
+            "parameters": copy.deepcopy(spec.input_schema),
+        },
+    }
+
+
+def _selection_messages(system_prompt: Optional[str], user_query: str) -> List[Any]:
+    return [
+        SystemMessage(content=system_prompt or DEFAULT_SYSTEM_PROMPT),
+        HumanMessage(content=user_query)
+    ]
+
+
+def _tool_selection(response: Any, names: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """AIMessage → (도구 호출, None) 또는 (None, 답변)"""
+    if response.tool_calls:
+        call = response.tool_calls[0]
+        return {"action_id": names.get(call["name"], call["name"]), "params": dict(call["args"])}, None
+    return None, _message_text(response.content)
+
+
+def _message_text(content: Any) -> str:
+    """AIMessage.content (문자열 또는 part 목록) → 텍스트"""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for part in content or []:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, dict) and part.get("type") == "text":
+            parts.append(part.get("text", ""))
+    return "".join(parts)
 
-        response = self.llm.invoke([HumanMessage(content=prompt)])
-        return response.content
 
 # FakeLLM 별칭 (기존 코드 호환성용)
 FakeLLM = LLMClient
\ No newline at end of file
@@ -0,0 +1,190 @@
+# app/infra/mq.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import pika
+from pika.adapters.blocking_connection import BlockingChannel
+
+logger = logging.getLogger(__name__)
+
+# RabbitMQ 설정 (환경변수 없으면 서비스명 사용)
+RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "rabbitmq-service")
+RABBITMQ_USER = os.getenv("RABBITMQ_USER", "guest")
+RABBITMQ_PASS = os.getenv("RABBITMQ_PASS", "guest")
+RABBITMQ_QUEUE = os.getenv("RABBITMQ_QUEUE", "embedding_queue")
+PUBLISHER_POOL_SIZE = int(os.getenv("PUBLISHER_POOL_SIZE", "4"))
+# 풀에서 채널을 얻기까지의 총 대기 상한 (넘으면 mq_unavailable)
+PUBLISHER_ACQUIRE_TIMEOUT_SEC = float(os.getenv("PUBLISHER_ACQUIRE_TIMEOUT_SEC", "5"))
+# 인제스트 발행 모드: sync(연결 풀 + 스레드풀) | async(aio-pika + 인메모리 버퍼)
+INGEST_MODE = os.getenv("INGEST_MODE", "sync")
+
+
+class PublishError(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class _PooledChannel:
+    """연결 1개 + 채널 1개 (publisher confirm 활성화, 큐 선언은 생성 시 1회)"""
+
+    def __init__(self, params: pika.ConnectionParameters, queue_name: str):
+        self.connection = pika.BlockingConnection(params)
+        self.channel: BlockingChannel = self.connection.channel()
+        self.channel.queue_declare(queue=queue_name, durable=True)
+        self.channel.confirm_delivery()
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection.is_open and self.channel.is_open
+
+    def close(self) -> None:
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except Exception:
+            pass
+
+
+class MQPublisher:
+    """
+    장기 실행 RabbitMQ 퍼블리셔.
+    - 연결/채널 풀(최대 pool_size)을 재사용해 요청마다 TCP/AMQP 핸드셰이크를 하지 않음
+    - publisher confirm으로 브로커 수신을 확인
+    - 연결이 끊겼으면 새 연결로 1회 재시도
+    - 채널은 정상 완료/브로커 거부 시에만 풀에 반환, 그 외 예외는 상태를 알 수 없으므로 폐기
+    pika BlockingConnection은 스레드 안전하지 않으므로 채널은 한 번에 한 스레드만 사용
+    """
+
+    def __init__(
+        self,
+        host: str = RABBITMQ_HOST,
+        queue_name: str = RABBITMQ_QUEUE,
+        pool_size: int = PUBLISHER_POOL_SIZE,
+        acquire_timeout_sec: float = PUBLISHER_ACQUIRE_TIMEOUT_SEC
+    ):
+        self.queue_name = queue_name
+        self.pool_size = pool_size
+        self.acquire_timeout_sec = acquire_timeout_sec
+        self._params = pika.ConnectionParameters(
+            host=host,
+            credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
+        )
+        self._idle: "queue.LifoQueue[_PooledChannel]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def publish(self, message: Dict[str, Any]) -> None:
+        self.publish_many([message])
+
+    def publish_many(self, messages: List[Dict[str, Any]]) -> None:
+        """메시지들을 하나의 채널로 발행. 실패 시 PublishError"""
+        bodies = [json.dumps(m) for m in messages]
+        for attempt in range(2):
+            pooled = self._acquire()
+            reusable = False
+            try:
+                for body in bodies:
+                    pooled.channel.basic_publish(
+                        exchange='',
+                        routing_key=self.queue_name,
+                        body=body,
+                        properties=pika.BasicProperties(delivery_mode=2),
+                        mandatory=True
+                    )
+                reusable = True
+                return
+            except (pika.exceptions.UnroutableError, pika.exceptions.NackError) as e:
+                # 브로커가 거부한 경우는 재시도해도 같은 결과 (채널은 정상)
+                reusable = True
+                raise PublishError(f"broker_rejected: {e}")
+            except pika.exceptions.AMQPError as e:
+                # 연결 끊김 등: 해당 연결 폐기 후 새 연결로 재시도
+                logger.warning(f"⚠️ MQ 발행 실패, 재연결 시도 ({attempt + 1}/2): {e!r}")
+            finally:
+                if reusable:
+                    self._release(pooled)
+                else:
+                    self._discard(pooled)
+        raise PublishError("mq_unavailable")
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> _PooledChannel:
+        deadline = time.monotonic() + self.acquire_timeout_sec
+        while True:
+            pooled = self._take(deadline)
+            if pooled.is_open:
+                try:
+                    # 유휴 동안 쌓인 heartbeat 등 처리 (끊긴 연결이면 여기서 예외)
+                    pooled.connection.process_data_events(time_limit=0)
+                    return pooled
+                except pika.exceptions.AMQPError:
+                    pass
+                except Exception:
+                    self._discard(pooled)
+                    raise
+            self._discard(pooled)
+
+    def _take(self, deadline: float) -> _PooledChannel:
+        """
+        유휴 채널을 꺼내거나, 풀 여유가 있으면 새로 생성 (없으면 반환될 때까지 대기).
+        deadline까지 얻지 못하면 PublishError(mq_unavailable)
+        """
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._created < self.pool_size:
+                    self._created += 1
+                    break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PublishError("mq_unavailable")
+            try:
+                return self._idle.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                continue
+
+        try:
+            return _PooledChannel(self._params, self.queue_name)
+        except pika.exceptions.AMQPError as e:
+            with self._lock:
+                self._created -= 1
+            raise PublishError(f"mq_unavailable: {e!r}")
+
+    def _release(self, pooled: _PooledChannel) -> None:
+        self._idle.put(pooled)
+
+    def _discard(self, pooled: _PooledChannel) -> None:
+        pooled.close()
+        with self._lock:
+            self._created -= 1
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_publisher_instance: Optional[MQPublisher] = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher() -> MQPublisher:
+    """퍼블리셔 싱글톤 인스턴스 반환"""
+    global _publisher_instance
+    if _publisher_instance is None:
+        with _publisher_lock:
+            if _publisher_instance is None:
+                _publisher_instance = MQPublisher()
+    return _publisher_instance
@@ -1,38 +1,141 @@
-import os
+from typing import Any, Dict, Iterator, List
+import asyncio
 import json
-import pika
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-app = FastAPI()
+from app.common.types import AskRequest
+from app.infra.mq import INGEST_MODE, PublishError, get_publisher
+from app.infra.async_mq import BufferFull, get_async_publisher
+from app.data.rag import is_rag_ready
+from app.infra.config import Config
 
-# RabbitMQ 설정 (환경변수 없으면 서비스명 사용)
-RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "rabbitmq-service")
-RABBITMQ_QUEUE = os.getenv("RABBITMQ_QUEUE", "embedding_queue")
+app = FastAPI()
 
 class DocumentRequest(BaseModel):
     content: str
 
+class BatchDocumentRequest(BaseModel):
+    documents: List[DocumentRequest] = Field(..., min_length=1)
+
 def publish_message(message: dict):
+    # 장기 실행 퍼블리셔의 연결/채널 풀 재사용 (요청마다 연결하지 않음)
+    get_publisher().publish(message)
+
+async def _enqueue(messages: List[Dict[str, Any]]) -> None:
+    """
+    INGEST_MODE에 따라 발행.
+    - async: 인메모리 버퍼에 넣고 즉시 반환, 버퍼가 가득 차면 429/503 + Retry-After
+    - sync: 연결 풀 퍼블리셔를 스레드풀에서 실행 (이벤트 루프 블로킹 방지)
+    """
     try:
-        connection = pika.BlockingConnection(pika.ConnectionParameters(host=RABBITMQ_HOST))
-        channel = connection.channel()
-        channel.queue_declare(queue=RABBITMQ_QUEUE, durable=True)
-        channel.basic_publish(
-            exchange='',
-            routing_key=RABBITMQ_QUEUE,
-            body=json.dumps(message),
-            properties=pika.BasicProperties(delivery_mode=2))
-        connection.close()
-    except Exception as e:
-        print(f"MQ Error: {e}")
+        if INGEST_MODE == "async":
+            get_async_publisher().offer_many(messages)
+        else:
+            await run_in_threadpool(get_publisher().publish_many, messages)
+    except BufferFull as e:
+        print(f"MQ Backpressure: {e.reason}")
+        status = 429 if e.reason == "ingest_buffer_full" else 503
+        raise HTTPException(status_code=status, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+    except PublishError as e:
+        print(f"MQ Error: {e.reason}")
+        raise HTTPException(status_code=503, detail=e.reason, headers={"Retry-After": "1"})
+
+@app.on_event("startup")
+async def start_publisher():
+    if INGEST_MODE == "async":
+        await get_async_publisher().start()
+
+@app.on_event("shutdown")
+async def close_publisher():
+    if INGEST_MODE == "async":
+        await get_async_publisher().stop()
+    else:
+        get_publisher().close()
 
 @app.post("/ingest")
-def ingest_document(request: DocumentRequest):
+async def ingest_document(request: DocumentRequest):
     print(f"Received content: {request.content}")
-    publish_message({"type": "ingest", "content": request.content})
+    await _enqueue([{"type": "ingest", "content": request.content}])
     return {"status": "queued", "content": request.content}
 
+@app.post("/ingest/batch")
+async def ingest_documents(request: BatchDocumentRequest):
+    """여러 문서를 한 요청으로 받아 일괄 발행"""
+    print(f"Received batch: {len(request.documents)} documents")
+    await _enqueue([{"type": "ingest", "content": doc.content} for doc in request.documents])
+    return {"status": "queued", "count": len(request.documents)}
+
 @app.get("/")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness 프로브: 첫 호출 시 RAG/LLM/그래프를 로드(warm-up)하고, 준비되면 200.
+    ChromaDB 일시 장애 등으로 실패하면 503 → 다음 프로브에서 재시도 (Pod 재시작 없음)
+    """
+    from app.agent.graph import warm_up
+
+    try:
+        await run_in_threadpool(warm_up)
+    except Exception as e:
+        print(f"Warm-up failed: {e}")
+        raise HTTPException(status_code=503, detail=f"not_ready: {e}")
+    return {"status": "ready", "rag": is_rag_ready()}
+
+@app.post("/ask")
+async def ask(request: AskRequest):
+    """
+    에이전트 질의 (비동기 그래프).
+    LLM/검색 대기 중 스레드를 점유하지 않으므로 동시 대화 수가 스레드풀 크기에 묶이지 않음
+    """
+    from app.agent.graph import run_graph_async
+
+    try:
+        out = await asyncio.wait_for(
+            run_graph_async(request.user.model_dump(), request.question),
+            Config.ASK_TIMEOUT_SEC
+        )
+    except asyncio.TimeoutError:
+        print(f"Ask timed out after {Config.ASK_TIMEOUT_SEC}s")
+        raise HTTPException(status_code=504, detail="ask_timeout")
+    return jsonable_encoder(out)
+
+def _sse(event: Dict[str, Any]) -> str:
+    """그래프 이벤트 → server-sent events 프레임"""
+    data = json.dumps(jsonable_encoder(event), ensure_ascii=False)
+    return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+
+@app.post("/ask/stream")
+def ask_stream(request: AskRequest):
+    """
+    에이전트 응답 스트리밍 (SSE).
+    route(도구 결정) → tool(실행 결과) → token(답변 조각) → done 순서로 전송 → 첫 바이트까지 시간 단축
+    """
+    from app.agent.graph import run_graph_stream
+
+    def events() -> Iterator[str]:
+        try:
+            for event in run_graph_stream(request.user.model_dump(), request.question):
+                yield _sse(event)
+        except Exception as e:
+            print(f"Ask stream failed: {e}")
+            yield _sse({"event": "error", "detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/stats")
+def runtime_stats():
+    """라우터 단계별(rule/semantic/llm) 적중률, 응답 캐시, 도구별 지연 히스토그램, 감사 로그 큐 통계"""
+    from app.agent.graph import runtime_stats as graph_stats
+
+    return graph_stats()
@@ -1,10 +1,21 @@
 # Audit functionality
 
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Protocol
+import atexit
+import importlib
 import json
+import logging
+import os
+import queue
+import threading
 import time
 
+from app.infra.config import Config
+from app.platform.pii import get_pii_masker
+
+logger = logging.getLogger(__name__)
+
 
 def build_audit_event(
     trace_id: str,
@@ -14,19 +25,233 @@ def build_audit_event(
     params: Dict[str, Any] | None = None,
     result: Dict[str, Any] | None = None,
     reason: str | None = None,
+    audit_level: str = "FULL",
 ) -> Dict[str, Any]:
+    """
+    audit_level(ActionSpec)에 따라 payload 크기 결정.
+    - FULL: params + result 전체
+    - BASIC: params + result 요약 (목록/객체는 건수만)
+    - NONE: PERMIT은 기록하지 않음 (write_audit에서 제외), DENY/ERROR는 BASIC으로 기록
+    PII 마스킹은 요청 경로가 아닌 flusher 스레드에서 기록 직전에 적용 (mask_event)
+    """
+    level = (audit_level or "FULL").upper()
     return {
         "ts": int(time.time() * 1000),
         "trace_id": trace_id,
         "user_id": user_id,
         "action_id": action_id,
-        "decision": decision,  # PERMIT / DENY
+        "decision": decision,  # PERMIT / DENY / ERROR
         "reason": reason,
+        "audit_level": level,
         "params": params or {},
-        "result": result or {},
+        "result": (result or {}) if level == "FULL" else _summarize(result or {}),
     }
 
 
+def mask_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """params/result의 PII 마스킹 (도구 결과의 검색된 문서 본문 등에도 PII가 있을 수 있음)"""
+    masker = get_pii_masker()
+    return {**event, "params": masker.mask_value(event.get("params")), "result": masker.mask_value(event.get("result"))}
+
+
+def _summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    # 스칼라 값은 유지, 목록/객체는 건수만 (검색 결과 본문을 기록하지 않음)
+    return {k: {"count": len(v)} if isinstance(v, (list, tuple, dict)) else v for k, v in result.items()}
+
+
+class AuditSink(Protocol):
+    """감사 로그 저장소 (파일, Kafka, ES, DB 등). flusher 스레드에서 배치 단위로 호출"""
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class StdoutAuditSink:
+    """기존 형식("[AUDIT] {...}")으로 stdout 출력"""
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        print("\n".join(f"[AUDIT] {json.dumps(e, ensure_ascii=False)}" for e in events), flush=True)
+
+    def close(self) -> None:
+        pass
+
+
+class RotatingFileAuditSink:
+    """
+    JSONL 파일 sink. max_bytes를 넘으면 audit.jsonl → audit.jsonl.1 → ... (backup_count개 유지)
+    배치마다 한 번 write + flush
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+
+class AuditPipeline:
+    """
+    비동기 배치 감사 로그 파이프라인.
+    - 요청 경로는 제한된 큐에 넣고 바로 반환 (PII 마스킹/직렬화/IO는 백그라운드 flusher 스레드)
+    - flusher는 batch_size건 또는 flush_interval_ms마다 sink.write_batch 호출
+    - 큐가 가득 차면 요청을 막지 않고 버림 (dropped 건수 집계 + 경고 로그)
+    - sink 실패 시 1회 재시도 후 버림 (failed 건수 집계)
+    """
+
+    def __init__(
+        self,
+        sink: AuditSink,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval_ms: int = 200
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_ms / 1000
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="audit-flusher", daemon=True)
+        self._flusher.start()
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"⚠️ 감사 로그 큐 가득 참, 누적 {self.dropped}건 버림")
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐에 들어간 이벤트가 모두 기록될 때까지 대기 (테스트/종료용)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._flusher.join(timeout)
+        self.sink.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _flush_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval_sec
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is None:
+                    stop = True
+                    break
+                batch.append(event)
+
+            self._write([mask_event(e) for e in batch])
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        for attempt in range(2):
+            try:
+                self.sink.write_batch(batch)
+                self.written += len(batch)
+                return
+            except Exception as e:
+                logger.error(f"❌ 감사 로그 기록 실패 ({attempt + 1}/2, {len(batch)}건): {e!r}")
+        self.failed += len(batch)
+
+
+def _create_sink(name: str) -> AuditSink:
+    """AUDIT_SINK: stdout(기본) | file | 'package.module:ClassName' (Kafka/ES/DB 등 외부 sink, 인자 없이 생성)"""
+    if name == "stdout":
+        return StdoutAuditSink()
+    if name == "file":
+        return RotatingFileAuditSink(Config.AUDIT_LOG_PATH, Config.AUDIT_LOG_MAX_BYTES, Config.AUDIT_LOG_BACKUPS)
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_pipeline_instance: Optional[AuditPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_audit_pipeline() -> AuditPipeline:
+    """감사 로그 파이프라인 싱글톤 인스턴스 반환 (프로세스 종료 시 남은 이벤트 기록)"""
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        with _pipeline_lock:
+            if _pipeline_instance is None:
+                _pipeline_instance = AuditPipeline(
+                    _create_sink(Config.AUDIT_SINK),
+                    max_queue=Config.AUDIT_QUEUE_SIZE,
+                    batch_size=Config.AUDIT_BATCH_SIZE,
+                    flush_interval_ms=Config.AUDIT_FLUSH_INTERVAL_MS
+                )
+                atexit.register(_pipeline_instance.close)
+    return _pipeline_instance
+
+
 def write_audit(event: Dict[str, Any]) -> None:
-    # MVP: stdout. 나중에 Kafka/ES/DB로 교체
-    print("[AUDIT]", json.dumps(event, ensure_ascii=False))
+    # audit_level NONE인 action의 PERMIT은 기록하지 않음
+    if event.get("audit_level") == "NONE" and event.get("decision") == "PERMIT":
+        return
+    get_audit_pipeline().submit(event)
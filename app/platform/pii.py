@@ -0,0 +1,69 @@
+# PII Masking
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List
+import re
+
+# 규칙별 named group을 하나의 alternation으로 묶어 1회 스캔으로 마스킹.
+# 같은 위치에서 여러 규칙이 맞으면 앞쪽 규칙 우선 (주민번호 → 이메일 → 전화번호 → 카드번호)
+_PII_PATTERN = re.compile(
+    r"(?P<rrn>(?P<rrn_head>\d{6})-\d{7})"
+    r"|(?P<email>[\w\.-]+@[\w\.-]+\.\w+)"
+    r"|(?P<phone>(?P<phone_head>01[0-9])-?\d{4}-?(?P<phone_tail>\d{4}))"
+    r"|(?P<card>(?P<card_head>\d{4})-\d{4}-\d{4}-(?P<card_tail>\d{4}))"
+)
+
+
+def _replace(m: "re.Match[str]") -> str:
+    kind = m.lastgroup
+    if kind == "rrn":
+        # 주민등록번호 (YYMMDD-NNNNNNN) → 생년월일만 유지
+        return f"{m.group('rrn_head')}-*******"
+    if kind == "email":
+        return "<EMAIL_MASKED>"
+    if kind == "phone":
+        # 전화번호 (010-XXXX-XXXX) → 가운데 4자리
+        return f"{m.group('phone_head')}-****-{m.group('phone_tail')}"
+    # 카드번호 → 앞뒤 4자리만 유지
+    return f"{m.group('card_head')}-****-****-{m.group('card_tail')}"
+
+
+class PIIMasker:
+    """
+    컴파일된 단일 패턴 PII 마스킹 엔진.
+    - mask: 문자열 1회 스캔 (규칙별로 re.sub를 반복하지 않음)
+    - mask_value: dict/list/tuple을 재귀적으로 마스킹 (filters 같은 중첩 params, 도구 result, 감사 로그)
+    - mask_many: 문서 배치 마스킹 (적재 시)
+    규칙 간 겹치는 문자열(전화번호 모양이 들어간 카드번호 등)은 왼쪽부터 한 규칙으로만 처리됨
+    """
+
+    def __init__(self, pattern: "re.Pattern[str]" = _PII_PATTERN):
+        self._sub = pattern.sub
+
+    def mask(self, text: str) -> str:
+        return self._sub(_replace, text)
+
+    def mask_many(self, texts: Iterable[str]) -> List[str]:
+        sub = self._sub
+        return [sub(_replace, text) for text in texts]
+
+    def mask_value(self, value: Any) -> Any:
+        """문자열은 마스킹, 컨테이너는 재귀 (그 외 값은 그대로)"""
+        if isinstance(value, str):
+            return self._sub(_replace, value)
+        if isinstance(value, dict):
+            return {k: self.mask_value(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.mask_value(v) for v in value)
+        return value
+
+    def mask_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: self.mask_value(v) for k, v in params.items()}
+
+
+# 전역 인스턴스 (상태 없음 → import 시 생성)
+_masker = PIIMasker()
+
+
+def get_pii_masker() -> PIIMasker:
+    return _masker
@@ -0,0 +1,162 @@
+# Rate Limiting (sliding window counter)
+
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+import logging
+import math
+import threading
+import time
+
+from app.infra.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(Protocol):
+    def hit(self, key: str, limit: int, window_sec: int, now: float) -> bool:
+        """요청 1건 기록 시도. 한도 이내면 기록 후 True, 초과면 기록 없이 False"""
+        ...
+
+
+def _window(now: float, window_sec: int) -> Tuple[int, float]:
+    """(현재 고정 윈도우 번호, 이전 윈도우 가중치)"""
+    index = math.floor(now / window_sec)
+    elapsed = now - index * window_sec
+    return index, 1.0 - elapsed / window_sec
+
+
+class MemoryRateLimitBackend:
+    """
+    프로세스 내 sliding window counter.
+    - 키마다 (윈도우 번호, 이전 윈도우 건수, 현재 윈도우 건수)만 저장 → 호출 수와 무관한 고정 메모리
+    - 추정치 = 이전 건수 × (이전 윈도우가 겹치는 비율) + 현재 건수
+    - 최근 사용 순서로 유지하며 2 윈도우 이상 유휴인 키(상태가 0과 같음)와 max_keys 초과분을 제거
+    단일 프로세스 전용 (API 레플리카가 여럿이면 RedisRateLimitBackend 사용)
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key → [윈도우 번호, 이전 건수, 현재 건수, window_sec]
+        self._state: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def hit(self, key: str, limit: int, window_sec: int, now: float) -> bool:
+        index, weight = _window(now, window_sec)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or index - state[0] > 1:
+                state = [index, 0, 0, window_sec]
+            elif index - state[0] == 1:
+                state = [index, state[2], 0, window_sec]
+            self._state[key] = state
+            self._state.move_to_end(key)
+            self._evict(index, now)
+
+            if state[1] * weight + state[2] >= limit:
+                return False
+            state[2] += 1
+            return True
+
+    def _evict(self, index: int, now: float) -> None:
+        # 가장 오래 사용되지 않은 키부터 확인 → 유휴 키가 아니면 중단 (호출당 상수 시간)
+        while self._state:
+            key, (last_index, _, _, window_sec) = next(iter(self._state.items()))
+            idle = math.floor(now / window_sec) - last_index > 1
+            if not idle and len(self._state) <= self.max_keys:
+                return
+            self._state.popitem(last=False)
+
+
+class RedisRateLimitBackend:
+    """
+    Redis 공유 sliding window counter (API 레플리카 간 공통 한도).
+    - 키: {prefix}{key}:{윈도우 번호} 정수 카운터, 2 윈도우 후 만료 (유휴 키는 TTL로 자동 제거)
+    - INCR + 이전 윈도우 GET을 한 트랜잭션으로 실행하고, 초과면 DECR로 되돌림
+      (동시 요청이 몰리면 일시적으로 덜 허용할 수는 있어도 한도를 넘겨 허용하지는 않음)
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key: str, limit: int, window_sec: int, now: float) -> bool:
+        index, weight = _window(now, window_sec)
+        current_key = f"{self.prefix}{key}:{index}"
+        pipe = self.client.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, window_sec * 2)
+        pipe.get(f"{self.prefix}{key}:{index - 1}")
+        current, _, previous = pipe.execute()
+
+        if int(previous or 0) * weight + int(current) > limit:
+            self.client.decr(current_key)
+            return False
+        return True
+
+
+class RateLimiter:
+    """
+    ActionSpec별 사용자 요청 한도.
+    - registry의 rate_limit: {limit, window_sec} 사용 (없으면 기본값)
+    - 키: (사용자, action) → 도구마다 독립 한도
+    - 공유 백엔드(Redis) 장애 시 프로세스 내 백엔드로 대체 (한도 없이 열어두지 않음)
+    """
+
+    def __init__(self, backend: RateLimitBackend, default_limit: int = 10, default_window_sec: int = 60):
+        self.backend = backend
+        self.default_limit = default_limit
+        self.default_window_sec = default_window_sec
+        self._fallback: Optional[MemoryRateLimitBackend] = None
+
+    def limits(self, spec: Any) -> Tuple[int, int]:
+        rule: Dict[str, Any] = getattr(spec, "rate_limit", None) or {}
+        return int(rule.get("limit", self.default_limit)), int(rule.get("window_sec", self.default_window_sec))
+
+    def allow(self, user_id: str, spec: Any) -> bool:
+        limit, window_sec = self.limits(spec)
+        if limit <= 0:
+            return True
+        key = f"{user_id}:{getattr(spec, 'id', '*')}"
+        now = time.time()
+        try:
+            return self.backend.hit(key, limit, window_sec, now)
+        except Exception as e:
+            if self._fallback is None:
+                logger.warning(f"⚠️ 공유 Rate Limit 백엔드 오류, 프로세스 내 한도로 대체: {e!r}")
+                self._fallback = MemoryRateLimitBackend(Config.RATE_LIMIT_MAX_KEYS)
+            return self._fallback.hit(key, limit, window_sec, now)
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_rate_limiter_instance: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """RATE_LIMIT_BACKEND(memory | redis)에 따른 Rate Limiter 싱글톤 인스턴스 반환"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        with _rate_limiter_lock:
+            if _rate_limiter_instance is None:
+                if Config.RATE_LIMIT_BACKEND == "redis":
+                    import redis  # 선택 의존성: redis 백엔드에서만 필요
+
+                    client = redis.Redis(
+                        host=Config.REDIS_HOST,
+                        port=Config.REDIS_PORT,
+                        password=Config.REDIS_PASSWORD,
+                        socket_timeout=0.2
+                    )
+                    backend: RateLimitBackend = RedisRateLimitBackend(client)
+                else:
+                    backend = MemoryRateLimitBackend(Config.RATE_LIMIT_MAX_KEYS)
+                _rate_limiter_instance = RateLimiter(
+                    backend,
+                    default_limit=Config.RATE_LIMIT_DEFAULT,
+                    default_window_sec=Config.RATE_LIMIT_WINDOW_SEC
+                )
+    return _rate_limiter_instance
@@ -1,9 +1,20 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.data.lexical_index import reciprocal_rank_fusion
 from app.data.rag import get_rag_service
+from app.data.retrieval_policy import RetrievalPolicy
+from app.data.search_batcher import get_search_batcher
+from app.infra.config import Config
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+class SearchError(Exception):
+    """벡터 검색 실패 (실행기가 재시도/hedge하고, 최종 실패는 그래프가 ERROR 답변으로 처리)"""
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
 def doc_search(query: str, top_k: int = 5, filters: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     문서 검색 (RAG retrieval)
@@ -11,41 +22,90 @@ def doc_search(query: str, top_k: int = 5, filters: Dict[str, Any] = None) -> Di
     Args:
         query: 검색 쿼리
         top_k: 반환할 최대 결과 수
-        filters: 필터 조건 (현재 미사용, 향후 확장 가능)
+        filters: 필터 조건 (status, effective_after → ChromaDB where 절로 변환해 검색 시 적용)
 
     Returns:
         검색 결과
+
+    Raises:
+        SearchError: 벡터 검색 실패 (빈 결과로 숨기지 않음 → 실행기 재시도 대상)
     """
-    try:
-        rag_service = get_rag_service()
-
-        # RAG 검색 수행
-        search_result = rag_service.search(query=query, n_results=top_k)
-
-        if "error" in search_result:
-            logger.error(f"검색 오류: {search_result['error']}")
-            return {"results": []}
-
-        # 결과를 registry.yaml 스키마에 맞게 포맷팅
-        results = []
-        for i, item in enumerate(search_result["results"]):
-            metadata = item.get("metadata", {})
-
-            result = {
-                "doc_id": metadata.get("title", f"doc_{i}"),  # title을 doc_id로 사용
-                "title": metadata.get("title", "제목 없음"),
-                "snippet": item.get("content", "")[:200] + "..." if len(item.get("content", "")) > 200 else item.get("content", ""),  # 내용의 일부를 snippet으로
-                "metadata": {
-                    "score": item.get("score", 0),
-                    "category": metadata.get("category", ""),
-                    "grade": metadata.get("grade", ""),
-                    "effective_date": metadata.get("effective_date", "")
-                }
+    if not query.strip():
+        return {"results": []}
+
+    # 필터는 top-k 선정 전에 DB에서 적용 (검색 후 거르면 관련 문서가 잘려나감)
+    where = RetrievalPolicy().build_where(filters or {})
+
+    # RAG 검색 수행 (마이크로 배칭 사용 시 동시 요청과 묶어서 처리)
+    if Config.SEARCH_BATCH_ENABLED:
+        search_result = get_search_batcher().search(query, n_results=top_k, where=where)
+    else:
+        search_result = get_rag_service().search(query=query, n_results=top_k, where=where)
+
+    lexical_result = None
+    if Config.HYBRID_SEARCH_ENABLED:
+        lexical_result = get_rag_service().lexical_search(query, n_results=top_k, where=where)
+    return _build_results(top_k, search_result, lexical_result)
+
+async def adoc_search(query: str, top_k: int = 5, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    """doc_search의 비동기 버전 (벡터 검색 I/O 동안 이벤트 루프를 블로킹하지 않음)"""
+    if not query.strip():
+        return {"results": []}
+
+    where = RetrievalPolicy().build_where(filters or {})
+
+    # 서비스 초기화(첫 호출 시 모델 로딩)는 블로킹이므로 스레드에서 실행
+    rag = await asyncio.to_thread(get_rag_service)
+    if Config.SEARCH_BATCH_ENABLED:
+        batcher = await asyncio.to_thread(get_search_batcher)
+        vector_search = batcher.asearch(query, n_results=top_k, where=where)
+    else:
+        vector_search = rag.asearch(query, n_results=top_k, where=where)
+
+    if Config.HYBRID_SEARCH_ENABLED:
+        # 어휘 검색(CPU)은 스레드에서 벡터 검색과 동시에 실행
+        search_result, lexical_result = await asyncio.gather(
+            vector_search,
+            asyncio.to_thread(rag.lexical_search, query, top_k, where)
+        )
+    else:
+        search_result, lexical_result = await vector_search, None
+    return _build_results(top_k, search_result, lexical_result)
+
+def _build_results(top_k: int, search_result: Dict[str, Any], lexical_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """벡터 검색 결과 (+ 어휘 검색 융합) → registry.yaml output_schema 형식"""
+    if "error" in search_result:
+        logger.error(f"검색 오류: {search_result['error']}")
+        raise SearchError(f"search_failed: {search_result['error']}")
+    vector_results = search_result.get("results", [])
+
+    # 하이브리드: BM25 어휘 검색 결과와 순위 융합 (RRF)
+    if lexical_result is not None:
+        items = reciprocal_rank_fusion(
+            [vector_results, lexical_result["results"]],
+            k=Config.RRF_K,
+            limit=min(top_k, 10)
+        )
+    else:
+        items = vector_results
+
+    # 결과를 registry.yaml 스키마에 맞게 포맷팅
+    results = []
+    for i, item in enumerate(items):
+        metadata = item.get("metadata", {})
+
+        result = {
+            "doc_id": metadata.get("parent_id") or metadata.get("title", f"doc_{i}"),  # 원본 문서 id (없으면 title)
+            "title": metadata.get("title", "제목 없음"),
+            "snippet": item.get("content", "")[:200] + "..." if len(item.get("content", "")) > 200 else item.get("content", ""),  # 내용의 일부를 snippet으로
+            "metadata": {
+                "score": item.get("score", 0),
+                "category": metadata.get("category", ""),
+                "grade": metadata.get("grade", ""),
+                "effective_date": metadata.get("effective_date", "")
             }
-            results.append(result)
+        }
+        results.append(result)
 
-        return {"results": results}
+    return {"results": results}
 
-    except Exception as e:
-        logger.error(f"문서 검색 실패: {e}")
-        return {"results": []}
\ No newline at end of file
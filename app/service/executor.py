@@ -0,0 +1,234 @@
+# Tool Executor (deadline / retry / hedged requests)
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import bisect
+import threading
+import time
+
+from app.infra.config import Config
+
+# 지연 히스토그램 버킷 상한(ms): 1ms ~ 약 65s, 버킷마다 약 19% 증가 (p95 오차 범위도 그만큼)
+_BUCKET_BOUNDS_MS: List[float] = [round(2 ** (i / 4), 2) for i in range(65)]
+
+
+class ToolTimeout(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class LatencyHistogram:
+    """로그 간격 버킷 지연 히스토그램 (고정 메모리, 분위수는 버킷 상한으로 근사)"""
+
+    def __init__(self):
+        self._counts = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(_BUCKET_BOUNDS_MS, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = q * self.count
+            seen = 0
+            for i, c in enumerate(self._counts):
+                seen += c
+                if seen >= rank and c:
+                    return _BUCKET_BOUNDS_MS[min(i, len(_BUCKET_BOUNDS_MS) - 1)]
+            return _BUCKET_BOUNDS_MS[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+class _ActionStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.retries = 0
+        self.hedged = 0
+        self.timeouts = 0
+
+
+class ToolExecutor:
+    """
+    ActionSpec 기반 도구 실행기.
+    - timeout_ms: 재시도/hedge를 포함한 전체 실행 시간 상한 → 넘으면 ToolTimeout
+    - retry: idempotent 도구만 실패 시 지수 백오프로 재시도 (비멱등 도구는 1회만 실행)
+    - hedge: idempotent + registry hedge: true 인 도구는 p95 지연이 지나도록 응답이 없으면
+      같은 요청을 한 번 더 보내고 먼저 끝난 결과 사용 (느린 ChromaDB 쿼리 등 꼬리 지연 차단)
+    - 도구별 지연 히스토그램 기록 (hedge 기준 p95 + /stats)
+    동기 도구는 스레드풀에서 실행하므로 늦게 끝난 시도는 결과만 버려지고 중단되지 않음 (async는 취소)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        hedge_enabled: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        backoff_ms: int = 50
+    ):
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.backoff_sec = backoff_ms / 1000
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._stats: Dict[str, _ActionStats] = {}
+        self._lock = threading.Lock()
+
+    def run(self, spec: Any, fn: Callable[[Dict[str, Any]], Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+        deadline = time.monotonic() + spec.timeout_ms / 1000
+        backoff = self.backoff_sec
+        attempts = self._attempts(spec)
+        for attempt in range(attempts):
+            try:
+                return self._attempt(spec, fn, params, deadline)
+            except ToolTimeout:
+                raise
+            except Exception as e:
+                if not self._can_retry(spec, attempt, attempts, deadline, backoff, e):
+                    raise
+            time.sleep(backoff)
+            backoff *= 2
+        raise ToolTimeout("tool_timeout")  # attempts >= 1 이므로 도달하지 않음
+
+    async def arun(self, spec: Any, fn: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]], params: Dict[str, Any]) -> Dict[str, Any]:
+        """run의 비동기 버전 (진 시도는 취소)"""
+        deadline = time.monotonic() + spec.timeout_ms / 1000
+        backoff = self.backoff_sec
+        attempts = self._attempts(spec)
+        for attempt in range(attempts):
+            try:
+                return await self._aattempt(spec, fn, params, deadline)
+            except ToolTimeout:
+                raise
+            except Exception as e:
+                if not self._can_retry(spec, attempt, attempts, deadline, backoff, e):
+                    raise
+            await asyncio.sleep(backoff)
+            backoff *= 2
+        raise ToolTimeout("tool_timeout")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._stats.items())
+        return {
+            action_id: {**s.latency.snapshot(), "retries": s.retries, "hedged": s.hedged, "timeouts": s.timeouts}
+            for action_id, s in items
+        }
+
+    def _attempt(self, spec: Any, fn: Callable, params: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        stats = self._action(spec.id)
+        start = time.monotonic()
+        futures: List[Future] = [self._pool.submit(fn, params)]
+
+        hedge_delay = self._hedge_delay(spec)
+        if hedge_delay is not None and hedge_delay < deadline - start:
+            done, _ = wait(futures, timeout=hedge_delay)
+            if not done:
+                stats.hedged += 1
+                futures.append(self._pool.submit(fn, params))
+
+        while futures:
+            done, _ = wait(futures, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                stats.timeouts += 1
+                raise ToolTimeout("tool_timeout")
+            for f in done:
+                futures.remove(f)
+                # 성공했거나, 남은 시도가 없으면 (예외 포함) 결과 반환
+                if f.exception() is None or not futures:
+                    stats.latency.observe((time.monotonic() - start) * 1000)
+                    return f.result()
+        raise ToolTimeout("tool_timeout")
+
+    async def _aattempt(self, spec: Any, fn: Callable, params: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        stats = self._action(spec.id)
+        start = time.monotonic()
+        tasks: List[asyncio.Future] = [asyncio.ensure_future(fn(params))]
+        try:
+            hedge_delay = self._hedge_delay(spec)
+            if hedge_delay is not None and hedge_delay < deadline - start:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    stats.hedged += 1
+                    tasks.append(asyncio.ensure_future(fn(params)))
+
+            while tasks:
+                done, _ = await asyncio.wait(tasks, timeout=max(deadline - time.monotonic(), 0), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    stats.timeouts += 1
+                    raise ToolTimeout("tool_timeout")
+                for t in done:
+                    tasks.remove(t)
+                    if t.exception() is None or not tasks:
+                        stats.latency.observe((time.monotonic() - start) * 1000)
+                        return t.result()
+            raise ToolTimeout("tool_timeout")
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def _attempts(self, spec: Any) -> int:
+        return 1 + (spec.retry if spec.idempotent else 0)
+
+    def _can_retry(self, spec: Any, attempt: int, attempts: int, deadline: float, backoff: float, error: Exception) -> bool:
+        # 재시도 횟수가 남았고, 백오프 후에도 deadline 전이면 재시도
+        if attempt + 1 >= attempts or time.monotonic() + backoff >= deadline:
+            return False
+        self._action(spec.id).retries += 1
+        print(f"[EXECUTOR] {spec.id} failed ({error!r}), retry {attempt + 1}/{attempts - 1}")
+        return True
+
+    def _hedge_delay(self, spec: Any) -> Optional[float]:
+        """hedge 대기 시간(초). 대상이 아니거나 표본이 부족하면 None"""
+        if not (self.hedge_enabled and spec.idempotent and getattr(spec, "hedge", False)):
+            return None
+        latency = self._action(spec.id).latency
+        if latency.count < self.hedge_min_samples:
+            return None
+        return latency.quantile(self.hedge_quantile) / 1000
+
+    def _action(self, action_id: str) -> _ActionStats:
+        stats = self._stats.get(action_id)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(action_id, _ActionStats())
+        return stats
+
+
+# 전역 인스턴스 (싱글톤 패턴)
+_executor_instance: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ToolExecutor:
+    """도구 실행기 싱글톤 인스턴스 반환"""
+    global _executor_instance
+    if _executor_instance is None:
+        with _executor_lock:
+            if _executor_instance is None:
+                _executor_instance = ToolExecutor(
+                    max_workers=Config.TOOL_EXECUTOR_WORKERS,
+                    hedge_enabled=Config.TOOL_HEDGE_ENABLED,
+                    hedge_quantile=Config.TOOL_HEDGE_QUANTILE,
+                    hedge_min_samples=Config.TOOL_HEDGE_MIN_SAMPLES,
+                    backoff_ms=Config.TOOL_RETRY_BACKOFF_MS
+                )
+    return _executor_instance
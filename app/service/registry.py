@@ -1,11 +1,19 @@
 # Registry functionality
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
+import hashlib
+import logging
+import threading
+import time
 import yaml
 from pathlib import Path
 
+from app.service.schema import Validator, compile_schema
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class ActionSpec:
@@ -18,32 +26,152 @@ class ActionSpec:
     audit_level: str
     input_schema: Dict[str, Any]
     output_schema: Dict[str, Any]
+    # 라우팅용 예시 질문 (semantic router가 description과 함께 임베딩)
+    examples: List[str] = field(default_factory=list)
+    # 결정적 도구의 응답 템플릿 (params + result로 format, 있으면 답변 생성 LLM 호출 생략)
+    answer_template: str = ""
+    # 응답이 p95 지연보다 늦으면 같은 요청을 한 번 더 보냄 (idempotent 도구만 적용)
+    hedge: bool = False
+    # 사용자별 호출 한도 {limit, window_sec} (없으면 RATE_LIMIT_DEFAULT / RATE_LIMIT_WINDOW_SEC)
+    rate_limit: Dict[str, int] = field(default_factory=dict)
+    # registry 로딩 시 input_schema / output_schema를 컴파일한 검증기 (비교/출력 대상 아님)
+    input_validator: Optional[Validator] = field(default=None, compare=False, repr=False)
+    output_validator: Optional[Validator] = field(default=None, compare=False, repr=False)
+
+
+class RegistrySnapshot:
+    """
+    한 시점의 registry 내용 (변경 불가, 교체 단위).
+    버전별로 미리 계산한 값 보관: 정렬된 id/spec 목록, 프롬프트용 도구 설명, 컴파일된 검증기(ActionSpec)
+    """
+
+    def __init__(self, by_id: Dict[str, ActionSpec], version: str, revision: int):
+        self.by_id = by_id
+        self.version = version
+        self.revision = revision
+        self.ids: List[str] = sorted(by_id)
+        self.specs: List[ActionSpec] = [by_id[aid] for aid in self.ids]
+        self.tools_desc = "\n".join(_describe(spec) for spec in self.specs)
+
+    def get(self, action_id: str) -> Optional[ActionSpec]:
+        return self.by_id.get(action_id)
+
+    def list_ids(self) -> List[str]:
+        return list(self.ids)
 
 
 class ActionRegistry:
-    def __init__(self, path: str):
+    """
+    registry.yaml 로더 (hot reload).
+    - reload_interval_sec마다 조회 시점에 파일 mtime을 확인해 바뀌었으면 다시 로딩 (별도 스레드 없음)
+    - 새 snapshot을 완성한 뒤 참조만 교체 → 요청 처리 중에는 항상 완전한 한 버전만 보임
+    - 파싱/검증 실패 시 기존 snapshot 유지
+    - version: "{revision}:{yaml version}:{내용 해시}" (revision은 내용이 바뀔 때마다 1씩 증가)
+      → 캐시 키에 포함하면 action 추가/수정 시 해당 캐시만 자연스럽게 갱신
+    """
+
+    def __init__(self, path: str, reload_interval_sec: float = 0):
         self.path = Path(path)
-        self._by_id: Dict[str, ActionSpec] = {}
+        self.reload_interval_sec = reload_interval_sec
+        self._lock = threading.Lock()
+        self._mtime_ns = 0
+        self._next_check = 0.0
+        self._snapshot = RegistrySnapshot({}, "", 0)
         self._load()
 
-    def _load(self) -> None:
-        raw = yaml.safe_load(self.path.read_text(encoding="utf-8"))
-        for a in raw.get("actions", []):
-            spec = ActionSpec(
-                id=a["id"],
-                description=a.get("description", ""),
-                scopes_required=a.get("scopes_required", []),
-                timeout_ms=int(a.get("timeout_ms", 1000)),
-                retry=int(a.get("retry", 0)),
-                idempotent=bool(a.get("idempotent", True)),
-                audit_level=a.get("audit_level", "BASIC"),
-                input_schema=a.get("input_schema", {"type": "object"}),
-                output_schema=a.get("output_schema", {"type": "object"}),
-            )
-            self._by_id[spec.id] = spec
+    @property
+    def version(self) -> str:
+        return self.snapshot().version
+
+    @property
+    def revision(self) -> int:
+        return self.snapshot().revision
+
+    def snapshot(self) -> RegistrySnapshot:
+        """현재 snapshot (요청 하나에서는 같은 snapshot을 계속 사용하면 버전이 섞이지 않음)"""
+        if self.reload_interval_sec > 0 and time.monotonic() >= self._next_check:
+            self.maybe_reload()
+        return self._snapshot
 
     def get(self, action_id: str) -> Optional[ActionSpec]:
-        return self._by_id.get(action_id)
+        return self.snapshot().get(action_id)
 
     def list_ids(self) -> List[str]:
-        return sorted(self._by_id.keys())
+        return self.snapshot().list_ids()
+
+    def maybe_reload(self) -> bool:
+        """파일이 바뀌었으면 다시 로딩. 새 버전으로 교체했으면 True"""
+        if not self._lock.acquire(blocking=False):
+            # 다른 스레드가 확인/로딩 중 → 기존 snapshot 사용
+            return False
+        try:
+            self._next_check = time.monotonic() + self.reload_interval_sec
+            try:
+                mtime_ns = self.path.stat().st_mtime_ns
+            except OSError as e:
+                logger.warning(f"⚠️ registry 파일 확인 실패, 기존 버전 유지: {e}")
+                return False
+            if mtime_ns == self._mtime_ns:
+                return False
+            return self._load_locked(mtime_ns)
+        finally:
+            self._lock.release()
+
+    def _load(self) -> None:
+        with self._lock:
+            self._load_locked(self.path.stat().st_mtime_ns, initial=True)
+
+    def _load_locked(self, mtime_ns: int, initial: bool = False) -> bool:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+            raw = yaml.safe_load(text)
+            # YAML version + 내용 해시 (version을 올리지 않고 수정해도 캐시 등이 구분 가능)
+            content_version = f"{raw.get('version', 0)}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}"
+            current = self._snapshot
+            if current.version.split(":", 1)[-1] == content_version:
+                # 내용이 같으면(touch 등) 교체하지 않음 → 버전별 캐시 유지
+                self._mtime_ns = mtime_ns
+                return False
+            by_id = {spec.id: spec for spec in (_to_spec(a) for a in raw.get("actions", []))}
+        except Exception as e:
+            if initial:
+                raise
+            logger.error(f"❌ registry 다시 로딩 실패, 기존 버전 유지: {e!r}")
+            self._mtime_ns = mtime_ns
+            return False
+
+        revision = current.revision + 1
+        self._snapshot = RegistrySnapshot(by_id, f"{revision}:{content_version}", revision)
+        self._mtime_ns = mtime_ns
+        if not initial:
+            logger.info(f"✅ registry 다시 로딩 완료 (version {self._snapshot.version}, {len(by_id)}개 action)")
+        return True
+
+
+def _to_spec(a: Dict[str, Any]) -> ActionSpec:
+    input_schema = a.get("input_schema", {"type": "object"})
+    output_schema = a.get("output_schema", {"type": "object"})
+    return ActionSpec(
+        id=a["id"],
+        description=a.get("description", ""),
+        scopes_required=a.get("scopes_required", []),
+        timeout_ms=int(a.get("timeout_ms", 1000)),
+        retry=int(a.get("retry", 0)),
+        idempotent=bool(a.get("idempotent", True)),
+        audit_level=a.get("audit_level", "BASIC"),
+        input_schema=input_schema,
+        output_schema=output_schema,
+        examples=a.get("examples", []),
+        answer_template=a.get("answer_template", ""),
+        hedge=bool(a.get("hedge", False)),
+        rate_limit=a.get("rate_limit", {}),
+        input_validator=compile_schema(input_schema),
+        output_validator=compile_schema(output_schema),
+    )
+
+
+def _describe(spec: ActionSpec) -> str:
+    """프롬프트 방식 도구 선택용 한 줄 설명"""
+    required_fields = spec.input_schema.get("required", [])
+    params_desc = f" (필수 매개변수: {', '.join(required_fields)})" if required_fields else ""
+    return f"- {spec.id}: {spec.description}{params_desc}"
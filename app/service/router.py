@@ -1,9 +1,22 @@
 # Service Router
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import re
+import threading
+
+import numpy as np
+
 from app.service.registry import ActionRegistry, ActionSpec
 from app.common.types import ToolCall
 
+# 금액 단위 (3억 5천만원, 5000만원 등)
+_AMOUNT_UNITS = {"억": 10 ** 8, "천만": 10 ** 7, "백만": 10 ** 6, "만": 10 ** 4, "천": 10 ** 3}
+_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(억|천만|백만|만|천)|(\d{1,3}(?:,\d{3})+|\d{5,})\s*원")
+_RATE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:%|퍼센트|프로)")
+# 대출 기간: 앞에 숫자가 붙지 않은 1~3자리 (달력 연도 "2024년"과 구분), 범위는 _parse_term에서 확인
+_TERM = re.compile(r"(?<![\d.,])(\d{1,3})\s*(년|개월|달)")
+_MAX_TERM_MONTHS = 50 * 12
+
 class ToolRouter:
     """
     사용자의 질문(Question)을 분석하여 적절한 Action(Tool)으로 매핑하는 라우터.
@@ -18,6 +31,12 @@ class ToolRouter:
         """
         q = question.lower()
 
+        # 0. 대출 계산: 금액/금리/기간을 모두 추출할 수 있을 때만 (검색 키워드보다 우선)
+        if self._is_loan_intent(q) and self.registry.get("fin.calc_loan"):
+            params = self._extract_loan_params(q)
+            if params:
+                return ToolCall(action_id="fin.calc_loan", params=params)
+
         # 1. Iterate over all registered actions
         # registry.yaml에 정의된 description을 기반으로 매칭하는 것이 이상적이나,
         # MVP 단계에서는 키워드 매칭 로직을 여기서 동적으로 구성할 수도 있음.
@@ -44,7 +63,8 @@ class ToolRouter:
         return None
 
     def _is_search_intent(self, q: str) -> bool:
-        keywords = ["찾아", "검색", "알려줘", "조회", "search", "find"]
+        # 명시적 검색 요청만 (알려줘/find 같은 일반 표현은 대화나 다른 도구와 겹침 → 의미/LLM 단계에 위임)
+        keywords = ["검색", "search"]
         return any(k in q for k in keywords)
 
     def _extract_search_params(self, q: str) -> Dict[str, Any]:
@@ -59,3 +79,181 @@ class ToolRouter:
 
     def _is_audit_intent(self, q: str) -> bool:
         return "로그" in q and "기록" in q
+
+    def _is_loan_intent(self, q: str) -> bool:
+        keywords = ["대출", "상환", "이자", "loan"]
+        return any(k in q for k in keywords)
+
+    def _extract_loan_params(self, q: str) -> Optional[Dict[str, Any]]:
+        """
+        질문에서 원금/연이율/기간(개월) 추출. 하나라도 없으면 None (LLM에 위임)
+        예: "2억을 연 4.5%로 30년" → principal=200000000, annual_rate=4.5, months=360
+        """
+        rate = _RATE.search(q)
+        months = _parse_term(q)
+        principal = _parse_amount(_RATE.sub(" ", q))
+        if not (rate and months and principal):
+            return None
+        return {"principal": principal, "annual_rate": float(rate.group(1)), "months": months}
+
+
+def _parse_term(q: str) -> Optional[int]:
+    """대출 기간(개월). 50년을 넘는 값은 기간으로 보지 않음, 없으면 None"""
+    for number, unit in _TERM.findall(q):
+        months = int(number) * (12 if unit == "년" else 1)
+        if 0 < months <= _MAX_TERM_MONTHS:
+            return months
+    return None
+
+
+def _parse_amount(q: str) -> Optional[float]:
+    """한국어 금액 표기 합산 ("3억 5천만원" → 350000000). 금액이 없으면 None"""
+    total = 0.0
+    for number, unit, plain in _AMOUNT.findall(q):
+        if unit:
+            total += float(number.replace(",", "")) * _AMOUNT_UNITS[unit]
+        else:
+            total += float(plain.replace(",", ""))
+    return total or None
+
+
+class TieredRouter:
+    """
+    단계별 도구 선택 (싼 단계에서 확신이 있으면 LLM 호출 생략).
+    1) rule: ToolRouter 키워드/정규식 규칙
+    2) semantic: 질문 임베딩과 action별 예시(description + examples) 최근접 비교
+       ready()가 True(임베딩 모델 로드 완료)이고 예시 임베딩이 준비된 경우만 사용 → 요청 경로에서 모델 로딩 없음.
+       예시 임베딩은 warm_up()(readiness)에서 계산, registry가 바뀌면 백그라운드에서 다시 계산
+    3) llm: 위 단계에서 확신이 없을 때만 호출측이 LLM으로 결정 (record_llm으로 집계)
+    파라미터를 추출할 수 없는 action은 빠른 경로로 선택하지 않음
+    """
+
+    def __init__(
+        self,
+        registry: ActionRegistry,
+        embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        threshold: float = 0.6,
+        margin: float = 0.05,
+        ready: Optional[Callable[[], bool]] = None
+    ):
+        self.registry = registry
+        self.rules = ToolRouter(registry)
+        self.embed = embed
+        self.ready = ready
+        self.threshold = threshold
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {"rule": 0, "semantic": 0, "llm": 0}
+        self._exemplars: Optional[Tuple[str, List[str], np.ndarray]] = None  # (registry 버전, action id 목록, 임베딩)
+        self._building = threading.Lock()
+
+    def route(self, question: str) -> Tuple[Optional[ToolCall], str]:
+        """(ToolCall 또는 None, 결정한 단계). None이면 LLM 단계로 넘겨야 함"""
+        tool_call = self.rules.route(question)
+        if tool_call is not None:
+            self._record("rule")
+            return tool_call, "rule"
+
+        if self.embed is not None and (self.ready is None or self.ready()):
+            tool_call = self._route_semantic(question)
+            if tool_call is not None:
+                self._record("semantic")
+                return tool_call, "semantic"
+
+        return None, "llm"
+
+    def warm_up(self) -> None:
+        """현재 registry 버전의 예시 임베딩 계산 (readiness에서 호출)"""
+        if self.embed is not None:
+            self._build_exemplars()
+
+    def record_llm(self) -> None:
+        self._record("llm")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self._hits.values())
+            return {
+                "total": total,
+                "hits": dict(self._hits),
+                "hit_rate": {tier: round(n / total, 3) if total else 0.0 for tier, n in self._hits.items()},
+            }
+
+    def _record(self, tier: str) -> None:
+        with self._lock:
+            self._hits[tier] += 1
+
+    def _route_semantic(self, question: str) -> Optional[ToolCall]:
+        prepared = self._current_exemplars()
+        if prepared is None:
+            return None
+        action_ids, exemplars = prepared
+        if not action_ids:
+            return None
+        q = _unit(np.asarray(self.embed([question])[0], dtype=np.float32))
+        sims = exemplars @ q
+
+        # action별 최고 유사도 → 1위가 threshold 이상이고 2위와 margin 이상 차이날 때만 확신
+        best: Dict[str, float] = {}
+        for aid, sim in zip(action_ids, sims):
+            best[aid] = max(best.get(aid, -1.0), float(sim))
+        ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+        top_id, top_sim = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if top_sim < self.threshold or top_sim - runner_up < self.margin:
+            return None
+
+        q_lower = question.lower()
+        if top_id == "doc.search":
+            return ToolCall(action_id=top_id, params=self.rules._extract_search_params(q_lower))
+        if top_id == "fin.calc_loan":
+            params = self.rules._extract_loan_params(q_lower)
+            return ToolCall(action_id=top_id, params=params) if params else None
+        return None
+
+    def _snapshot(self) -> Any:
+        # hot reload 중에도 버전과 action 목록이 어긋나지 않도록 한 snapshot에서 읽음
+        return self.registry.snapshot() if hasattr(self.registry, "snapshot") else self.registry
+
+    def _current_exemplars(self) -> Optional[Tuple[List[str], np.ndarray]]:
+        """현재 registry 버전의 예시 임베딩. 없으면(미준비/버전 변경) 백그라운드 계산을 시작하고 None"""
+        version = getattr(self._snapshot(), "version", "")
+        cached = self._exemplars
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        if self._building.acquire(blocking=False):
+            threading.Thread(target=self._background_build, name="router-exemplars", daemon=True).start()
+        return None
+
+    def _background_build(self) -> None:
+        try:
+            self._build_exemplars()
+        except Exception as e:
+            print(f"[ROUTER] Exemplar embedding failed: {e!r}")
+        finally:
+            self._building.release()
+
+    def _build_exemplars(self) -> Tuple[List[str], np.ndarray]:
+        """레지스트리 버전별로 예시 임베딩을 한 번만 계산"""
+        registry = self._snapshot()
+        version = getattr(registry, "version", "")
+        cached = self._exemplars
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        action_ids: List[str] = []
+        texts: List[str] = []
+        for aid in registry.list_ids():
+            spec = registry.get(aid)
+            for text in [spec.description, *spec.examples]:
+                if text:
+                    action_ids.append(aid)
+                    texts.append(text)
+        vectors = np.stack([_unit(np.asarray(v, dtype=np.float32)) for v in self.embed(texts)]) if texts else np.zeros((0, 0))
+        self._exemplars = (version, action_ids, vectors)
+        return action_ids, vectors
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
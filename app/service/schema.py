@@ -0,0 +1,187 @@
+# Schema Validation (registry input_schema / output_schema)
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Tuple
+import copy
+
+# (값, 경로) → 검증/변환된 값. 실패 시 SchemaError
+_Check = Callable[[Any, str], Any]
+Validator = Callable[[Any], Any]
+
+
+class SchemaError(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """
+    JSON Schema 부분집합을 검증 함수로 컴파일 (registry 로딩 시 1회, 호출마다 스키마 dict를 순회하지 않음).
+    지원: type, required, properties, items, enum, minimum, maximum, minLength, maxLength, default
+    - 누락(또는 null)된 선택 필드는 default로 채움 (예: top_k: 5)
+    - LLM이 만든 인자 대응: 정수 값의 float(360.0) → int, 숫자 문자열("5") → 숫자
+    입력은 변경하지 않고 새 값을 반환
+    """
+    check = _compile(schema or {})
+    return lambda value: check(value, "")
+
+
+def validate_input(spec: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """ActionSpec의 컴파일된 input 검증기 사용 (없는 spec 객체는 그 자리에서 컴파일)"""
+    validator = getattr(spec, "input_validator", None) or compile_schema(spec.input_schema)
+    return validator(params)
+
+
+def validate_output(spec: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    validator = getattr(spec, "output_validator", None) or compile_schema(getattr(spec, "output_schema", {}))
+    return validator(result)
+
+
+def _compile(schema: Dict[str, Any]) -> _Check:
+    checks: List[_Check] = []
+    kind = schema.get("type")
+    if kind is not None:
+        checks.append(_type_check(kind))
+    if "enum" in schema:
+        checks.append(_enum_check(list(schema["enum"])))
+    if "minimum" in schema or "maximum" in schema:
+        checks.append(_range_check(schema.get("minimum"), schema.get("maximum")))
+    if "minLength" in schema or "maxLength" in schema:
+        checks.append(_length_check(schema.get("minLength"), schema.get("maxLength")))
+    if "properties" in schema or "required" in schema:
+        checks.append(_object_check(schema))
+    if "items" in schema:
+        checks.append(_items_check(_compile(schema["items"])))
+
+    if not checks:
+        return lambda value, path: value
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, path: str) -> Any:
+        for check in checks:
+            value = check(value, path)
+        return value
+    return check_all
+
+
+def _type_check(kind: str) -> _Check:
+    def mismatch(value: Any, path: str) -> SchemaError:
+        return SchemaError(f"type_mismatch: key={path}, expected={kind}, got={type(value).__name__}")
+
+    if kind == "integer":
+        def check(value: Any, path: str) -> Any:
+            if isinstance(value, bool):
+                raise mismatch(value, path)
+            if isinstance(value, int):
+                return value
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if isinstance(value, str):
+                try:
+                    return int(value.strip())
+                except ValueError:
+                    pass
+            raise mismatch(value, path)
+    elif kind == "number":
+        def check(value: Any, path: str) -> Any:
+            if isinstance(value, bool):
+                raise mismatch(value, path)
+            if isinstance(value, (int, float)):
+                return value
+            if isinstance(value, str):
+                try:
+                    return float(value.strip())
+                except ValueError:
+                    pass
+            raise mismatch(value, path)
+    elif kind == "array":
+        def check(value: Any, path: str) -> Any:
+            if isinstance(value, (list, tuple)):
+                return list(value)
+            raise mismatch(value, path)
+    else:
+        expected: Tuple[type, ...] = {
+            "string": (str,),
+            "boolean": (bool,),
+            "object": (dict,),
+            "null": (type(None),),
+        }.get(kind, (object,))
+
+        def check(value: Any, path: str) -> Any:
+            if isinstance(value, expected):
+                return value
+            raise mismatch(value, path)
+    return check
+
+
+def _enum_check(allowed: List[Any]) -> _Check:
+    def check(value: Any, path: str) -> Any:
+        if value not in allowed:
+            raise SchemaError(f"value_not_allowed: key={path}, value={value}, allowed={allowed}")
+        return value
+    return check
+
+
+def _range_check(minimum: Any, maximum: Any) -> _Check:
+    def check(value: Any, path: str) -> Any:
+        if not isinstance(value, (int, float)):
+            return value
+        if minimum is not None and value < minimum:
+            raise SchemaError(f"out_of_range: key={path}, value={value}, minimum={minimum}")
+        if maximum is not None and value > maximum:
+            raise SchemaError(f"out_of_range: key={path}, value={value}, maximum={maximum}")
+        return value
+    return check
+
+
+def _length_check(min_length: Any, max_length: Any) -> _Check:
+    def check(value: Any, path: str) -> Any:
+        if not isinstance(value, (str, list)):
+            return value
+        if min_length is not None and len(value) < min_length:
+            raise SchemaError(f"too_short: key={path}, minLength={min_length}")
+        if max_length is not None and len(value) > max_length:
+            raise SchemaError(f"too_long: key={path}, maxLength={max_length}")
+        return value
+    return check
+
+
+def _object_check(schema: Dict[str, Any]) -> _Check:
+    properties = schema.get("properties", {})
+    required = tuple(schema.get("required", ()))
+    fields = {key: _compile(sub) for key, sub in properties.items()}
+    defaults = {key: sub["default"] for key, sub in properties.items() if "default" in sub}
+
+    def check(value: Any, path: str) -> Any:
+        if not isinstance(value, dict):
+            raise SchemaError(f"type_mismatch: key={path}, expected=object, got={type(value).__name__}")
+        out = dict(value)
+        for key in required:
+            if out.get(key) is None:
+                raise SchemaError(f"missing_required_field: {_join(path, key)}")
+        for key, default in defaults.items():
+            if out.get(key) is None:
+                out[key] = copy.deepcopy(default)
+        for key, field_check in fields.items():
+            if key in out:
+                if out[key] is None:
+                    # 선택 필드의 null은 생략과 같게 처리
+                    del out[key]
+                else:
+                    out[key] = field_check(out[key], _join(path, key))
+        return out
+    return check
+
+
+def _items_check(item_check: _Check) -> _Check:
+    def check(value: Any, path: str) -> Any:
+        if not isinstance(value, (list, tuple)):
+            return value
+        return [item_check(item, f"{path}[{i}]") for i, item in enumerate(value)]
+    return check
+
+
+def _join(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
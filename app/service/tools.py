@@ -1,12 +1,13 @@
 # Tool definitions
 
 from __future__ import annotations
-from typing import Any, Dict, Callable
-from app.service.actions.doc_search import doc_search
+from typing import Any, Awaitable, Dict, Callable
+from app.service.actions.doc_search import adoc_search, doc_search
 from app.platform.audit import write_audit
 
 
 ToolFn = Callable[[Dict[str, Any]], Dict[str, Any]]
+AsyncToolFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
 
 
 def get_tool_map() -> Dict[str, ToolFn]:
@@ -17,6 +18,29 @@ def get_tool_map() -> Dict[str, ToolFn]:
     }
 
 
+def get_async_tool_map() -> Dict[str, AsyncToolFn]:
+    """비동기 그래프용 도구 (I/O 도구는 async 구현, CPU만 쓰는 도구는 그대로 감쌈)"""
+    return {
+        "doc.search": _atool_doc_search,
+        "audit.write": _as_async(_tool_audit_write),
+        "fin.calc_loan": _as_async(_tool_loan_calc),
+    }
+
+
+def _as_async(fn: ToolFn) -> AsyncToolFn:
+    async def wrapper(params: Dict[str, Any]) -> Dict[str, Any]:
+        return fn(params)
+    return wrapper
+
+
+async def _atool_doc_search(params: Dict[str, Any]) -> Dict[str, Any]:
+    return await adoc_search(
+        query=params["query"],
+        top_k=int(params.get("top_k", 5)),
+        filters=params.get("filters", {"status": "active"}),
+    )
+
+
 def _tool_doc_search(params: Dict[str, Any]) -> Dict[str, Any]:
     # enforce()에서 이미 PII 마스킹이 적용된 params가 전달됨
     return doc_search(
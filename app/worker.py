@@ -1,6 +1,10 @@
 import os
 import json
 import time
+import hashlib
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 import pika
 # 기존에 만들어둔 RAG 로직 재사용
 from app.data.rag import get_rag_service
@@ -11,12 +15,27 @@ RABBITMQ_USER = os.getenv("RABBITMQ_USER", "guest")
 RABBITMQ_PASS = os.getenv("RABBITMQ_PASS", "guest")
 QUEUE_NAME = os.getenv("RABBITMQ_QUEUE", "embedding_queue")
 
+# 처리 모드: single(메시지 1건씩) | batch(N건 또는 T ms 단위로 모아서 처리)
+#          | pool(배치를 스레드 풀에서 병렬 처리, 수신/ACK는 pika 연결 스레드에서)
+WORKER_MODE = os.getenv("WORKER_MODE", "single")
+BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", "32"))
+BATCH_WAIT_MS = int(os.getenv("WORKER_BATCH_WAIT_MS", "200"))
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", str(os.cpu_count() or 1)))
+
+def _parse_body(body: bytes) -> Dict[str, Any]:
+    """메시지 본문 파싱. id가 없으면 본문 해시로 고정 id 부여 (doc_0 충돌 방지)"""
+    doc_data = json.loads(body)
+    if not isinstance(doc_data, dict):
+        raise ValueError("메시지가 JSON 객체가 아님")
+    doc_data.setdefault("id", f"doc_{hashlib.sha1(body).hexdigest()[:16]}")
+    return doc_data
+
 def process_message(ch, method, properties, body):
     """메시지 처리: 문서를 받아 임베딩 후 DB 저장"""
     print(f" [x] Task Received")
     doc_data = {}
     try:
-        doc_data = json.loads(body)
+        doc_data = _parse_body(body)
         title = doc_data.get('title', 'Untitled')
         
         print(f"Processing document: {title}")
@@ -38,6 +57,129 @@ def process_message(ch, method, properties, body):
         # 에러 시 메시지를 다시 큐에 넣지 않음 (무한 루프 방지) -> Dead Letter Queue가 정석이지만 여기선 Nack
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
+def embed_batch(deliveries: List[Tuple[int, bytes]]) -> Tuple[List[int], List[int]]:
+    """
+    배치 임베딩: 여러 메시지의 문서를 add_documents 1회로 저장.
+    Returns: (성공 delivery_tag 목록, 실패 delivery_tag 목록)
+    """
+    rag = get_rag_service()
+    failed: List[int] = []
+    parsed: List[Tuple[int, Dict[str, Any]]] = []
+    for tag, body in deliveries:
+        try:
+            doc = rag._to_document(_parse_body(body), 0)
+            if doc is None:
+                raise ValueError("문서 변환 실패")
+            parsed.append((tag, doc))
+        except Exception as e:
+            print(f" [!] Invalid message (tag={tag}): {e}")
+            failed.append(tag)
+
+    if parsed and rag.add_documents([doc for _, doc in parsed]):
+        return [tag for tag, _ in parsed], failed
+
+    # 배치 저장 실패 시 메시지별로 재시도하여 실패한 메시지만 골라냄
+    succeeded: List[int] = []
+    for tag, doc in parsed:
+        if rag.add_documents([doc]):
+            succeeded.append(tag)
+        else:
+            failed.append(tag)
+    return succeeded, failed
+
+def settle_batch(ch, succeeded: List[int], failed: List[int], multiple: bool = True) -> None:
+    """
+    실패 메시지는 개별 Nack, 나머지는 가장 큰 tag 기준 multiple ACK로 한 번에 처리.
+    여러 배치가 동시에 진행 중이면(pool 모드) 다른 배치까지 ACK 되지 않도록 multiple=False로 개별 ACK
+    """
+    for tag in failed:
+        ch.basic_nack(delivery_tag=tag, requeue=False)
+    if not succeeded:
+        return
+    if multiple:
+        # 실패분은 이미 Nack 되었으므로 multiple=True는 성공분만 ACK
+        ch.basic_ack(delivery_tag=max(succeeded), multiple=True)
+    else:
+        for tag in succeeded:
+            ch.basic_ack(delivery_tag=tag)
+
+def _collect_batch(connection, deliveries: List[Tuple[int, bytes]]) -> List[Tuple[int, bytes]]:
+    """BATCH_SIZE건이 모이거나 첫 메시지 이후 BATCH_WAIT_MS가 지날 때까지 수신 후 배치 반환"""
+    # 첫 메시지가 올 때까지 대기
+    while not deliveries:
+        connection.process_data_events(time_limit=None)
+
+    deadline = time.monotonic() + BATCH_WAIT_MS / 1000.0
+    while len(deliveries) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        connection.process_data_events(time_limit=remaining)
+
+    batch = deliveries[:BATCH_SIZE]
+    del deliveries[:BATCH_SIZE]
+    print(f" [x] Batch Received: {len(batch)} messages")
+    return batch
+
+def consume_batches(connection, channel) -> None:
+    """BATCH_SIZE건이 모이거나 BATCH_WAIT_MS가 지나면 배치 단위로 처리"""
+    deliveries: List[Tuple[int, bytes]] = []
+
+    def on_message(ch, method, properties, body):
+        deliveries.append((method.delivery_tag, body))
+
+    channel.basic_qos(prefetch_count=BATCH_SIZE)
+    channel.basic_consume(queue=QUEUE_NAME, on_message_callback=on_message)
+
+    while True:
+        batch = _collect_batch(connection, deliveries)
+        succeeded, failed = embed_batch(batch)
+        settle_batch(channel, succeeded, failed)
+        print(f"Batch embedded: ok={len(succeeded)} failed={len(failed)}")
+
+def consume_with_pool(connection, channel) -> None:
+    """
+    pool 모드: 메시지 수신과 ACK/Nack는 pika 연결 스레드에서만 수행하고,
+    임베딩 + ChromaDB 쓰기는 WORKER_CONCURRENCY 크기의 스레드 풀에서 병렬 처리.
+    (pika 채널은 스레드 안전하지 않으므로 완료 통보는 add_callback_threadsafe로 연결 스레드에 위임)
+    """
+    deliveries: List[Tuple[int, bytes]] = []
+    in_flight = 0
+
+    def on_message(ch, method, properties, body):
+        deliveries.append((method.delivery_tag, body))
+
+    def on_settle(succeeded: List[int], failed: List[int]) -> None:
+        nonlocal in_flight
+        settle_batch(channel, succeeded, failed, multiple=False)
+        in_flight -= 1
+        print(f"Batch embedded: ok={len(succeeded)} failed={len(failed)}")
+
+    def on_done(batch: List[Tuple[int, bytes]], future: Future) -> None:
+        try:
+            succeeded, failed = future.result()
+        except Exception as e:
+            print(f" [!] Batch processing error: {e}")
+            succeeded, failed = [], [tag for tag, _ in batch]
+        connection.add_callback_threadsafe(functools.partial(on_settle, succeeded, failed))
+
+    # 모델/클라이언트는 풀 스레드들이 공유 → 연결 스레드에서 미리 1회 초기화
+    get_rag_service()
+
+    channel.basic_qos(prefetch_count=BATCH_SIZE * WORKER_CONCURRENCY)
+    channel.basic_consume(queue=QUEUE_NAME, on_message_callback=on_message)
+
+    with ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY, thread_name_prefix="embed") as executor:
+        while True:
+            # 풀이 가득 차면 완료 콜백(ACK)을 처리하며 대기
+            while in_flight >= WORKER_CONCURRENCY:
+                connection.process_data_events(time_limit=0.1)
+
+            batch = _collect_batch(connection, deliveries)
+            in_flight += 1
+            future = executor.submit(embed_batch, batch)
+            future.add_done_callback(functools.partial(on_done, batch))
+
 def main():
     credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
     
@@ -56,7 +198,14 @@ def main():
     channel = connection.channel()
     channel.queue_declare(queue=QUEUE_NAME, durable=True)
 
-    print(' [*] Worker Ready. Waiting for messages...')
+    print(f' [*] Worker Ready ({WORKER_MODE} mode). Waiting for messages...')
+    if WORKER_MODE == "batch":
+        consume_batches(connection, channel)
+        return
+    if WORKER_MODE == "pool":
+        consume_with_pool(connection, channel)
+        return
+
     channel.basic_qos(prefetch_count=1)
     channel.basic_consume(queue=QUEUE_NAME, on_message_callback=process_message)
     channel.start_consuming()
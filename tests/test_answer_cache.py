@@ -0,0 +1,110 @@
+# Semantic Answer Cache tests
+
+from app.agent.answer_cache import SemanticAnswerCache
+
+# 테스트용 임베딩: 질문별 고정 벡터
+_VECTORS = {
+    "대출 금리 알려줘": [1.0, 0.0, 0.0],
+    "대출 금리 알려주세요": [0.99, 0.05, 0.0],
+    "환율 알려줘": [0.0, 1.0, 0.0],
+    "30년 대출 이자": [0.0, 0.0, 1.0],
+    "20년 대출 이자": [0.0, 0.0, 1.0],
+}
+
+
+def _cache(generation=lambda: "g1", **kwargs):
+    return SemanticAnswerCache(embed=lambda q: _VECTORS[q], generation=generation, **kwargs)
+
+
+def test_similar_question_hits_within_same_scope_and_version():
+    cache = _cache(threshold=0.95)
+    cached, emb = cache.lookup("대출 금리 알려줘", ["doc:read"], "v1")
+    assert cached is None
+    cache.store("대출 금리 알려줘", ["doc:read"], "v1", emb, {"answer": "연 3%"})
+
+    assert cache.lookup("대출 금리 알려주세요", ["doc:read"], "v1")[0] == {"answer": "연 3%"}
+    assert cache.lookup("환율 알려줘", ["doc:read"], "v1")[0] is None
+    # 스코프/레지스트리 버전이 다르면 miss
+    assert cache.lookup("대출 금리 알려줘", ["doc:read", "fin:calc"], "v1")[0] is None
+    assert cache.lookup("대출 금리 알려줘", ["doc:read"], "v2")[0] is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_numbers_ttl_and_ingest_invalidation():
+    generation = {"value": "g1"}
+    cache = _cache(generation=lambda: generation["value"], ttl_sec=600)
+    _, emb = cache.lookup("30년 대출 이자", [], "v1")
+    cache.store("30년 대출 이자", [], "v1", emb, {"answer": "360개월"})
+
+    # 임베딩이 같아도 질문 속 숫자가 다르면 다른 질문
+    assert cache.lookup("20년 대출 이자", [], "v1")[0] is None
+    assert cache.lookup("30년 대출 이자", [], "v1")[0] is not None
+
+    # 문서 적재로 세대가 바뀌면 전체 무효화
+    generation["value"] = "g2"
+    assert cache.lookup("30년 대출 이자", [], "v1")[0] is None
+
+    expired = _cache(ttl_sec=0)
+    _, emb = expired.lookup("환율 알려줘", [], "v1")
+    expired.store("환율 알려줘", [], "v1", emb, {"answer": "1300원"})
+    assert expired.lookup("환율 알려줘", [], "v1")[0] is None
+
+
+def test_graph_caches_only_successful_tool_results(monkeypatch):
+    from app.agent import graph
+    from app.data import rag
+    from app.infra.config import Config
+
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", True)
+    monkeypatch.setattr(rag, "_rag_instance", object())  # 임베딩 모델 로드 완료 상태로 간주
+    monkeypatch.setattr(graph, "_answer_cache", SemanticAnswerCache(embed=lambda q: [1.0, 0.0], generation=lambda: "g1"))
+    user = {"id": "cache_user", "role": "customer", "scopes": []}
+    question = "1억을 연 3%로 10년 대출하면 월 상환액은?"
+
+    first = graph.run_graph(user, question)
+    assert "cache_hit" not in first
+    assert graph.run_graph(user, question)["cache_hit"] is True
+
+    # 캐시 hit도 속도 제한 적용
+    monkeypatch.setattr(graph, "_check_rate_limit", lambda user_id, spec: False)
+    assert graph.run_graph(user, question)["answer"] == "DENY: rate_limit_exceeded"
+
+    # 오류/빈 결과/도구 없는 답변은 캐시하지 않음
+    tool_call = first["tool_call"]
+    assert not graph._cacheable({"tool_call": tool_call, "answer": "ERROR: tool_timeout (doc.search)"})
+    assert not graph._cacheable({"tool_call": tool_call, "tool_result": {"results": []}, "answer": "없음"})
+    assert not graph._cacheable({"tool_call": None, "answer": "안녕하세요"})
+
+
+def test_cache_skipped_until_embedder_ready(monkeypatch):
+    from app.agent import graph
+    from app.data import rag
+    from app.infra.config import Config
+
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", True)
+    monkeypatch.setattr(rag, "_rag_instance", None)
+    state = graph._new_state({"id": "u", "role": "customer", "scopes": []}, "질문")
+    # 모델 로딩을 유발하지 않고 바로 miss
+    assert graph._cache_lookup(state) == (None, None)
+
+
+def test_ingest_generation_is_shared_across_processes(tmp_path, monkeypatch):
+    # worker가 기록한 적재 세대를 별도 프로세스(API 파드)가 같은 저장소에서 읽어야 함
+    from app.data.rag import RAGService
+    from app.data.vector_store import LocalVectorStore
+    from app.infra.config import Config
+
+    monkeypatch.setattr(Config, "INGEST_GENERATION_POLL_SEC", 0.0)
+
+    def _service():
+        service = object.__new__(RAGService)
+        service.state_collection = LocalVectorStore(str(tmp_path))
+        service._generation_cache = None
+        service._generation_checked_at = 0.0
+        return service
+
+    worker, api = _service(), _service()
+    before = api.ingest_generation()
+    worker.mark_ingested()
+    assert api.ingest_generation() != before
+    assert api.ingest_generation() == worker.ingest_generation()
@@ -0,0 +1,44 @@
+# Async Buffered Publisher tests
+
+import asyncio
+
+from app.infra.async_mq import AsyncBufferedPublisher
+
+
+def test_stop_drains_inflight_batch():
+    async def run():
+        publisher = AsyncBufferedPublisher(url="amqp://test/", flush_batch=10, flush_interval_ms=1)
+        sent = []
+
+        async def slow_publish(bodies):
+            await asyncio.sleep(0.05)
+            sent.extend(bodies)
+
+        publisher._publish_batch = slow_publish
+        publisher._flusher = asyncio.create_task(publisher._flush_loop())
+        publisher.offer_many([{"n": i} for i in range(3)])
+        await asyncio.sleep(0.01)
+
+        # 버퍼는 비었어도 발행 중인 배치가 끝날 때까지 대기
+        unpublished = await publisher.stop(drain_timeout=1.0)
+        return unpublished, len(sent)
+
+    assert asyncio.run(run()) == (0, 3)
+
+
+def test_stop_counts_cancelled_inflight_batch(caplog):
+    async def run():
+        publisher = AsyncBufferedPublisher(url="amqp://test/", flush_batch=2, flush_interval_ms=1)
+
+        async def hang(bodies):
+            await asyncio.sleep(10)
+
+        publisher._publish_batch = hang
+        publisher._flusher = asyncio.create_task(publisher._flush_loop())
+        publisher.offer_many([{"n": i} for i in range(5)])
+        await asyncio.sleep(0.01)
+        return await publisher.stop(drain_timeout=0.05)
+
+    # 발행 중이던 배치(2건)도 미발행으로 집계
+    assert asyncio.run(run()) == 5
+    assert "미발행 메시지 5건" in caplog.text
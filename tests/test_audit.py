@@ -0,0 +1,91 @@
+# Audit Pipeline tests
+
+import json
+import threading
+
+from app.platform import audit
+from app.platform.audit import AuditPipeline, RotatingFileAuditSink, build_audit_event, write_audit
+
+
+class ListSink:
+    def __init__(self, block=None):
+        self.batches = []
+        self.block = block
+
+    def write_batch(self, events):
+        if self.block is not None:
+            self.block.wait()
+        self.batches.append(list(events))
+
+    def close(self):
+        pass
+
+
+def test_pipeline_batches_events_in_background():
+    sink = ListSink()
+    pipeline = AuditPipeline(sink, batch_size=50, flush_interval_ms=50)
+    for i in range(120):
+        assert pipeline.submit({"n": i})
+    assert pipeline.flush()
+
+    assert [e["n"] for batch in sink.batches for e in batch] == list(range(120))
+    assert max(len(b) for b in sink.batches) <= 50
+    assert pipeline.stats()["written"] == 120
+    pipeline.close()
+
+
+def test_full_queue_drops_without_blocking():
+    release = threading.Event()
+    pipeline = AuditPipeline(ListSink(block=release), max_queue=5, batch_size=1, flush_interval_ms=1)
+    accepted = sum(pipeline.submit({"n": i}) for i in range(20))
+    # flusher가 1건을 잡고 막혀 있어도 submit은 즉시 반환
+    assert accepted <= 6
+    assert pipeline.stats()["dropped"] == 20 - accepted
+    release.set()
+    pipeline.close()
+
+
+def test_audit_level_controls_payload(monkeypatch):
+    result = {"results": [{"snippet": "연락처 010-1234-5678"}] * 3}
+    full = build_audit_event("t", "u", "doc.search", "PERMIT", params={"q": "a"}, result=result, audit_level="FULL")
+    basic = build_audit_event("t", "u", "doc.search", "PERMIT", params={"q": "a"}, result=result, audit_level="BASIC")
+
+    assert full["result"] is result
+    assert basic["result"] == {"results": {"count": 3}}
+
+    # NONE: PERMIT은 기록 안 함 (큐에도 넣지 않음), DENY는 기록
+    sink = ListSink()
+    pipeline = AuditPipeline(sink)
+    monkeypatch.setattr(audit, "get_audit_pipeline", lambda: pipeline)
+    write_audit(build_audit_event("t", "u", "fin.calc_loan", "PERMIT", audit_level="NONE"))
+    write_audit(build_audit_event("t", "u", "fin.calc_loan", "DENY", reason="rate_limit_exceeded", audit_level="NONE"))
+    pipeline.close()
+    assert [e["decision"] for batch in sink.batches for e in batch] == ["DENY"]
+
+
+def test_pii_is_masked_in_flusher():
+    # 요청 경로는 원본을 큐에 넣기만 하고, 기록되는 이벤트는 마스킹됨
+    sink = ListSink()
+    pipeline = AuditPipeline(sink)
+    result = {"results": [{"snippet": "연락처 010-1234-5678"}]}
+    event = build_audit_event("t", "u", "doc.search", "PERMIT", params={"q": "a@b.com"}, result=result)
+    pipeline.submit(event)
+    pipeline.close()
+
+    written = sink.batches[0][0]
+    assert written["params"] == {"q": "<EMAIL_MASKED>"}
+    assert written["result"]["results"][0]["snippet"] == "연락처 010-****-5678"
+    assert result["results"][0]["snippet"] == "연락처 010-1234-5678"
+
+
+def test_rotating_file_sink(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = RotatingFileAuditSink(str(path), max_bytes=200, backup_count=2)
+    for i in range(10):
+        sink.write_batch([{"n": i, "pad": "x" * 50}])
+    sink.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    last = [json.loads(line)["n"] for line in path.read_text(encoding="utf-8").splitlines()]
+    assert all(n > 5 for n in last)
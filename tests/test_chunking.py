@@ -0,0 +1,33 @@
+# Document Chunking tests
+
+from app.data.chunking import chunk_text, split_sentences
+
+
+def test_split_sentences_korean():
+    text = "기본 이자율은 연 2.5%로 적용된다. 중도해지 시 50%만 적용됩니다!\n최근 금리 동향 요약"
+    assert split_sentences(text) == [
+        "기본 이자율은 연 2.5%로 적용된다.",  # 소수점에서는 분리하지 않음
+        "중도해지 시 50%만 적용됩니다!",
+        "최근 금리 동향 요약",
+    ]
+
+
+def test_chunk_text_respects_size_and_overlap():
+    text = " ".join(f"문장{i}번입니다." for i in range(8))
+    chunks = chunk_text(text, chunk_size=35, overlap=12)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 35 for c in chunks)
+    # 이전 청크의 마지막 문장이 다음 청크의 시작으로 이어짐
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.startswith(prev.split(" ")[-1])
+
+
+def test_short_and_oversized_text():
+    assert chunk_text("짧은 문서", chunk_size=100, overlap=20) == ["짧은 문서"]
+    assert chunk_text("", chunk_size=100, overlap=20) == []
+
+    # 문장 경계가 없는 긴 텍스트는 문자 단위로 분할
+    chunks = chunk_text("가" * 250, chunk_size=100, overlap=20)
+    assert all(len(c) <= 100 for c in chunks)
+    assert "".join(c[20:] if i else c for i, c in enumerate(chunks)) == "가" * 250
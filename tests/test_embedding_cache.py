@@ -0,0 +1,105 @@
+# Query Embedding Cache tests
+
+from app.data import embedding_cache
+from app.data.embedding_cache import QueryEmbeddingCache
+
+MODEL = "paraphrase-MiniLM-L3-v2"
+
+
+def test_hit_after_put_with_normalized_query():
+    cache = QueryEmbeddingCache(max_size=4, ttl_sec=60)
+    assert cache.get(MODEL, "최신 금리") is None
+
+    cache.put(MODEL, "최신 금리", [0.1, 0.2])
+    # 공백 차이는 같은 키로 취급
+    assert cache.get(MODEL, "  최신   금리 ") == [0.1, 0.2]
+    # 모델이 다르면 별도 키
+    assert cache.get("other-model", "최신 금리") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_lru_eviction_and_ttl():
+    cache = QueryEmbeddingCache(max_size=2, ttl_sec=60)
+    cache.put(MODEL, "a", [1.0])
+    cache.put(MODEL, "b", [2.0])
+    cache.get(MODEL, "a")          # a를 최근 사용으로 갱신
+    cache.put(MODEL, "c", [3.0])   # b가 밀려남
+    assert cache.get(MODEL, "b") is None
+    assert cache.get(MODEL, "a") == [1.0]
+
+    expired = QueryEmbeddingCache(max_size=2, ttl_sec=0)
+    expired.put(MODEL, "a", [1.0])
+    assert expired.get(MODEL, "a") is None
+
+
+def test_persistent_store_survives_restart(tmp_path):
+    path = str(tmp_path / "query_cache.sqlite")
+    cache = QueryEmbeddingCache(path=path)
+    cache.put(MODEL, "예금 금리", [0.5, 0.25])
+    cache.flush()
+
+    # 새 인스턴스(재시작된 Pod)에서도 hit
+    restarted = QueryEmbeddingCache(path=path)
+    assert restarted.get(MODEL, "예금 금리") == [0.5, 0.25]
+    assert restarted.stats()["hits"] == 1
+
+
+def test_persistent_store_is_pruned(tmp_path, monkeypatch):
+    import sqlite3
+
+    monkeypatch.setattr(embedding_cache, "_PRUNE_EVERY", 5)
+    path = str(tmp_path / "query_cache.sqlite")
+    cache = QueryEmbeddingCache(max_size=2, path=path, max_rows=3)
+    for i in range(10):
+        cache.put(MODEL, f"q{i}", [float(i)])
+        if i % 5 == 4:
+            cache.flush()
+
+    # max_rows 초과분은 오래된 행부터 삭제
+    rows = [q for (q,) in sqlite3.connect(path).execute("SELECT query FROM query_embeddings ORDER BY created_at")]
+    assert rows == ["q7", "q8", "q9"]
+
+    # 만료 행은 다시 열 때 삭제
+    QueryEmbeddingCache(path=path, ttl_sec=0)
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] == 0
+
+
+def test_put_defers_disk_write_to_background_flush(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "query_cache.sqlite")
+    cache = QueryEmbeddingCache(max_size=1, path=path, flush_interval_sec=3600)
+    cache.put(MODEL, "a", [1.0])
+    cache.put(MODEL, "b", [2.0])  # a는 LRU에서 밀려남
+
+    # put은 커밋하지 않음 → 아직 디스크에 없음
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] == 0
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # 기록 전이라도 같은 인스턴스에서는 조회됨
+    assert cache.get(MODEL, "a") == [1.0]
+
+    cache.flush()
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] == 2
+
+
+def test_embed_queries_reuses_caller_lookup():
+    import numpy as np
+    from types import SimpleNamespace
+
+    from app.data.rag import RAGService
+
+    cache = QueryEmbeddingCache()
+    fake = SimpleNamespace(
+        model_name=MODEL,
+        query_cache=cache,
+        embedding_model=SimpleNamespace(encode=lambda texts: np.ones((len(texts), 2))),
+    )
+
+    # asearch처럼 먼저 조회한 결과를 넘기면 캐시를 다시 조회하지 않음 (miss 1회만 집계)
+    assert cache.get(MODEL, "환율") is None
+    assert RAGService._embed_queries(fake, ["환율"], [None]) == [[1.0, 1.0]]
+    assert cache.stats()["misses"] == 1
+    assert cache.get(MODEL, "환율") == [1.0, 1.0]
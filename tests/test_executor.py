@@ -0,0 +1,95 @@
+# Tool Executor tests
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.service.executor import LatencyHistogram, ToolExecutor, ToolTimeout
+
+
+def _spec(**kw):
+    base = dict(id="t", timeout_ms=1000, retry=2, idempotent=True, hedge=False)
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+def test_retries_only_idempotent_actions():
+    executor = ToolExecutor(backoff_ms=1)
+    calls = []
+
+    def flaky(params):
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("chroma down")
+        return {"ok": True}
+
+    assert executor.run(_spec(), flaky, {}) == {"ok": True}
+    assert executor.stats()["t"]["retries"] == 2
+
+    # 비멱등 도구는 1회만 실행
+    calls.clear()
+    with pytest.raises(ConnectionError):
+        executor.run(_spec(id="pay", idempotent=False), flaky, {})
+    assert len(calls) == 1
+
+
+def test_deadline_raises_tool_timeout():
+    executor = ToolExecutor()
+    with pytest.raises(ToolTimeout):
+        executor.run(_spec(timeout_ms=30), lambda p: time.sleep(0.5) or {}, {})
+    assert executor.stats()["t"]["timeouts"] == 1
+
+
+def test_hedged_request_cuts_tail_latency():
+    executor = ToolExecutor(hedge_min_samples=5)
+    spec = _spec(hedge=True)
+    for _ in range(5):
+        executor.run(spec, lambda p: {}, {})
+
+    # 첫 시도만 느린 도구 → p95(약 1ms) 후 보낸 두 번째 시도가 먼저 끝남
+    first = threading.Event()
+
+    def slow_once(params):
+        if not first.is_set():
+            first.set()
+            time.sleep(0.5)
+            return {"from": "slow"}
+        return {"from": "hedge"}
+
+    start = time.monotonic()
+    assert executor.run(spec, slow_once, {}) == {"from": "hedge"}
+    assert time.monotonic() - start < 0.3
+    assert executor.stats()["t"]["hedged"] == 1
+
+
+def test_async_hedge_and_timeout():
+    executor = ToolExecutor(hedge_min_samples=1)
+    spec = _spec(hedge=True)
+    calls = []
+
+    async def slow_once(params):
+        calls.append(1)
+        await asyncio.sleep(0.5 if len(calls) == 2 else 0)
+        return {"n": len(calls)}
+
+    async def main():
+        await executor.arun(spec, slow_once, {})
+        hedged = await executor.arun(spec, slow_once, {})
+        with pytest.raises(ToolTimeout):
+            await executor.arun(_spec(id="slow", timeout_ms=20), lambda p: asyncio.sleep(1), {})
+        return hedged
+
+    assert asyncio.run(main()) == {"n": 3}
+
+
+def test_histogram_quantiles():
+    h = LatencyHistogram()
+    for ms in [10] * 95 + [1000] * 5:
+        h.observe(ms)
+    # 버킷 상한 근사 (약 19% 이내)
+    assert 10 <= h.quantile(0.5) < 12
+    assert 10 <= h.quantile(0.95) < 12
+    assert 1000 <= h.quantile(0.99) < 1200
@@ -0,0 +1,66 @@
+# Async Graph tests
+
+import asyncio
+from dataclasses import replace
+
+from app.agent import graph
+from app.infra.config import Config
+
+USER = {"id": "u1", "role": "customer", "scopes": []}
+QUESTION = "1억을 연 3%로 10년 대출하면 월 상환액은?"
+
+
+def test_run_graph_async_matches_sync_path(monkeypatch):
+    # 규칙 라우팅 + 답변 템플릿 경로 → LLM/RAG 없이 ainvoke 실행
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "ROUTER_MODE", "tiered")
+
+    out = asyncio.run(graph.run_graph_async(USER, QUESTION))
+    expected = graph.run_graph(USER, QUESTION)
+
+    assert out["tool_call"].action_id == "fin.calc_loan"
+    assert out["tool_result"] == expected["tool_result"]
+    assert out["answer"] == expected["answer"]
+
+
+def test_tool_timeout_uses_registry_timeout_ms(monkeypatch):
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "ROUTER_MODE", "tiered")
+
+    # 도구 상한을 20ms로 줄이고 느린 도구로 교체
+    registry = graph.get_registry()
+    original_get = registry.get
+    monkeypatch.setattr(registry, "get", lambda aid: replace(original_get(aid), timeout_ms=20))
+
+    async def slow_tool(params):
+        await asyncio.sleep(1)
+        return {}
+
+    monkeypatch.setattr(graph, "get_async_tools", lambda: {"fin.calc_loan": slow_tool})
+
+    out = asyncio.run(graph.run_graph_async(USER, QUESTION))
+    assert out["answer"] == "ERROR: tool_timeout (fin.calc_loan)"
+    assert out.get("tool_result") is None
+
+
+def test_doc_search_failure_is_retried_then_error(monkeypatch):
+    from app.service.actions import doc_search
+
+    monkeypatch.setattr(Config, "SEARCH_BATCH_ENABLED", False)
+    monkeypatch.setattr(Config, "HYBRID_SEARCH_ENABLED", False)
+    calls = []
+
+    class BrokenRag:
+        async def asearch(self, query, n_results=5, where=None):
+            calls.append(query)
+            return {"results": [], "error": "chroma down"}
+
+    monkeypatch.setattr(doc_search, "get_rag_service", lambda: BrokenRag())
+
+    # 빈 결과로 숨기지 않고 예외 → 실행기가 재시도 (doc.search: retry 1) → ERROR 답변
+    state = graph._new_state({"id": "u1", "role": "customer", "scopes": ["doc:read"]}, "예금 금리")
+    state.tool_call = graph.ToolCall(action_id="doc.search", params={"query": "예금 금리"})
+    out = asyncio.run(graph._aexecute_tool(state))
+
+    assert out["answer"] == "ERROR: search_failed: chroma down (doc.search)"
+    assert len(calls) == 2
@@ -0,0 +1,21 @@
+# Graph Streaming tests
+
+from app.agent import graph
+from app.infra.config import Config
+
+
+def test_stream_emits_progress_events_in_order(monkeypatch):
+    # 규칙 라우팅 + 답변 템플릿 경로 → LLM/RAG 없이 실행
+    monkeypatch.setattr(Config, "ANSWER_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "ROUTER_MODE", "tiered")
+    user = {"id": "u1", "role": "customer", "scopes": []}
+
+    events = list(graph.run_graph_stream(user, "1억을 연 3%로 10년 대출하면 월 상환액은?"))
+    names = [e["event"] for e in events]
+
+    assert names == ["start", "route", "tool", "token", "done"]
+    assert events[1]["tier"] == "rule"
+    assert events[2]["result"]["monthly_payment"] == 965607.45
+    # token 이벤트를 이어 붙이면 최종 답변과 같음
+    assert events[3]["text"] == events[-1]["answer"]
+    assert events[-1]["trace_id"] == events[0]["trace_id"]
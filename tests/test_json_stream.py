@@ -0,0 +1,34 @@
+# Streaming JSON Reader tests
+
+import json
+
+from app.data.json_stream import iter_json_records
+
+DOCS = [{"id": f"DOC_{i}", "content": "금리 " * i + "],[{", "metadata": {"grade": "A"}} for i in range(50)]
+
+
+def test_json_array_is_parsed_incrementally(tmp_path):
+    path = tmp_path / "docs.json"
+    path.write_text(json.dumps(DOCS, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    # 작은 chunk_size로 원소가 버퍼 경계에 걸쳐도 동일하게 파싱되어야 함
+    assert list(iter_json_records(str(path), chunk_size=7)) == DOCS
+
+
+def test_jsonl_is_parsed_line_by_line(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    lines = [json.dumps(d, ensure_ascii=False) for d in DOCS]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+
+    assert list(iter_json_records(str(path), chunk_size=16)) == DOCS
+
+
+def test_unterminated_array_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('[{"id": "DOC_1"},', encoding="utf-8")
+
+    try:
+        list(iter_json_records(str(path), chunk_size=4))
+        assert False, "JSONDecodeError가 발생해야 함"
+    except json.JSONDecodeError:
+        pass
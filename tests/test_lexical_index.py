@@ -0,0 +1,123 @@
+# Lexical (BM25) Index tests
+
+import os
+
+from app.data.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+
+def _meta(parent_id, **extra):
+    return {"parent_id": parent_id, "title": parent_id, **extra}
+
+
+def test_tokenize_korean_bigrams_and_codes():
+    assert tokenize("정기예금 LN-2024") == ["정기", "기예", "예금", "ln", "2024"]
+    # 조사가 붙어도 앞부분 2-gram은 동일
+    assert set(tokenize("예금")) <= set(tokenize("예금은"))
+
+
+def test_search_exact_term_and_where_filter():
+    index = LexicalIndex()
+    index.add(
+        ["a", "b", "c"],
+        ["상품코드 FX-301 외화예금 안내", "정기예금 금리 안내", "대출 금리 FX-301 우대"],
+        [_meta("a", status="active"), _meta("b", status="active"), _meta("c", status="inactive")],
+    )
+
+    ids = [r["metadata"]["parent_id"] for r in index.search("FX-301", n_results=5)]
+    assert set(ids) == {"a", "c"}
+
+    ids = [r["metadata"]["parent_id"] for r in index.search("FX-301", where={"status": {"$eq": "active"}})]
+    assert ids == ["a"]
+
+
+def test_reingest_replaces_chunks_and_persists(tmp_path):
+    path = str(tmp_path / "lexical.json")
+    index = LexicalIndex(path)
+    index.add(["d#0", "d#1"], ["첫 번째 청크 금리", "두 번째 청크 금리"], [_meta("d"), _meta("d")])
+
+    # 문서 변경 시 이전 청크는 parent_id 기준으로 제거
+    index.remove_parents(["d"])
+    index.add(["d"], ["변경된 환율 문서"], [_meta("d")])
+    assert index.search("금리") == []
+    index.save()
+
+    reloaded = LexicalIndex(path)
+    assert [r["content"] for r in reloaded.search("환율")] == ["변경된 환율 문서"]
+
+    # 다른 프로세스의 변경은 저널 추가분만 읽어 반영 (스냅샷은 다시 쓰지 않음)
+    snapshot_mtime = os.path.getmtime(path)
+    other = LexicalIndex(path)
+    other.add(["e"], ["신규 외화 문서"], [_meta("e")])
+    other.save()
+    assert os.path.getmtime(path) == snapshot_mtime
+    reloaded.refresh()
+    assert [r["metadata"]["parent_id"] for r in reloaded.search("외화")] == ["e"]
+
+    # 스냅샷이 교체되면 전체 재로딩
+    other.remove_parents(["d"])
+    other.compact()
+    os.utime(path, (0, 12345))
+    reloaded.refresh()
+    assert reloaded.search("환율") == []
+    assert len(reloaded) == 1
+
+
+def test_journal_compacts_and_refreshes_in_background(tmp_path, monkeypatch):
+    import time
+
+    from app.data import lexical_index
+
+    monkeypatch.setattr(lexical_index, "_COMPACT_MIN_OPS", 3)
+    path = str(tmp_path / "lexical.json")
+    writer = LexicalIndex(path)
+    reader = LexicalIndex(path, refresh_interval_sec=0.01)
+
+    for i in range(3):
+        writer.add([f"d{i}"], [f"금리 문서 {i}"], [_meta(f"d{i}")])
+        writer.save()
+    # 첫 저장은 스냅샷, 이후는 저널 append (임계값 이하)
+    assert os.path.getsize(writer.journal_path) > 0
+
+    # 같은 문서 재적재가 쌓여 저널 건수가 임계값과 색인 크기를 넘으면 스냅샷으로 압축
+    writer.add(["d0", "d1", "d2"], ["금리 변경 0", "금리 변경 1", "금리 변경 2"], [_meta(f"d{i}") for i in range(3)])
+    writer.save()
+    assert os.path.getsize(writer.journal_path) == 0
+    assert len(LexicalIndex(path)) == 3
+
+    # 검색은 파일을 기다리지 않고, 백그라운드 갱신 후 반영
+    time.sleep(0.02)
+    reader.search("금리")
+    for _ in range(100):
+        if reader.search("변경"):
+            break
+        time.sleep(0.01)
+    assert len(reader.search("변경")) == 3
+
+
+def test_reciprocal_rank_fusion():
+    vector = [{"metadata": _meta("a")}, {"metadata": _meta("b")}]
+    lexical = [{"metadata": _meta("c")}, {"metadata": _meta("b")}]
+
+    fused = reciprocal_rank_fusion([vector, lexical], k=60, limit=3)
+    # 두 목록 모두에 있는 b가 최상위
+    assert [r["metadata"]["parent_id"] for r in fused] == ["b", "a", "c"]
+
+
+def test_multiple_writers_do_not_overwrite_each_other(tmp_path):
+    path = str(tmp_path / "lexical.json")
+    first, second = LexicalIndex(path), LexicalIndex(path)
+
+    first.add(["a"], ["금리 문서 a"], [_meta("a")])
+    second.add(["b"], ["금리 문서 b"], [_meta("b")])
+    first.save()
+    second.save()
+
+    # 다른 writer가 스냅샷으로 압축한 뒤에도 미저장 변경은 유지
+    second.add(["c"], ["금리 문서 c"], [_meta("c")])
+    first.compact()
+    second.save()
+    second.compact()
+
+    parents = {r["metadata"]["parent_id"] for r in LexicalIndex(path).search("금리", n_results=10)}
+    assert parents == {"a", "b", "c"}
+    assert os.path.exists(f"{path}.lock")
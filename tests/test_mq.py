@@ -0,0 +1,59 @@
+# MQ Publisher pool tests
+
+import pytest
+
+from app.infra import mq
+from app.infra.mq import MQPublisher, PublishError
+
+
+class FakeChannel:
+    def __init__(self, params, queue_name, fail=None):
+        self.fail = fail
+        self.closed = False
+        self.connection = self
+        self.channel = self
+
+    @property
+    def is_open(self):
+        return not self.closed
+
+    def process_data_events(self, time_limit=0):
+        pass
+
+    def basic_publish(self, **kwargs):
+        if self.fail is not None:
+            raise self.fail
+
+    def close(self):
+        self.closed = True
+
+
+def test_unexpected_error_discards_channel(monkeypatch):
+    created = []
+
+    def factory(params, queue_name):
+        created.append(FakeChannel(params, queue_name, fail=TypeError("bad body")))
+        return created[-1]
+
+    monkeypatch.setattr(mq, "_PooledChannel", factory)
+    publisher = MQPublisher(pool_size=1, acquire_timeout_sec=0.1)
+
+    # 예상하지 못한 예외도 채널을 풀 슬롯과 함께 반납 (누수 없음)
+    with pytest.raises(TypeError):
+        publisher.publish({"n": 1})
+    assert created[0].closed
+    assert publisher._created == 0
+
+
+def test_acquire_times_out_when_pool_exhausted(monkeypatch):
+    monkeypatch.setattr(mq, "_PooledChannel", FakeChannel)
+    publisher = MQPublisher(pool_size=1, acquire_timeout_sec=0.05)
+    held = publisher._acquire()
+
+    # 풀이 가득 차 있으면 무한 대기하지 않고 mq_unavailable
+    with pytest.raises(PublishError) as e:
+        publisher.publish({"n": 1})
+    assert e.value.reason == "mq_unavailable"
+
+    publisher._release(held)
+    publisher.publish({"n": 2})
@@ -0,0 +1,49 @@
+# PII Masking tests
+
+import re
+
+from app.platform.pii import PIIMasker
+from app.platform.policy import _sanitize_params
+
+
+def _legacy_mask(text):
+    # 기존 4회 re.sub 구현 (결과 비교용)
+    text = re.sub(r'(\d{6})-(\d{7})', r'\1-*******', text)
+    text = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', '<EMAIL_MASKED>', text)
+    text = re.sub(r'(01[0-9])-?(\d{4})-?(\d{4})', r'\1-****-\3', text)
+    text = re.sub(r'(\d{4})-(\d{4})-(\d{4})-(\d{4})', r'\1-****-****-\4', text)
+    return text
+
+
+SAMPLES = [
+    "내 전화번호는 010-1234-5678 이고, 메일은 test@example.com 입니다.",
+    "주민번호 900101-1234567, 카드 1234-5678-9999-4321 로 결제",
+    "연락처 01098765432 / 011-222-3333 / kim.lee-01@bank.co.kr",
+    "정기예금 금리 3.5%, 2024-01-01 시행, 상품코드 DEP-2024-001",
+    "",
+]
+
+
+def test_single_pass_matches_legacy_masking():
+    masker = PIIMasker()
+    for text in SAMPLES:
+        assert masker.mask(text) == _legacy_mask(text)
+    assert masker.mask_many(SAMPLES) == [_legacy_mask(t) for t in SAMPLES]
+
+
+def test_overlapping_rules_mask_whole_card_number():
+    # 기존 순차 방식은 카드번호 안의 '012-3456-7890'을 전화번호로 먼저 바꿔 뒷자리가 남았음
+    assert PIIMasker().mask("카드 4012-3456-7890-1234") == "카드 4012-****-****-1234"
+
+
+def test_nested_params_and_results_are_masked():
+    params = {
+        "query": "010-1234-5678 고객 문의",
+        "top_k": 5,
+        "filters": {"owner": "a@b.com", "tags": ["900101-1234567", 3]},
+    }
+    assert _sanitize_params(params) == {
+        "query": "010-****-5678 고객 문의",
+        "top_k": 5,
+        "filters": {"owner": "<EMAIL_MASKED>", "tags": ["900101-*******", 3]},
+    }
@@ -0,0 +1,92 @@
+# Rate Limit tests
+
+from types import SimpleNamespace
+
+from app.platform.rate_limit import MemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend
+
+
+class FakeRedis:
+    """테스트용 최소 Redis (pipeline + incr/expire/get/decr)"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+    def decr(self, key):
+        self.data[key] = self.data.get(key, 0) - 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds
+        return True
+
+    def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value).encode()
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.ops]
+
+
+def _hits(backend, n, now, limit=10, window=60):
+    return sum(backend.hit("u1:doc.search", limit, window, now) for _ in range(n))
+
+
+def test_sliding_window_weights_previous_window():
+    for backend in (MemoryRateLimitBackend(), RedisRateLimitBackend(FakeRedis())):
+        assert _hits(backend, 15, now=60.0) == 10
+        # 다음 윈도우 절반 지점: 이전 10건 × 0.5 = 5 → 5건 더 허용
+        assert _hits(backend, 10, now=150.0) == 5
+        # 두 윈도우 이상 지나면 초기화
+        assert _hits(backend, 15, now=300.0) == 10
+
+
+def test_memory_backend_evicts_idle_keys():
+    backend = MemoryRateLimitBackend(max_keys=1000)
+    for i in range(500):
+        backend.hit(f"user{i}:a", 10, 60, now=0.0)
+    assert len(backend) == 500
+    # 2 윈도우 이상 유휴였던 키는 다음 호출 시 제거
+    backend.hit("fresh:a", 10, 60, now=1000.0)
+    assert len(backend) == 1
+
+    capped = MemoryRateLimitBackend(max_keys=100)
+    for i in range(500):
+        capped.hit(f"user{i}:a", 10, 60, now=0.0)
+    assert len(capped) == 100
+
+
+def test_limiter_uses_spec_limits_per_action():
+    limiter = RateLimiter(MemoryRateLimitBackend(), default_limit=2)
+    search = SimpleNamespace(id="doc.search", rate_limit={"limit": 3, "window_sec": 60})
+    loan = SimpleNamespace(id="fin.calc_loan")
+
+    assert [limiter.allow("u1", search) for _ in range(4)] == [True, True, True, False]
+    # 다른 action은 독립 한도 (기본값 2)
+    assert [limiter.allow("u1", loan) for _ in range(3)] == [True, True, False]
+
+
+def test_limiter_falls_back_when_shared_backend_fails():
+    class Broken:
+        def hit(self, *args):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(Broken(), default_limit=2)
+    spec = SimpleNamespace(id="doc.search")
+    assert [limiter.allow("u1", spec) for _ in range(3)] == [True, True, False]
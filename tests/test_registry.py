@@ -0,0 +1,66 @@
+# Action Registry tests
+
+import os
+import shutil
+import time
+
+from app.service.registry import ActionRegistry
+
+REGISTRY_PATH = "app/service/actions/registry.yaml"
+
+NEW_ACTION = """
+  - id: fx.rate
+    description: "환율 조회"
+    scopes_required: []
+    input_schema:
+      type: object
+      required: ["currency"]
+      properties:
+        currency: { type: string }
+"""
+
+
+def _bump_mtime(path):
+    # 같은 초 안의 수정도 감지되도록 mtime을 명시적으로 증가
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_hot_reload_swaps_snapshot_and_bumps_version(tmp_path):
+    path = tmp_path / "registry.yaml"
+    shutil.copy(REGISTRY_PATH, path)
+    registry = ActionRegistry(str(path), reload_interval_sec=0.001)
+    before = registry.snapshot()
+    assert before.revision == 1
+    assert "fin.calc_loan" in before.tools_desc
+
+    # 내용이 같으면(touch) 버전 유지
+    _bump_mtime(path)
+    assert registry.maybe_reload() is False
+    assert registry.version == before.version
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(NEW_ACTION)
+    _bump_mtime(path)
+    time.sleep(0.01)  # reload_interval_sec 경과 후 조회 시 자동 확인
+    after = registry.snapshot()
+
+    assert after.revision == 2
+    assert after.version.startswith("2:")
+    assert registry.get("fx.rate").input_validator({"currency": "USD"}) == {"currency": "USD"}
+    assert "- fx.rate: 환율 조회 (필수 매개변수: currency)" in after.tools_desc
+    # 이전 snapshot은 그대로 (진행 중 요청은 한 버전만 봄)
+    assert before.get("fx.rate") is None
+
+
+def test_broken_yaml_keeps_previous_version(tmp_path):
+    path = tmp_path / "registry.yaml"
+    shutil.copy(REGISTRY_PATH, path)
+    registry = ActionRegistry(str(path))
+    version = registry.version
+
+    path.write_text("actions: [", encoding="utf-8")
+    _bump_mtime(path)
+    assert registry.maybe_reload() is False
+    assert registry.version == version
+    assert registry.get("doc.search") is not None
@@ -0,0 +1,61 @@
+# Retrieval Policy tests
+
+from app.data.retrieval_policy import RetrievalPolicy, match_where, to_epoch
+
+
+def test_to_epoch():
+    assert to_epoch("2024-01-01") == 1704067200
+    assert to_epoch("") is None
+    assert to_epoch("2024/01/01") is None
+
+
+def test_build_where_defaults_to_active():
+    # status 없이 적재된 기존 문서도 active로 간주 (inactive만 제외)
+    where = RetrievalPolicy().build_where({})
+    assert where == {"status": {"$ne": "inactive"}}
+    assert RetrievalPolicy().build_where({"status": "active"}) == where
+
+    assert match_where({"status": "active"}, where)
+    assert match_where({"title": "기존 문서"}, where)
+    assert not match_where({"status": "inactive"}, where)
+    assert not match_where({"title": "기존 문서"}, {"status": {"$eq": "inactive"}})
+
+
+def test_build_where_combines_status_and_effective_after():
+    where = RetrievalPolicy().build_where({"status": "inactive", "effective_after": "2024-01-01"})
+    assert where == {"$and": [
+        {"status": {"$eq": "inactive"}},
+        {"effective_ts": {"$gte": 1704067200}},
+    ]}
+
+    # 날짜 형식이 잘못되면 범위 조건은 생략
+    assert RetrievalPolicy().build_where({"effective_after": "어제"}) == {"status": {"$ne": "inactive"}}
+
+
+def test_score_documents_matches_single_document_scoring():
+    import datetime as dt
+
+    today = dt.date.today()
+    docs = [
+        {"title": "공지", "snippet": "", "metadata": {"grade": "U"}},
+        {"title": "기타", "snippet": "대출 금리", "metadata": {"grade": "C", "effective_date": "2000-01-01"}},
+        {"title": "대출 금리 안내", "snippet": "", "metadata": {"grade": "A", "effective_date": today.isoformat()}},
+        {"title": "금리", "snippet": "", "metadata": {"grade": "B", "effective_date": "2999-01-01"}},
+    ]
+    policy = RetrievalPolicy(min_score_threshold=0.4)
+    expected = [round(policy.score_document(d, "대출 금리"), 3) for d in docs]
+
+    ranked = policy.score_documents([dict(d) for d in docs], "대출 금리", today=today)
+
+    # 개별 점수화와 같은 점수, 임계값 이상만 내림차순
+    assert [r["_score"] for r in ranked] == sorted((s for s in expected if s >= 0.4), reverse=True)
+    assert ranked[0]["title"] == "대출 금리 안내"
+
+
+def test_score_documents_uses_ingested_timestamp():
+    import datetime as dt
+
+    today = dt.date(2024, 12, 31)
+    doc = {"title": "금리", "metadata": {"grade": "A", "effective_ts": to_epoch("2024-12-31")}}
+    # effective_date 문자열 없이도 최신성 1.0 → 0.2*0.5 + 0.3*1.0 + 0.2*1.0
+    assert RetrievalPolicy().score_documents([doc], "무관", today=today)[0]["_score"] == 0.6
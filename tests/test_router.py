@@ -0,0 +1,83 @@
+# Tiered Router tests
+
+from app.service.registry import ActionRegistry
+from app.service.router import TieredRouter, ToolRouter
+
+REGISTRY_PATH = "app/service/actions/registry.yaml"
+
+
+def test_rule_tier_extracts_loan_params():
+    router = ToolRouter(ActionRegistry(REGISTRY_PATH))
+
+    tc = router.route("3억 5천만원을 연 4.5%로 30년 대출하면 월 상환액은?")
+    assert tc.action_id == "fin.calc_loan"
+    assert tc.params == {"principal": 350000000.0, "annual_rate": 4.5, "months": 360}
+
+    # 파라미터가 부족하면 대출 계산으로 확정하지 않음 (명시적 검색 키워드가 있으면 검색)
+    assert router.route("대출 금리 검색해줘").action_id == "doc.search"
+    assert router.route("대출 금리 알려줘") is None
+    assert router.route("안녕하세요") is None
+
+    # 달력 연도는 대출 기간이 아님
+    assert router.route("2024년에 1억을 연 3%로 대출하면?") is None
+    tc = router.route("2024년에 1억을 연 3%로 10년 대출하면?")
+    assert tc.params["months"] == 120
+
+
+def test_semantic_tier_and_llm_fallback_stats():
+    registry = ActionRegistry(REGISTRY_PATH)
+
+    # 테스트용 임베딩: 대출/예금 관련 단어면 doc.search 예시와 가깝게
+    def fake_embed(texts):
+        vectors = []
+        for t in texts:
+            if "문서" in t or "예금" in t or "금리" in t or "안내" in t:
+                vectors.append([1.0, 0.0, 0.0])
+            elif "상환" in t or "대출" in t:
+                vectors.append([0.0, 1.0, 0.0])
+            else:
+                vectors.append([0.0, 0.0, 1.0])
+        return vectors
+
+    router = TieredRouter(registry, embed=fake_embed, threshold=0.6, margin=0.05)
+    router.warm_up()
+
+    tc, tier = router.route("정기예금 중도해지 이자율은?")
+    assert (tc.action_id, tier) == ("doc.search", "semantic")
+
+    # 확신이 없으면 LLM 단계로 위임
+    tc, tier = router.route("오늘 기분이 어때?")
+    assert (tc, tier) == (None, "llm")
+    router.record_llm()
+
+    tc, tier = router.route("검색해줘 예금")
+    assert tier == "rule"
+
+    stats = router.stats()
+    assert stats["hits"] == {"rule": 1, "semantic": 1, "llm": 1}
+    assert stats["hit_rate"]["llm"] == 0.333
+
+
+def test_semantic_tier_never_loads_model_on_request_path():
+    import time
+
+    registry = ActionRegistry(REGISTRY_PATH)
+    calls = []
+
+    def fake_embed(texts):
+        calls.append(len(texts))
+        return [[1.0, 0.0] for _ in texts]
+
+    # 모델 미로드 → 임베딩 호출 없이 바로 LLM 단계
+    router = TieredRouter(registry, embed=fake_embed, ready=lambda: False)
+    assert router.route("정기예금 중도해지 이자율은?") == (None, "llm")
+    assert calls == []
+
+    # 로드됐어도 예시 임베딩이 없으면 요청은 기다리지 않고 LLM 단계, 계산은 백그라운드
+    router = TieredRouter(registry, embed=fake_embed, ready=lambda: True)
+    assert router.route("오늘 기분이 어때?") == (None, "llm")
+    for _ in range(100):
+        if router._exemplars is not None:
+            break
+        time.sleep(0.01)
+    assert router._exemplars is not None
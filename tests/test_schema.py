@@ -0,0 +1,52 @@
+# Schema Validation tests
+
+import pytest
+
+from app.platform.policy import Deny, enforce
+from app.common.types import UserContext
+from app.service.registry import ActionRegistry
+from app.service.schema import SchemaError, compile_schema
+
+REGISTRY = ActionRegistry("app/service/actions/registry.yaml")
+USER = UserContext(id="schema_tester", role="analyst", scopes=["doc:read"])
+
+
+def test_input_defaults_and_llm_coercion():
+    spec = REGISTRY.get("doc.search")
+    assert spec.input_validator is not None
+
+    params = spec.input_validator({"query": "금리", "top_k": None, "filters": {"status": "active"}})
+    assert params["top_k"] == 5
+
+    # function calling 인자는 정수도 float으로 올 수 있음
+    loan = REGISTRY.get("fin.calc_loan").input_validator({"principal": 1e8, "annual_rate": "3.5", "months": 360.0})
+    assert loan == {"principal": 1e8, "annual_rate": 3.5, "months": 360}
+    assert isinstance(loan["months"], int)
+
+
+@pytest.mark.parametrize("params, reason", [
+    ({"query": "금리", "top_k": 500}, "out_of_range: key=top_k, value=500, maximum=20"),
+    ({"query": ""}, "too_short: key=query, minLength=1"),
+    ({"query": 3}, "type_mismatch: key=query, expected=string, got=int"),
+    ({"query": "금리", "filters": {"status": "deleted"}}, "value_not_allowed: key=filters.status"),
+    ({"top_k": 3}, "missing_required_field: query"),
+])
+def test_enforce_rejects_invalid_params(params, reason):
+    with pytest.raises(Deny) as e:
+        enforce(USER, REGISTRY.get("doc.search"), params)
+    assert e.value.reason.startswith(f"schema_invalid: {reason}")
+
+
+def test_output_schema_checks_nested_items():
+    validate = REGISTRY.get("doc.search").output_validator
+    ok = {"results": [{"doc_id": "d1", "title": "t", "snippet": "s", "metadata": {}}]}
+    assert validate(ok) == ok
+
+    with pytest.raises(SchemaError) as e:
+        validate({"results": [{"doc_id": "d1", "title": "t", "snippet": "s"}]})
+    assert e.value.reason == "missing_required_field: results[0].metadata"
+
+    # 입력 dict는 변경하지 않음
+    raw = {"a": None}
+    compile_schema({"properties": {"a": {"type": "integer", "default": 1}}})(raw)
+    assert raw == {"a": None}
@@ -0,0 +1,130 @@
+# Search Micro-Batcher tests
+
+import asyncio
+import threading
+
+from app.data.search_batcher import SearchBatcher
+
+
+def test_concurrent_searches_are_batched():
+    calls = []
+
+    def fake_search_many(queries, n_results, where=None):
+        calls.append((list(queries), n_results))
+        return [{"results": [], "query": q} for q in queries]
+
+    batcher = SearchBatcher(fake_search_many, window_ms=50, max_batch=8)
+    outputs = {}
+
+    def worker(q):
+        outputs[q] = batcher.search(q, n_results=3)
+
+    threads = [threading.Thread(target=worker, args=(f"q{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 각 요청은 자신의 결과를 받고, search_many 호출 수는 요청 수보다 적어야 함
+    assert {q: r["query"] for q, r in outputs.items()} == {f"q{i}": f"q{i}" for i in range(4)}
+    assert sum(len(qs) for qs, _ in calls) == 4
+    assert len(calls) < 4
+
+
+def test_failure_is_propagated_to_callers():
+    def failing_search_many(queries, n_results, where=None):
+        raise RuntimeError("chroma down")
+
+    batcher = SearchBatcher(failing_search_many, window_ms=1)
+    try:
+        batcher.search("금리")
+        assert False, "예외가 전달되어야 함"
+    except RuntimeError as e:
+        assert "chroma down" in str(e)
+
+
+def test_requests_are_grouped_by_where_filter():
+    calls = []
+
+    def fake_search_many(queries, n_results, where=None):
+        calls.append((sorted(queries), where))
+        return [{"results": [], "query": q} for q in queries]
+
+    batcher = SearchBatcher(fake_search_many, window_ms=50, max_batch=8)
+    active = {"status": {"$eq": "active"}}
+    args = [("a", active), ("b", active), ("c", None)]
+    threads = [threading.Thread(target=batcher.search, args=(q, 5, w)) for q, w in args]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 필터가 다른 요청은 같은 질의로 묶이지 않음
+    assert sorted(calls, key=lambda c: c[0]) == [(["a", "b"], active), (["c"], None)]
+
+
+def test_async_searches_share_the_batch():
+    calls = []
+
+    def fake_search_many(queries, n_results, where=None):
+        calls.append(list(queries))
+        return [{"results": [], "query": q} for q in queries]
+
+    batcher = SearchBatcher(fake_search_many, window_ms=50, max_batch=8)
+
+    async def run():
+        return await asyncio.gather(*(batcher.asearch(f"q{i}", n_results=3) for i in range(4)))
+
+    # 이벤트 루프의 동시 요청도 같은 배치 큐로 묶임
+    outputs = asyncio.run(run())
+    assert [r["query"] for r in outputs] == [f"q{i}" for i in range(4)]
+    assert len(calls) == 1
+
+
+def test_stalled_batch_times_out_with_search_error():
+    from app.service.actions.doc_search import SearchError
+
+    release = threading.Event()
+
+    def stalled_search_many(queries, n_results, where=None):
+        release.wait(5)
+        return [{"results": []} for _ in queries]
+
+    batcher = SearchBatcher(stalled_search_many, window_ms=1, timeout_ms=50)
+    try:
+        # 동기/비동기 모두 무한 대기 대신 SearchError로 실패 (실행기 재시도 대상)
+        for call in (lambda: batcher.search("금리"), lambda: asyncio.run(batcher.asearch("환율"))):
+            try:
+                call()
+                assert False, "시간 초과 예외가 발생해야 함"
+            except SearchError as e:
+                assert e.reason == "search_timeout"
+    finally:
+        release.set()
+
+
+def test_get_search_batcher_creates_single_instance(monkeypatch):
+    import time
+
+    from app.data import rag, search_batcher
+
+    created = []
+
+    def slow_service():
+        created.append(1)
+        time.sleep(0.05)
+        return type("FakeRAG", (), {"search_many": staticmethod(lambda queries, n_results, where=None: [])})()
+
+    monkeypatch.setattr(search_batcher, "_batcher_instance", None)
+    monkeypatch.setattr(rag, "get_rag_service", slow_service)
+
+    instances = []
+    threads = [threading.Thread(target=lambda: instances.append(search_batcher.get_search_batcher())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 동시 첫 호출에도 배처는 하나만 생성
+    assert len(created) == 1
+    assert all(b is instances[0] for b in instances)
@@ -0,0 +1,59 @@
+# Native Tool Calling tests
+
+from langchain_core.messages import AIMessage
+
+from app.infra.llm import LLMClient, to_function_tool
+from app.service.registry import ActionRegistry
+
+REGISTRY_PATH = "app/service/actions/registry.yaml"
+
+
+class _FakeChat:
+    """bind_tools/invoke만 흉내내는 테스트용 채팅 모델"""
+
+    def __init__(self, response):
+        self.response = response
+        self.bound_tools = None
+
+    def bind_tools(self, tools):
+        self.bound_tools = tools
+        return self
+
+    def invoke(self, messages):
+        return self.response
+
+
+def _client(response, monkeypatch):
+    # 실제 Gemini 클라이언트 대신 가짜 모델 주입
+    monkeypatch.setattr("langchain_google_genai.ChatGoogleGenerativeAI", lambda **kwargs: _FakeChat(response))
+    return LLMClient()
+
+
+def test_function_tool_names_are_mapped_back_to_action_ids(monkeypatch):
+    registry = ActionRegistry(REGISTRY_PATH)
+    specs = [registry.get(aid) for aid in registry.list_ids()]
+    tool = to_function_tool(registry.get("doc.search"))
+    assert tool["function"]["name"] == "doc_search"
+    assert tool["function"]["parameters"]["required"] == ["query"]
+
+    response = AIMessage(content="", tool_calls=[{"name": "fin_calc_loan", "args": {"principal": 1000, "annual_rate": 3, "months": 12}, "id": "1"}])
+    proposal, answer = _client(response, monkeypatch).select_tool("1000원 3% 12개월", specs, version=registry.version)
+    assert proposal == {"action_id": "fin.calc_loan", "params": {"principal": 1000, "annual_rate": 3, "months": 12}}
+    assert answer is None
+
+
+def test_no_tool_returns_answer_in_same_call(monkeypatch):
+    registry = ActionRegistry(REGISTRY_PATH)
+    specs = [registry.get(aid) for aid in registry.list_ids()]
+    proposal, answer = _client(AIMessage(content="안녕하세요!"), monkeypatch).select_tool("안녕", specs)
+    assert proposal is None
+    assert answer == "안녕하세요!"
+
+
+def test_loan_answer_template():
+    spec = ActionRegistry(REGISTRY_PATH).get("fin.calc_loan")
+    text = spec.answer_template.format(
+        principal=200000000, annual_rate=4.5, months=360,
+        monthly_payment=1013370.62, total_interest=164813423.07
+    )
+    assert "월 상환액은 약 1,013,371원" in text
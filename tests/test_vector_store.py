@@ -0,0 +1,108 @@
+# Local Vector Store tests
+
+import numpy as np
+
+from app.data.vector_store import LocalVectorStore
+
+
+def _clustered(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    return (centers[rng.integers(0, 20, n)] + rng.normal(scale=0.2, size=(n, dim))).astype(np.float32)
+
+
+def test_add_query_where_and_upsert(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    vectors = np.eye(4, dtype=np.float32)
+    store.add(
+        ["a", "b", "c", "d"],
+        vectors.tolist(),
+        ["문서A", "문서B", "문서C", "문서D"],
+        [{"status": "active", "ts": i} for i in range(4)],
+    )
+
+    result = store.query([vectors[1].tolist()], n_results=2)
+    assert result["ids"][0][0] == "b"
+    assert result["distances"][0][0] == 0.0
+
+    # ChromaDB where 절 지원
+    result = store.query([vectors[1].tolist()], n_results=4, where={"ts": {"$gte": 2}})
+    assert sorted(result["ids"][0]) == ["c", "d"]
+
+    # 키가 없는 문서는 ChromaDB처럼 $ne/$nin만 만족
+    store.add(["e"], [vectors[0].tolist()], ["기존 문서"], [{"ts": 9}])
+    result = store.query([vectors[0].tolist()], n_results=5, where={"status": {"$ne": "inactive"}})
+    assert "e" in result["ids"][0]
+    result = store.query([vectors[0].tolist()], n_results=5, where={"status": {"$eq": "active"}})
+    assert "e" not in result["ids"][0]
+    store.delete(ids=["e"])
+
+    # upsert는 교체, delete는 제외, add는 기존 id 무시
+    store.upsert(["b"], [vectors[3].tolist()], ["변경"], [{"status": "active", "ts": 1}])
+    store.add(["a"], [vectors[3].tolist()], ["무시"], [{}])
+    store.delete(where={"ts": {"$eq": 3}})
+    assert store.count() == 3
+    assert store.query([vectors[3].tolist()], n_results=1)["documents"][0] == ["변경"]
+    assert store.get(ids=["a"])["documents"] == ["문서A"]
+
+
+def test_ivf_index_and_shared_reader(tmp_path):
+    vectors = _clustered(3000)
+    writer = LocalVectorStore(str(tmp_path), nprobe=4, ivf_min_rows=1000)
+    for i in range(0, 3000, 500):
+        writer.add([f"v{j}" for j in range(i, i + 500)], vectors[i:i + 500].tolist(), [""] * 500, [{}] * 500)
+    assert (tmp_path / "centroids.npy").exists()
+
+    # 다른 프로세스처럼 별도 인스턴스로 읽어도 같은 결과 (파일 공유)
+    reader = LocalVectorStore(str(tmp_path), nprobe=4)
+    queries = vectors[:20]
+    exact = np.argsort(((vectors[None] - queries[:, None]) ** 2).sum(-1), axis=1)[:, :5]
+    result = reader.query(queries.tolist(), n_results=5)
+    recall = np.mean([
+        len({f"v{j}" for j in e} & set(ids)) / 5 for e, ids in zip(exact, result["ids"])
+    ])
+    assert recall >= 0.9
+
+    writer.add(["new"], [vectors[0].tolist()], ["신규"], [{}])
+    assert "new" in reader.query([vectors[0].tolist()], n_results=2)["ids"][0]
+
+
+def test_ivf_applies_where_to_probed_rows_only(tmp_path):
+    vectors = _clustered(3000, seed=1)
+    store = LocalVectorStore(str(tmp_path), nprobe=4, ivf_min_rows=1000)
+    metadatas = [{"group": j % 2, **({"rare": 1} if j in (7, 1500) else {})} for j in range(3000)]
+    store.add([f"v{j}" for j in range(3000)], vectors.tolist(), [""] * 3000, metadatas)
+
+    statements = []
+    store._db.set_trace_callback(statements.append)
+    result = store.query([vectors[0].tolist()], n_results=5, where={"group": {"$eq": 0}})
+    assert result["ids"][0][0] == "v0"
+    assert all(m["group"] == 0 for m in result["metadatas"][0])
+    # 전체 행 목록을 조회하지 않고 탐색 리스트의 행에만 조건 적용
+    assert not any("row < ?" in s for s in statements)
+
+    # 조건을 만족하는 행이 탐색 리스트에 부족하면 전체 대상 정확 검색
+    result = store.query([vectors[0].tolist()], n_results=2, where={"rare": {"$eq": 1}})
+    assert sorted(result["ids"][0]) == ["v1500", "v7"]
+
+
+def test_parent_id_filter_uses_index(tmp_path):
+    from app.data.vector_store import _where_sql
+
+    store = LocalVectorStore(str(tmp_path))
+    store.add(
+        ["p1_0", "p1_1", "p2_0"],
+        np.eye(3, dtype=np.float32).tolist(),
+        ["a", "b", "c"],
+        [{"parent_id": "p1"}, {"parent_id": "p1"}, {"parent_id": "p2"}],
+    )
+    assert sorted(store.get(where={"parent_id": {"$in": ["p1"]}})["ids"]) == ["p1_0", "p1_1"]
+
+    # 증분 적재의 parent_id 조회는 전체 스캔이 아니라 식 색인 사용
+    sql, params = _where_sql({"parent_id": {"$in": ["p1", "p2"]}})
+    plan = " ".join(
+        str(row[-1]) for row in store._db.execute(
+            f"EXPLAIN QUERY PLAN SELECT row FROM chunks WHERE deleted = 0 AND {sql}", params
+        )
+    )
+    assert "idx_chunks_parent_id" in plan
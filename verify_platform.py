@@ -82,7 +82,7 @@ def run_tests():
     # [Test 3] Rate Limit (도배 방지)
     # ---------------------------------------------------------
     print("Test 3: Rate Limit (속도 제한) 테스트")
-    # policy.py 내부의 _RATE_LIMIT_STORE를 확인
+    # app/platform/rate_limit.py 의 Rate Limiter 확인 (기본 한도 10회/60초)
     
     print("   -> 연속 호출 시도 중...")
     blocked_count = 0